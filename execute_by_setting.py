@@ -1,5 +1,5 @@
 import yaml
-from main import main
+from main import main, main_batch
 
 def load_config(config_path="config.yaml"):
     with open(config_path, encoding="utf-8") as f:
@@ -10,14 +10,47 @@ if __name__ == "__main__":
     config_path = "config.yaml"
     
     config = load_config(config_path)
-    main(
-        csv_file_path = config["csv_file_path"],
+    options = dict(
         delimiter = config.get("delimiter"),
         new_data_name = config.get("new_data_name"),
-        save_path = config.get("save_path"),
         save_graph = config.get("save_graph"),
-        # fillna = config.get("fillna"),
-        # fillna_value = config.get("fillna_value"),
+        fillna = config.get("fillna", True),
+        fillna_value = config.get("fillna_value", 0),
         fmt = config.get("fmt"),
-        image_name = config.get("save_graph_name"),
-    ) 
\ No newline at end of file
+        stream = config.get("stream", False),
+        chunk_rows = config.get("chunk_rows", 100000),
+        dtype = config.get("dtype", "float64"),
+        timestamp_dtype = config.get("timestamp_dtype", "float64"),
+        usecols = config.get("usecols"),
+        decimation = config.get("decimation", "minmax"),
+        layout = config.get("layout", "auto"),
+        columns_per_page = config.get("columns_per_page"),
+        time_range = config.get("time_range"),
+        resample = config.get("resample"),
+        resample_method = config.get("resample_method", "mean"),
+        expressions = config.get("expressions"),
+        pipeline = config.get("pipeline", False),
+        profile = config.get("profile"),
+        no_plot = config.get("no_plot", False),
+    )
+
+    # batchモードではcsv_file_pathにファイル、ディレクトリ、globパターンまたはそれらのリストを指定できる
+    if config.get("batch", False):
+        main_batch(
+            config["csv_file_path"],
+            save_dir = config.get("batch_save_dir", "./result"),
+            batch_workers = config.get("batch_workers"),
+            plot_process = config.get("plot_process", False),
+            **options,
+        )
+    else:
+        main(
+            csv_file_path = config["csv_file_path"],
+            save_path = config.get("save_path"),
+            image_name = config.get("save_graph_name"),
+            headless = config.get("headless", False),
+            workers = config.get("workers"),
+            tail = config.get("tail", False),
+            tail_interval = config.get("tail_interval", 1.0),
+            **options,
+        )
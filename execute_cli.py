@@ -1,12 +1,14 @@
 import argparse
-from main import main
+from main import main, main_batch
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="CSVのカラムを合計し、グラフを作成するコマンドラインツール")
 
     # 必須引数
     parser.add_argument("csv_file_path", 
-                        help="入力するCSVファイルのパス"
+                        nargs="+",
+                        help="入力するCSVファイルのパス（-b設定時は複数のファイル、ディレクトリ、globパターンを指定可能）。\
+                            .csv.gz、.csv.bz2、.csv.xzは展開しながら読み込みます"
                         )
     
     # オプション引数
@@ -34,7 +36,9 @@ if __name__ == "__main__":
 
     parser.add_argument("-s","--save_path", 
                         default='./added_data.csv', 
-                        help="既存のデータにカラムを追加して新しく生成された結果CSVの保存パス（デフォルト: ./added_data.csv）"
+                        help="既存のデータにカラムを追加して新しく生成された結果CSVの保存パス（デフォルト: ./added_data.csv）。\
+                            拡張子を.npy、.npz、.colsにするとバイナリ形式で保存し、入力ファイルとして解析せずに読み込めます。\
+                            .csv.gz、.csv.bz2、.csv.xzにすると圧縮して保存します"
                         )
     
     parser.add_argument("-fmt","--fmt","--format",
@@ -53,16 +57,183 @@ if __name__ == "__main__":
                         help="保存するプロットのイメージ名を設定（デフォルト: CSVファイルと同じ）"
                         )
 
+    parser.add_argument("-st","--stream", 
+                        action="store_true", 
+                        help="設定時、CSVファイルをチャンクごとに読み込み・合計・保存し、全データをメモリに保持しない（プロットは作成しない）"
+                        )
+    
+    parser.add_argument("-cr","--chunk_rows",
+                        default=100000, 
+                        type=int,
+                        help="streamモード、pipelineモードで1回に読み込む行数（デフォルト: 100000）"
+                        )
+
+    parser.add_argument("-pl","--pipeline", 
+                        action="store_true", 
+                        help="設定時、読み込み・合計・保存をチャンク（-cr行）ごとに別のスレッドで並行に実行する（streamモードでも使用可能）"
+                        )
+
+    parser.add_argument("-dt","--dtype",
+                        default="float64", 
+                        help="データ配列の型（デフォルト: float64）。float32でメモリ使用量が半分になります（合計は倍精度で計算）"
+                        )
+    
+    parser.add_argument("-tdt","--timestamp_dtype",
+                        default="float64", 
+                        help="タイムスタンプ配列の型（デフォルト: float64）。int64、datetime64[ms]、timedelta64[us]など（秒として変換）"
+                        )
+
+    parser.add_argument("-u","--usecols",
+                        default=None, 
+                        type=lambda value: [int(column) if column.strip().lstrip("-").isdigit() else column.strip()
+                                            for column in value.split(',')],
+                        help="読み込むデータ列をカンマ区切りで指定（タイムデータを除くインデックスまたはヘッダー名、デフォルト: 全ての列）。\
+                            例: 0,2,wave5"
+                        )
+
+    parser.add_argument("-dm","--decimation",
+                        default="minmax", 
+                        choices=["minmax", "lttb", "none"],
+                        help="プロット前の間引き方法（デフォルト: minmax）。minmaxはピークを残し、lttbは波形の形を残します。noneで間引かない"
+                        )
+
+    parser.add_argument("-ly","--layout",
+                        default="auto", 
+                        choices=["auto", "subplots", "stacked"],
+                        help="プロットのレイアウト（デフォルト: auto）。stackedは全ての列を1つのグラフにずらして重ね、列数が多くても速く描画します。autoは32列以上でstacked"
+                        )
+
+    parser.add_argument("-np","--no_plot", 
+                        action="store_true", 
+                        help="設定時、合計と保存のみを行い、プロットの作成・イメージの保存・表示を行わない（matplotlibを読み込まないため起動が速い）"
+                        )
+
+    parser.add_argument("-hl","--headless", 
+                        action="store_true", 
+                        help="設定時、画面に表示せずにプロットのイメージのみを保存する（-gと併用）。ディスプレイのない環境でも実行できます"
+                        )
+
+    parser.add_argument("-cpp","--columns_per_page",
+                        default=None, 
+                        type=int,
+                        help="headlessモードで1枚のイメージに描画する列数（デフォルト: 全ての列）。複数枚の場合は名前の末尾に_1、_2、...を付けます"
+                        )
+
+    parser.add_argument("-w","--workers",
+                        default=None, 
+                        type=int,
+                        help="headlessモードでイメージを並列に保存するプロセス数（デフォルト: CPUコア数）"
+                        )
+
+    parser.add_argument("-tr","--time_range",
+                        default=None, 
+                        nargs=2,
+                        type=float,
+                        metavar=("T_START", "T_END"),
+                        help="指定した時間範囲の行のみを読み込む（タイムスタンプは昇順）。初回にインデックスを作成し、以降は範囲の部分のみを読み込みます"
+                        )
+
+    parser.add_argument("-rs","--resample",
+                        default=None, 
+                        type=float,
+                        help="合計・保存・プロットの前に、指定した秒数の区間ごとにデータを集計する（デフォルト: 集計しない）。streamモードでも使用できます"
+                        )
+
+    parser.add_argument("-rm","--resample_method",
+                        default="mean", 
+                        choices=["mean", "min", "max", "last"],
+                        help="resampleの区間ごとの集計方法（デフォルト: mean）"
+                        )
+
+    parser.add_argument("-e","--expression",
+                        dest="expressions",
+                        default=None, 
+                        action="append",
+                        help="合計列の後ろに追加する派生列を'列名=式'で指定（複数回指定可能）。式では列をヘッダー名で参照します。\
+                            例: -e 'diff12=wave1-wave2' -e 'power=rms(wave1,wave2)' -e 'smooth=ma(wave1,100)'"
+                        )
+
+    parser.add_argument("-t","--tail", 
+                        action="store_true", 
+                        help="設定時、プロットを表示したままCSVファイルに追記された行のみを読み込み、保存したCSVファイルとプロットに追加し続ける"
+                        )
+
+    parser.add_argument("-ti","--tail_interval",
+                        default=1.0, 
+                        type=float,
+                        help="tailモードで追記を確認する間隔（秒、デフォルト: 1.0）"
+                        )
+
+    parser.add_argument("-pf","--profile",
+                        default=None, 
+                        nargs="?",
+                        const=True,
+                        metavar="REPORT_PATH",
+                        help="設定時、ロード・合計・保存・プロットの段ごとに経過時間、CPU時間、ピークメモリ、行数/秒、バイト数/秒を計測し、\
+                            JSONのレポートを保存する（デフォルト: 結果CSVの名前に_profile.jsonを付けたパス）"
+                        )
+
+    parser.add_argument("-b","--batch", 
+                        action="store_true", 
+                        help="設定時、指定した全てのCSVファイルをプロセスプールで並列に処理する（プロットは表示せず、-gの場合はイメージのみ保存）"
+                        )
+
+    parser.add_argument("-bd","--batch_save_dir",
+                        default="./result", 
+                        help="batchモードで結果のCSVファイルとイメージを保存するディレクトリ（デフォルト: ./result）"
+                        )
+
+    parser.add_argument("-bw","--batch_workers",
+                        default=None, 
+                        type=int,
+                        help="batchモードのプロセス数（デフォルト: CPUコア数）"
+                        )
+
+    parser.add_argument("-pp","--plot_process", 
+                        action="store_true", 
+                        help="設定時、batchモードでファイルを1つずつ順に処理し、イメージの保存（-g）は共有メモリでデータを受け渡した別のプロセスで、\
+                            次のファイルの処理と並行に行う（-bwは使用しない）"
+                        )
+
     args = parser.parse_args()
+    if not args.batch and len(args.csv_file_path) > 1:
+        parser.error("複数のCSVファイルを処理する場合は-bを指定してください。")
 
-    main(
-        csv_file_path=args.csv_file_path,
+    options = dict(
         delimiter=args.delimiter,
-        save_path=args.save_path,
         new_data_name=args.new_data_name,
         save_graph=args.save_graph,
         fillna=args.fillna,
         fillna_value=args.fillna_value,
         fmt=args.fmt,
-        image_name=args.save_graph_name
-    )
\ No newline at end of file
+        stream=args.stream,
+        chunk_rows=args.chunk_rows,
+        dtype=args.dtype,
+        timestamp_dtype=args.timestamp_dtype,
+        usecols=args.usecols,
+        decimation=None if args.decimation == "none" else args.decimation,
+        layout=args.layout,
+        columns_per_page=args.columns_per_page,
+        time_range=args.time_range,
+        resample=args.resample,
+        resample_method=args.resample_method,
+        expressions=args.expressions,
+        pipeline=args.pipeline,
+        profile=args.profile,
+        no_plot=args.no_plot,
+    )
+
+    if args.batch:
+        main_batch(args.csv_file_path, save_dir=args.batch_save_dir, batch_workers=args.batch_workers,
+                   plot_process=args.plot_process, **options)
+    else:
+        main(
+            csv_file_path=args.csv_file_path[0],
+            save_path=args.save_path,
+            image_name=args.save_graph_name,
+            headless=args.headless,
+            workers=args.workers,
+            tail=args.tail,
+            tail_interval=args.tail_interval,
+            **options
+        )
\ No newline at end of file
@@ -0,0 +1,30 @@
+import argparse
+from module.server_module import serve, DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT, DEFAULT_SERVER_MAX_BYTES
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ロードしたCSVファイルをメモリに保持し、ロード・合計・保存・イメージの保存のリクエストを処理するサーバー")
+
+    parser.add_argument("-H","--host",
+                        default=DEFAULT_SERVER_HOST, 
+                        help=f"HTTPサーバーのアドレス（デフォルト: {DEFAULT_SERVER_HOST}）"
+                        )
+
+    parser.add_argument("-p","--port",
+                        default=DEFAULT_SERVER_PORT, 
+                        type=int,
+                        help=f"HTTPサーバーのポート番号（デフォルト: {DEFAULT_SERVER_PORT}）"
+                        )
+
+    parser.add_argument("-us","--unix_socket",
+                        default=None, 
+                        help="設定時、HTTPの代わりに指定したパスのUnixドメインソケットで受け付ける（1行に1つのJSON）"
+                        )
+
+    parser.add_argument("-mm","--max_mb",
+                        default=DEFAULT_SERVER_MAX_BYTES >> 20, 
+                        type=int,
+                        help=f"メモリに保持するデータの最大合計サイズ（MB、デフォルト: {DEFAULT_SERVER_MAX_BYTES >> 20}）。超えた場合は最も長く使用されていないものから破棄します"
+                        )
+
+    args = parser.parse_args()
+    serve(host=args.host, port=args.port, unix_socket=args.unix_socket, max_bytes=args.max_mb << 20)
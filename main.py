@@ -1,5 +1,10 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from module.csv_module import COMPRESSION_MODULES, is_compressed_path
 from module.data_module import CSVColumnSummer
-from module.plot_module import Plotter
+from module.profile_module import profiling, profile_stage, file_size
 
 def main(
         csv_file_path, 
@@ -7,25 +12,341 @@ def main(
         new_data_name = "synthetic wave", 
         save_path = './added_data.csv', 
         save_graph = False,
-        # fillna = True,
-        # fillna_value = 0,
+        fillna = True,
+        fillna_value = 0,
         fmt = '%8g',
-        image_name = None):
+        image_name = None,
+        stream = False,
+        chunk_rows = 100000,
+        dtype = 'float64',
+        timestamp_dtype = 'float64',
+        usecols = None,
+        decimation = 'minmax',
+        layout = 'auto',
+        headless = False,
+        columns_per_page = None,
+        workers = None,
+        tail = False,
+        tail_interval = 1.0,
+        time_range = None,
+        resample = None,
+        resample_method = 'mean',
+        expressions = None,
+        pipeline = False,
+        profile = None,
+        no_plot = False,
+        plot_worker = None):
+    """
+    CSVファイルを読み込み、列の合計を追加して保存し、プロットを作成します。
+    profileを指定した場合は、ロード、合計、保存、プロットなどの段ごとに経過時間、CPU時間、ピークメモリ、
+    行数とバイト数を計測し、終了時にJSONのレポートを保存します。
+    profileがTrueの場合はsave_pathの拡張子を除いた名前に_profile.jsonを付けたパス、文字列の場合はそのパスに保存します。
+    no_plotがTrueの場合は、合計と保存のみを行い、プロットの作成、イメージの保存、表示を行いません。
+    matplotlibはプロットを作成する場合のみimportするため、no_plotの場合は起動が速くなります。
+    headlessモードでplot_worker（plot_module.PlotWorker）を指定した場合は、データを共有メモリに配置して
+    ワーカープロセスで画像を保存し、保存の完了を待たずに戻ります。
+
+    Returns:
+        int: 処理した行数
+    """
+    if profile:
+        arguments = dict(locals(), profile=None)
+        report_path = profile_report_path(save_path) if profile is True else profile
+        with profiling() as profiler:
+            try:
+                return main(**arguments)
+            finally:
+                profiler.print_summary()
+                profiler.save_report(report_path, options=arguments)
     
-    # summer = CSVColumnSummer(csv_file_path,{'delimiter':delimiter,'fillna':fillna,'fillna_value':fillna_value, 'fmt':fmt})
-    summer = CSVColumnSummer(csv_file_path,{'delimiter':delimiter, 'fmt':fmt})
+    # streamモードではチャンクごとに合計・保存し、全データを保持しないためプロットは行わない
+    if stream:
+        summer = CSVColumnSummer(options={'delimiter':delimiter, 'fmt':fmt, 'chunk_rows':chunk_rows, 'dtype':dtype,
+                                         'fillna':fillna, 'fillna_value':fillna_value, 'usecols':usecols,
+                                         'resample':resample, 'resample_method':resample_method,
+                                         'expressions':expressions, 'pipeline':pipeline})
+        num_data, _ = summer.stream_data(csv_file_path, save_path = save_path, header = new_data_name)
+        print("streamモードではプロットを作成しません。")
+        return num_data
+
+    options = {'delimiter':delimiter, 'fmt':fmt,
+               'fillna':fillna, 'fillna_value':fillna_value,
+               'dtype':dtype, 'timestamp_dtype':timestamp_dtype,
+               'usecols':usecols,
+               'resample':resample, 'resample_method':resample_method,
+               'expressions':expressions, 'chunk_rows':chunk_rows}
+    if tail and resample:
+        raise ValueError("resampleとtailは同時に指定できません。")
+    if tail and no_plot:
+        raise ValueError("no_plotとtailは同時に指定できません。")
+    # time_rangeを指定した場合は、インデックスを使って範囲の行のみを読み込む
+    if time_range is not None:
+        if tail:
+            raise ValueError("time_rangeとtailは同時に指定できません。")
+        summer = CSVColumnSummer(options=options)
+        summer.load_range(csv_file_path, *time_range)
+        summer.save_data(header = new_data_name, save_path = save_path)
+    # pipelineモードでは、読み込み、合計、保存をチャンクごとに別のスレッドで並行に実行する
+    elif pipeline:
+        summer = CSVColumnSummer(options=options)
+        summer.pipeline_data(csv_file_path, save_path = save_path, header = new_data_name)
+    else:
+        summer = CSVColumnSummer(csv_file_path, options)
+        summer.save_data(header = new_data_name, save_path = save_path)
     x_data, y_data = summer.get_data()
-    summer.save_data(header = new_data_name, save_path = save_path)
     summer.set_options(fmt=fmt)
 
+    # no_plotモードでは、プロットを作成せず、matplotlibもimportしない
+    if no_plot:
+        if save_graph:
+            print("no_plotモードではプロットのイメージを保存しません。")
+        return summer.num_data
+    if headless and not save_graph:
+        print("headlessモードではプロットを表示しないため、save_graphを指定してください。")
+        return summer.num_data
+    # matplotlibのimportは時間がかかるため、プロットを作成する場合のみimportする
+    from module.plot_module import Plotter, render_pages
+
+    # usecolsで列を選択した場合もラベルが列と一致するよう、読み込んだヘッダー名をラベルにする
+    labels = summer.get_header(as_list=True)[1:] + [new_data_name] + summer.derived_names
+    save_graph_name = output_stem(save_path) if image_name is None else image_name
+
+    # headlessモードではpyplotを使わず、ページごとの画像をプロセスプールで保存し、表示はしない
+    if headless:
+        # plot_workerの場合はセグメント名だけを渡し、ワーカーが共有メモリのデータを直接描画する
+        if plot_worker is not None:
+            plot_worker.submit(summer.share_data(), save_graph_name, labels=labels, columns_per_page=columns_per_page,
+                               decimation=decimation, layout=layout)
+            return summer.num_data
+        with profile_stage('render_pages', rows=len(y_data)) as stage:
+            pages = render_pages(x_data, y_data, save_graph_name, labels=labels, columns_per_page=columns_per_page,
+                                 workers=workers, decimation=decimation, layout=layout)
+            stage['bytes'] = sum(file_size(page) or 0 for page in pages)
+        return summer.num_data
+
     plotter = Plotter()
-    plotter.set_plot(x_data,y_data,labels={-1: new_data_name})
+    with profile_stage('set_plot', rows=len(y_data)):
+        plotter.set_plot(x_data,y_data,labels=labels,decimation=decimation,layout=layout)
     
     if save_graph:
-        save_graph_name = save_path.split('.csv')[0] if image_name is None else image_name
-        plotter.save_plot(save_graph_name)
+        with profile_stage('save_plot', path=save_graph_name + '.png') as stage:
+            plotter.save_plot(save_graph_name)
+            stage['bytes'] = file_size(save_graph_name + '.png')
+
+    # tailモードでは、CSVファイルに追記された行のみを読み込み、保存したCSVファイルとプロットに追加し続ける
+    if tail:
+        def _update():
+            if summer.update_data() == 0:
+                return None
+            return summer.get_data()
+
+        print(f"tailモード: {tail_interval}秒ごとに追記された行を読み込みます。ウィンドウを閉じると終了します。")
+        # ウィンドウを表示している時間は処理時間と区別するため、showの段として記録する
+        with profile_stage('show'):
+            plotter.tail_plot(_update, interval=tail_interval)
+        return summer.num_data
+
+    with profile_stage('show'):
+        plotter.draw_plot()
+    return summer.num_data
+
+
+def output_stem(save_path):
+    """
+    save_pathから拡張子を除いた名前（イメージ名などに使用）を返します。
+    圧縮形式の拡張子（.csv.gzなど）はまとめて除きます。
+    """
+    save_stem = os.path.splitext(save_path)[0] if is_compressed_path(save_path) else save_path
+    return os.path.splitext(save_stem)[0]
+
+
+def profile_report_path(save_path):
+    """
+    save_pathから、プロファイルのレポートの保存先（拡張子を除いた名前に_profile.jsonを付けたパス）を返します。
+    """
+    return output_stem(save_path) + '_profile.json'
+
+
+def collect_csv_files(inputs):
+    """
+    ファイルパス、ディレクトリ、globパターンのリストから、処理するCSVファイルのパスのリストを作成します。
+    ディレクトリの場合は直下の.csvファイルと圧縮された.csv.gz、.csv.bz2、.csv.xzファイルを対象にします。重複したパスは1度だけ含めます。
+    """
+    if isinstance(inputs, str):
+        inputs = [inputs]
+
+    csv_files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            matched = sorted(
+                csv_file for extension in [''] + list(COMPRESSION_MODULES)
+                for csv_file in glob.glob(os.path.join(path, '*.csv' + extension))
+            )
+        elif glob.has_magic(path):
+            matched = sorted(glob.glob(path))
+        else:
+            matched = [path]
+        for csv_file in matched:
+            if csv_file not in csv_files:
+                csv_files.append(csv_file)
+    return csv_files
+
+
+def main_batch(inputs, save_dir='./result', batch_workers=None, plot_process=False, **options):
+    """
+    複数のCSVファイルに対してmainの処理（読み込み、合計、保存、イメージの保存）をプロセスプールで並列に実行します。
+    プロセスは使い回すため、ライブラリのimportはプロセスごとに1回だけです。
+    plot_processがTrueでイメージを保存する場合は、ファイルを1つずつ順に読み込み・合計・保存し、
+    イメージの保存は共有メモリでデータを受け渡した別のプロセスで、次のファイルの処理と並行に行います。
+    1つのファイルでエラーが発生しても、他のファイルの処理は続けます。
+    結果のCSVファイルとイメージは、save_dirに入力ファイルと同じ名前で保存します。
+    入力ファイルが複数のディレクトリにある場合は、共通の親ディレクトリからの相対パスで保存し、
+    別のディレクトリの同じ名前のファイルの結果が上書きされないようにします。
+    プロットは画面に表示せず、save_graphを指定した場合のみheadlessモードでイメージを保存します。
+
+    Args:
+        inputs (str or list): CSVファイルのパス、ディレクトリ、globパターン、またはそれらのリスト
+        save_dir (str): 結果を保存するディレクトリ（デフォルト: ./result）
+        batch_workers (int): プロセス数（デフォルト: None、CPUコア数）。plot_processの場合は使用しません。
+        plot_process (bool): イメージの保存を共有メモリを使って別のプロセスで行うかどうか（デフォルト: False）
+        **options: mainのcsv_file_path、save_path、image_name以外の引数
+
+    Returns:
+        list: ファイルごとの結果の辞書のリスト（入力の順番）
+            path、ok、rows、bytes、seconds、errorをキーに持ちます。
+
+    Raises:
+        ValueError: 処理するファイルがない場合、結果の保存先が入力ファイルや他のファイルの結果と重なる場合に発生します。
+    """
+    csv_files = collect_csv_files(inputs)
+    if not csv_files:
+        raise ValueError(f"処理するCSVファイルが見つかりません。: {inputs}")
+
+    # ワーカープロセスの中でさらにプロセスを起動しないよう、イメージは各ワーカーで直接保存する
+    options.update(headless=True, workers=1)
+    # プロファイルのレポートはファイルごとに結果のCSVファイルと同じ場所に保存する
+    if options.get('profile'):
+        options['profile'] = True
+    jobs = [
+        (csv_file, save_path, options)
+        for csv_file, save_path in zip(csv_files, batch_save_paths(csv_files, save_dir))
+    ]
+
+    start = time.perf_counter()
+    results = {}
+    if plot_process and options.get('save_graph') and not options.get('no_plot') and not options.get('stream'):
+        results = _run_batch_with_plot_worker(jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=batch_workers) as executor:
+            futures = {executor.submit(_run_batch_file, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['path']] = result
+                _print_batch_progress(result, len(results), len(jobs))
+    elapsed = time.perf_counter() - start
+
+    results = [results[csv_file] for csv_file in csv_files]
+    _print_batch_summary(results, elapsed)
+    return results
+
+
+def batch_save_paths(csv_files, save_dir):
+    """
+    バッチ処理の結果の保存先のパスを、入力ファイルの共通の親ディレクトリからの相対パスで作成します。
+    全ての入力ファイルが同じディレクトリにある場合は、save_dirに入力ファイルと同じ名前で保存します。
+    プロセスプールでは複数のファイルを同時に保存するため、保存先が重なる場合は処理を始める前にエラーにします。
+
+    Returns:
+        list: 入力ファイルごとの結果のCSVファイルのパスのリスト
+
+    Raises:
+        ValueError: 結果の保存先が入力ファイルと同じ場合、
+            または複数のファイルの結果（CSVファイル、イメージ、プロファイルのレポート）の名前が重なる場合に発生します。
+    """
+    abs_files = [os.path.abspath(csv_file) for csv_file in csv_files]
+    root = os.path.commonpath([os.path.dirname(path) for path in abs_files])
+    save_paths = [os.path.join(save_dir, os.path.relpath(path, root)) for path in abs_files]
+
+    overwritten = [csv_file for csv_file, path, save_path in zip(csv_files, abs_files, save_paths)
+                   if os.path.abspath(save_path) == path]
+    if overwritten:
+        raise ValueError(f"結果の保存先が入力ファイルと同じです。batch_save_dirを変更してください。: {overwritten}")
+
+    # イメージとプロファイルのレポートは、結果のCSVファイルの拡張子を除いた名前で保存する
+    stems = {}
+    for csv_file, save_path in zip(csv_files, save_paths):
+        stems.setdefault(os.path.abspath(output_stem(save_path)), []).append(csv_file)
+    duplicates = [files for files in stems.values() if len(files) > 1]
+    if duplicates:
+        raise ValueError(f"結果の保存先の名前が重なるファイルがあります。: {duplicates}")
+    return save_paths
+
+
+def _run_batch_with_plot_worker(jobs):
+    """
+    ファイルを1つずつ順にmainで処理し、イメージの保存はPlotWorkerのプロセスに依頼して完了を待たずに次のファイルに進みます。
+    全てのファイルの処理後にイメージの保存を待ち、保存に失敗したファイルは失敗として結果に記録します。
+
+    Returns:
+        dict: {CSVファイルのパス: 結果の辞書}
+    """
+    from module.plot_module import PlotWorker
+
+    results = {}
+    with PlotWorker() as plot_worker:
+        renders = {}
+        for csv_file, save_path, options in jobs:
+            future_count = len(plot_worker.futures)
+            result = _run_batch_file(csv_file, save_path, dict(options, plot_worker=plot_worker))
+            if len(plot_worker.futures) > future_count:
+                renders[csv_file] = plot_worker.futures[-1]
+            results[csv_file] = result
+            _print_batch_progress(result, len(results), len(jobs))
+
+    for csv_file, future in renders.items():
+        error = future.exception()
+        if error is not None:
+            results[csv_file].update(ok=False, error=f"{type(error).__name__}: {error}")
+            print(f"{csv_file}: イメージの保存に失敗しました。: {results[csv_file]['error']}")
+    return results
+
+
+def _print_batch_progress(result, num_done, num_jobs):
+    """
+    1つのファイルの処理結果を表示します。
+    """
+    status = 'OK' if result['ok'] else f"NG ({result['error']})"
+    print(f"[{num_done}/{num_jobs}] {result['path']}: {status} {result['seconds']:.2f}s")
+
+
+def _run_batch_file(csv_file_path, save_path, options):
+    """
+    1つのCSVファイルに対してmainを実行し、結果を辞書で返します。例外は結果に記録して外に出しません。
+    """
+    start = time.perf_counter()
+    result = {'path': csv_file_path, 'ok': False, 'rows': 0, 'bytes': 0, 'seconds': 0.0, 'error': None}
+    try:
+        result['bytes'] = os.path.getsize(csv_file_path)
+        result['rows'] = main(csv_file_path, save_path=save_path, **options) or 0
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    return result
+
 
-    plotter.draw_plot()
+def _print_batch_summary(results, elapsed):
+    """
+    バッチ処理の成功・失敗の件数とスループットを表示します。
+    """
+    succeeded = [result for result in results if result['ok']]
+    failed = [result for result in results if not result['ok']]
+    rows = sum(result['rows'] for result in succeeded)
+    size = sum(result['bytes'] for result in succeeded)
+    print(f"バッチ処理が完了しました。 成功: {len(succeeded)}件, 失敗: {len(failed)}件, 経過時間: {elapsed:.2f}s")
+    print(f"  {len(succeeded) / elapsed:.2f} files/s, {rows / elapsed:,.0f} rows/s, {size / elapsed / 1e6:.1f} MB/s")
+    for result in failed:
+        print(f"  失敗: {result['path']}: {result['error']}")
 
 
 if __name__ == "__main__":
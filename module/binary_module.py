@@ -0,0 +1,172 @@
+import json
+import os
+import numpy as np
+from numpy.lib import recfunctions
+
+# バイナリ形式で保存・読み込みするファイルの拡張子
+# .npy: 列名をフィールド名に持つ構造化配列（行ごとのレイアウト、np.load(mmap_mode='r')で読み込み可能）
+# .npz: timestamps、data、ヘッダー名、new_data_nameを格納した非圧縮のnpzファイル
+# .cols: ヘッダー名などのメタデータと、列ごとに連続したデータを格納した独自の列指向形式
+BINARY_EXTENSIONS = ('.npy', '.npz', '.cols')
+
+# .colsファイルの先頭の識別子と、各ブロックの先頭を揃えるバイト数
+COLUMNAR_MAGIC = b'TDPCOLS1'
+COLUMNAR_ALIGN = 64
+
+
+def is_binary_path(path) -> bool:
+    """
+    パスの拡張子がバイナリ形式（.npy、.npz、.cols）かどうかを返します。
+    """
+    return isinstance(path, str) and path.lower().endswith(BINARY_EXTENSIONS)
+
+
+def save_binary_file(save_path, timestamps, data, header, new_data_name=None):
+    """
+    タイムスタンプとデータを、拡張子に応じたバイナリ形式で保存します。
+    テキストへのフォーマットを行わないため、save_csv_fileより高速で、読み込み時も解析が不要です。
+    タイムスタンプはtimestampsの型（datetime64などを含む）のまま保存します。
+
+    Args:
+        save_path (str): 保存先のパス（拡張子は.npy、.npzまたは.cols）
+        timestamps (np.ndarray): 1次元のタイムスタンプ配列
+        data (np.ndarray): タイムスタンプを除いた2次元のデータ配列
+        header (str): タイムスタンプを含む','区切りのヘッダー（列数はdataの列数 + 1）
+        new_data_name (str): 追加した列のヘッダー名（メタデータとして保存します）
+
+    Raises:
+        ValueError: 拡張子がバイナリ形式でない場合、ヘッダーの列数がデータと一致しない場合に発生します
+    """
+    names = header.split(',')
+    if len(names) != data.shape[1] + 1:
+        raise ValueError(f"ヘッダーの列数がデータと一致しません。: {len(names)} != {data.shape[1] + 1}")
+    extension = os.path.splitext(save_path)[1].lower()
+
+    if extension == '.npy':
+        if len(set(names)) != len(names):
+            raise ValueError(f".npyで保存する場合、ヘッダー名は重複できません。: {header}")
+        records = np.empty(len(timestamps), dtype=[(names[0], timestamps.dtype)] + [(name, data.dtype) for name in names[1:]])
+        records[names[0]] = timestamps
+        for column, name in enumerate(names[1:]):
+            records[name] = data[:, column]
+        np.save(save_path, records)
+    elif extension == '.npz':
+        np.savez(save_path, timestamps=timestamps, data=data, header=np.array(names),
+                 new_data_name=np.array(new_data_name or ''))
+    elif extension == '.cols':
+        _save_columnar(save_path, timestamps, data, names, new_data_name)
+    else:
+        raise ValueError(f"バイナリ形式の拡張子は{BINARY_EXTENSIONS}のいずれかを指定してください。: {save_path}")
+
+
+def load_binary_file(path, mmap=True):
+    """
+    save_binary_fileで保存したファイルを読み込みます。数値の解析は行わず、
+    .npyと.colsはmmapがTrueの場合はメモリマップとして読み込むため、ファイルサイズによらずすぐに返ります。
+
+    Returns:
+        tuple: (timestamps, data, header, metadata)
+            timestamps (np.ndarray): タイムスタンプの1次元配列（保存時の型）
+            data (np.ndarray): タイムスタンプを除いた2次元のデータ配列（ビューの場合があります）
+            header (str): タイムスタンプを含む','区切りのヘッダー
+            metadata (dict): new_data_nameなど、保存時に記録した情報
+
+    Raises:
+        FileNotFoundError: ファイルが見つからない場合に発生します
+        ValueError: 拡張子がバイナリ形式でない場合、ファイルの形式が正しくない場合に発生します
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"ファイルが存在しません。: {path}")
+    extension = os.path.splitext(path)[1].lower()
+    mmap_mode = 'r' if mmap else None
+
+    if extension == '.npy':
+        records = np.load(path, mmap_mode=mmap_mode)
+        names = list(records.dtype.names or ())
+        if len(names) < 2:
+            raise ValueError(f"列名を持つ構造化配列ではありません。: {path}")
+        # データ列の型が同じ場合は、コピーせずに2次元のビューとして取り出す
+        data = recfunctions.structured_to_unstructured(records[names[1:]], copy=False)
+        return records[names[0]], data, ','.join(names), {}
+    if extension == '.npz':
+        with np.load(path) as saved:
+            names = [str(name) for name in saved['header']]
+            metadata = {'new_data_name': str(saved['new_data_name']) or None}
+            return saved['timestamps'], saved['data'], ','.join(names), metadata
+    if extension == '.cols':
+        return _load_columnar(path, mmap_mode)
+    raise ValueError(f"バイナリ形式の拡張子は{BINARY_EXTENSIONS}のいずれかを指定してください。: {path}")
+
+
+def _save_columnar(save_path, timestamps, data, names, new_data_name):
+    """
+    .cols形式で保存します。
+    識別子、メタデータのJSONのバイト数（8バイト、リトルエンディアン）、メタデータのJSONの後に、
+    COLUMNAR_ALIGNバイトに揃えてタイムスタンプのブロックと、データ列を列ごとに連続させたブロックを書き込みます。
+    データのブロックは(列数, 行数)の配列のため、転置すると(行数, 列数)の配列としてコピーせずに読み込めます。
+    """
+    num_rows = len(timestamps)
+    timestamps = np.ascontiguousarray(timestamps)
+    # 列ごとに連続させるため、(列数, 行数)のC順の配列として書き込む
+    columns = np.ascontiguousarray(data.T)
+
+    def _metadata(timestamp_offset, data_offset):
+        return json.dumps({
+            'header': names,
+            'new_data_name': new_data_name,
+            'rows': num_rows,
+            'timestamp_dtype': timestamps.dtype.str,
+            'timestamp_offset': timestamp_offset,
+            'dtype': columns.dtype.str,
+            'data_offset': data_offset,
+        }, ensure_ascii=False).encode('utf-8')
+
+    # オフセットの桁数でメタデータの長さが変わらないよう、十分な長さの値で大きさを求めてから確定する
+    prefix = len(COLUMNAR_MAGIC) + 8
+    metadata_bytes = len(_metadata(1 << 62, 1 << 62))
+    timestamp_offset = _align(prefix + metadata_bytes)
+    data_offset = _align(timestamp_offset + timestamps.nbytes)
+    metadata = _metadata(timestamp_offset, data_offset).ljust(metadata_bytes)
+
+    with open(save_path, 'wb') as f:
+        f.write(COLUMNAR_MAGIC)
+        f.write(len(metadata).to_bytes(8, 'little'))
+        f.write(metadata)
+        f.write(b'\0' * (timestamp_offset - prefix - len(metadata)))
+        f.write(timestamps.tobytes())
+        f.write(b'\0' * (data_offset - timestamp_offset - timestamps.nbytes))
+        f.write(columns.tobytes())
+
+
+def _load_columnar(path, mmap_mode):
+    """
+    .cols形式のファイルを読み込みます。
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f".cols形式のファイルではありません。: {path}")
+        metadata = json.loads(f.read(int.from_bytes(f.read(8), 'little')))
+        num_rows = metadata['rows']
+        num_columns = len(metadata['header']) - 1
+        timestamp_dtype = np.dtype(metadata['timestamp_dtype'])
+        dtype = np.dtype(metadata['dtype'])
+        if mmap_mode is None:
+            f.seek(metadata['timestamp_offset'])
+            timestamps = np.fromfile(f, dtype=timestamp_dtype, count=num_rows)
+            f.seek(metadata['data_offset'])
+            columns = np.fromfile(f, dtype=dtype, count=num_rows * num_columns).reshape(num_columns, num_rows)
+
+    # 0バイトはメモリマップできないため、行がない場合は空の配列にする
+    if mmap_mode is not None and num_rows == 0:
+        timestamps = np.empty(0, dtype=timestamp_dtype)
+        columns = np.empty((num_columns, 0), dtype=dtype)
+    elif mmap_mode is not None:
+        timestamps = np.memmap(path, dtype=timestamp_dtype, mode=mmap_mode,
+                               offset=metadata['timestamp_offset'], shape=(num_rows,))
+        columns = np.memmap(path, dtype=dtype, mode=mmap_mode,
+                            offset=metadata['data_offset'], shape=(num_columns, num_rows))
+    return timestamps, columns.T, ','.join(metadata['header']), {'new_data_name': metadata['new_data_name']}
+
+
+def _align(offset):
+    return -(-offset // COLUMNAR_ALIGN) * COLUMNAR_ALIGN
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import numpy as np
+from .csv_module import load_csv_file, validate_csv_path, _reserve_columns
+
+# キャッシュディレクトリのデフォルトのパスと最大サイズ
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'time_data_plotter')
+DEFAULT_CACHE_MAX_BYTES = 1 << 30
+
+
+class CSVCache:
+    """
+    load_csv_fileの結果を.npyファイルとヘッダー情報のJSONファイルとしてディスクに保存し、
+    同じCSVファイルを再度読み込む場合はテキストを解析せずにメモリマップで読み込むクラスです。
+
+    キャッシュのキーはCSVファイルの絶対パス、サイズ、更新時刻と読み込みオプションから作成されるため、
+    CSVファイルが変更されると自動的に無効になります。
+    キャッシュディレクトリの合計サイズがmax_bytesを超えた場合は、最も長く使用されていないものから削除します。
+
+    Attributes:
+        cache_dir (str): キャッシュファイルを保存するディレクトリ
+        max_bytes (int): キャッシュディレクトリの最大合計バイト数
+
+    Methods:
+        load(csv_path, delimiter=',', loader='np', fillna=True, fillna_value=0, workers=None, extra_columns=0,
+             usecols=None):
+            キャッシュがあればメモリマップで、なければCSVファイルを読み込んでキャッシュを作成します。
+        clear(): キャッシュディレクトリ内のキャッシュファイルを全て削除します。
+    """
+    DATA_SUFFIX = '.npy'
+    META_SUFFIX = '.json'
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def load(self, csv_path, delimiter=',', loader='np', fillna=True, fillna_value=0, workers=None, extra_columns=0,
+             usecols=None, end=None):
+        """
+        CSVファイルを読み込みます。有効なキャッシュがある場合は.npyファイルを読み込み専用のメモリマップで返します。
+        extra_columnsを指定した場合は、メモリマップの代わりに列を確保した配列にコピーして返します。
+        usecolsを指定した場合は、指定した列のみのキャッシュを別に作成します。
+        endを指定した場合は先頭からendバイトまでを読み込み、読み込んだバイト数ごとに別のキャッシュを作成します。
+
+        Returns:
+            tuple: (data, header) load_csv_fileと同じ形式
+
+        Raises:
+            CSVFileReadError: CSVファイルの読み込みに失敗した場合に発生します
+            InvalidFileTypeError: ファイルがCSVファイルでない場合に発生します
+        """
+        csv_path = validate_csv_path(csv_path)
+        source_key, state_key = self._make_key(csv_path, delimiter, loader, fillna, fillna_value, usecols, end)
+        data_path, meta_path = self._entry_paths(source_key, state_key)
+
+        if os.path.exists(data_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    header = json.load(f)['header']
+                data = np.load(data_path, mmap_mode='r')
+                # 最終使用時刻を更新し、削除の優先度を下げる
+                os.utime(data_path)
+                if extra_columns:
+                    data = _reserve_columns(data, extra_columns)
+                return data, header
+            # 壊れたキャッシュは削除して読み込み直す
+            except (OSError, ValueError, KeyError):
+                self._remove_entry(source_key + '_' + state_key)
+
+        data, header = load_csv_file(csv_path, delimiter=delimiter, loader=loader,
+                                     fillna=fillna, fillna_value=fillna_value, workers=workers,
+                                     extra_columns=extra_columns, usecols=usecols, end=end)
+        # 確保した列はキャッシュに含めない
+        self._store(source_key, state_key, np.asarray(data)[:, :data.shape[1] - extra_columns], header, csv_path)
+        return data, header
+
+    def clear(self):
+        """
+        キャッシュディレクトリ内のキャッシュファイルを全て削除します。
+        """
+        for name in self._entry_names():
+            self._remove_entry(name)
+
+    def _make_key(self, csv_path, delimiter, loader, fillna, fillna_value, usecols=None, end=None):
+        """
+        CSVファイルのパスから作成するキーと、ファイルの状態と読み込みオプションから作成するキーを返します。
+        """
+        abs_path = os.path.abspath(csv_path)
+        stat = os.stat(abs_path)
+        state = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'delimiter': delimiter,
+            'loader': loader,
+            'fillna': fillna,
+            'fillna_value': fillna_value,
+            'usecols': None if usecols is None else list(usecols),
+            'end': end,
+        }
+        source_key = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()[:16]
+        state_key = hashlib.sha1(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        return source_key, state_key
+
+    def _entry_paths(self, source_key, state_key):
+        name = os.path.join(self.cache_dir, source_key + '_' + state_key)
+        return name + self.DATA_SUFFIX, name + self.META_SUFFIX
+
+    def _entry_names(self):
+        """
+        キャッシュディレクトリ内のキャッシュ名（拡張子なし）の一覧を返します。
+        """
+        return {
+            os.path.splitext(name)[0]
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(self.DATA_SUFFIX) or name.endswith(self.META_SUFFIX)
+        }
+
+    def _remove_entry(self, name):
+        for suffix in (self.DATA_SUFFIX, self.META_SUFFIX):
+            try:
+                os.remove(os.path.join(self.cache_dir, name + suffix))
+            except FileNotFoundError:
+                pass
+
+    def _store(self, source_key, state_key, data, header, csv_path):
+        """
+        データとヘッダーをキャッシュとして保存し、同じCSVファイルの古いキャッシュを削除します。
+        """
+        if data.nbytes > self.max_bytes:
+            return
+
+        # 同じCSVファイルの、変更前の状態のキャッシュを削除
+        for name in self._entry_names():
+            if name.startswith(source_key + '_') and name != source_key + '_' + state_key:
+                self._remove_entry(name)
+
+        data_path, meta_path = self._entry_paths(source_key, state_key)
+        # 途中で中断されても壊れたキャッシュが残らないよう、一時ファイルに書き込んでから置き換える
+        with open(data_path + '.tmp', 'wb') as f:
+            np.save(f, data)
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'source': os.path.abspath(csv_path), 'header': header}, f, ensure_ascii=False)
+        os.replace(data_path + '.tmp', data_path)
+        os.replace(meta_path + '.tmp', meta_path)
+
+        self._evict()
+
+    def _evict(self):
+        """
+        キャッシュディレクトリの合計サイズがmax_bytes以下になるまで、最終使用時刻が古いキャッシュから削除します。
+        """
+        entries = []
+        total = 0
+        for name in self._entry_names():
+            data_path, meta_path = (os.path.join(self.cache_dir, name + suffix)
+                                    for suffix in (self.DATA_SUFFIX, self.META_SUFFIX))
+            try:
+                size = sum(os.path.getsize(path) for path in (data_path, meta_path) if os.path.exists(path))
+                used = os.path.getmtime(data_path) if os.path.exists(data_path) else 0
+            except FileNotFoundError:
+                continue
+            entries.append((used, size, name))
+            total += size
+
+        for used, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove_entry(name)
+            total -= size
@@ -1,6 +1,12 @@
+import bz2
+import gzip
+import io
+import itertools
+import lzma
 import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import pandas as pd
+from .binary_module import is_binary_path, load_binary_file
 
 class InvalidFileTypeError(Exception):
     """CSVファイルでない場合に発生する例外"""
@@ -25,12 +31,46 @@ class CSVFileReadError(Exception):
         return self.message
 
 
-def load_csv_file(csv_path, delimiter=',', loader = 'np', fillna=True, fillna_value=0):
+# fastローダーが一度に変換するブロックのバイト数
+FAST_BLOCK_BYTES = 1 << 20
+# parallelローダーで1プロセスに割り当てる最小のバイト数
+PARALLEL_MIN_BYTES = 1 << 24
+# save_csv_fileが一度にフォーマットする行数と書き込みバッファのバイト数
+WRITE_BLOCK_ROWS = 10000
+WRITE_BUFFER_BYTES = 1 << 22
+# 圧縮されたCSVファイルの拡張子と展開に使う標準ライブラリのモジュール
+COMPRESSION_MODULES = {'.gz': gzip, '.bz2': bz2, '.xz': lzma}
+# 圧縮して保存する場合の圧縮レベル
+# 数値のCSVでは高い圧縮レベルでもサイズはあまり変わらず時間が数倍になるため、gzipとxzは速度を優先する
+COMPRESSION_WRITE_OPTIONS = {'.gz': {'compresslevel': 1}, '.bz2': {'compresslevel': 9}, '.xz': {'preset': 0}}
+# 圧縮されたファイルを展開しながら読み込む1回あたりのバイト数
+DECOMPRESS_BLOCK_BYTES = 1 << 22
+# find_last_line_endでファイルの末尾から改行を探す1回あたりのバイト数
+TAIL_SEARCH_BYTES = 1 << 16
+
+
+def load_csv_file(csv_path, delimiter=',', loader = 'np', fillna=True, fillna_value=0, workers=None, extra_columns=0,
+                  dtype=np.float64, usecols=None, end=None):
     """
     CSVファイルを読み込みます。
     Args:
         delimiter (str): CSVファイルの区切り文字（デフォルト: ','）
-        loader (str): 'np'または'pd'を指定（デフォルト: 'np'）
+        loader (str): 'np'、'pd'、'fast'または'parallel'を指定（デフォルト: 'np'）
+            'fast'はファイルを一度だけ読み込み、数値列をまとめてfloat配列に変換します。
+            'parallel'はファイルを改行位置で分割し、複数プロセスで'fast'と同じ変換を行います。
+        workers (int): loader='parallel'の場合のプロセス数（デフォルト: None、CPUコア数）
+        extra_columns (int): データの後ろに確保する、未初期化の列数（デフォルト: 0）
+            派生列を後から書き込むためのもので、'fast'と'parallel'では読み込み時に直接確保します。
+            'pd'では使用できません。
+        dtype (str または np.dtype): データ配列の型（デフォルト: np.float64）
+            np.float32を指定するとメモリ使用量が半分になります。
+        usecols (list): 読み込む列のインデックスまたはヘッダー名のリスト（デフォルト: None、全ての列）
+            指定した列のみを変換・保持し、返すヘッダーも指定した列のみになります。
+        end (int): 読み込むバイト数（デフォルト: None、ファイルの最後まで）
+            行の途中で区切らないよう、find_last_line_endの戻り値などの行の境界を指定してください。
+            圧縮されたファイルには使用できません。
+
+    拡張子が.npy、.npz、.colsの場合は、save_binary_fileで保存したファイルを解析せずに読み込みます（loaderは無視します）。
 
     Returns:
         data (np.ndarray または pd.DataFrame): 読み込んだCSVファイルのデータ
@@ -42,7 +82,7 @@ def load_csv_file(csv_path, delimiter=',', loader = 'np', fillna=True, fillna_va
     Example:
         data = load_csv_file('data.csv', delimiter=',', loader='np')
     """
-    def _load_csv_with_numpy(csv_path, delimiter, fillna=True ,fillna_value=0):
+    def _load_csv_with_numpy(csv_path, delimiter, fillna=True ,fillna_value=0, usecols=None, end=None):
         """
         numpyでCSVファイルを読み込みます。
         """
@@ -52,59 +92,445 @@ def load_csv_file(csv_path, delimiter=',', loader = 'np', fillna=True, fillna_va
             }
         if fillna:
             args['filling_values'] = fillna_value
+        if usecols is not None:
+            args['usecols'] = usecols
         
         try:
-            data = np.genfromtxt(csv_path, **args)
+            data = np.genfromtxt(_open_source(csv_path, end), **args)
             return data
         
         # headerがない場合は、skip_headerを削除して再度読み込み
         except Exception as e1:
             try:
                 args.pop('skip_header', None)
-                data = np.genfromtxt(csv_path, **args)
+                data = np.genfromtxt(_open_source(csv_path, end), **args)
                 return data
             
             # それでも読み込みに失敗した場合は、CSVFileReadErrorを発生
             except Exception as e2:
                  raise CSVFileReadError(csv_path, e2)
 
-    def _load_csv_with_pandas(csv_path, delimiter):
+    def _load_csv_with_pandas(csv_path, delimiter, usecols=None, end=None):
         """
         pandasでCSVファイルを読み込みます。
+        pandasはimportに時間がかかるため、loader='pd'を指定した場合のみimportします。
         """
+        import pandas as pd
         try:
-            data = pd.read_csv(csv_path, delimiter=delimiter, skiprows=1)
+            data = pd.read_csv(_open_source(csv_path, end), delimiter=delimiter, skiprows=1, usecols=usecols)
             return data
         
         # headerがない場合は、skip_headerを削除して再度読み込み
         except Exception as e1:
             try:
-                data = pd.read_csv(csv_path, delimiter=delimiter)
+                data = pd.read_csv(_open_source(csv_path, end), delimiter=delimiter, usecols=usecols)
                 return data
             # それでも読み込みに失敗した場合は、CSVFileReadErrorを発生
             except Exception as e2:
                  raise CSVFileReadError(csv_path, e2)
-            
+
+    if is_binary_path(csv_path):
+        timestamps, data, header = _load_binary_columns(csv_path, extra_columns, dtype, np.float64, usecols)
+        output = np.empty((data.shape[0], data.shape[1] + 1), dtype=dtype)
+        output[:, 0] = timestamps
+        output[:, 1:] = data
+        return output, header
+
     csv_path = validate_csv_path(csv_path)
+    if end is not None and is_compressed_path(csv_path):
+        raise ValueError(f"圧縮されたファイルにはendを指定できません。: {csv_path}")
+    # fastまたはparallelをloaderに指定した場合、ヘッダーも本体と同時に取得するのでそのまま返す
+    if loader in ['fast', 'parallel']:
+        _, data, header = _load_csv_with_fast(csv_path, delimiter, loader, fillna, fillna_value, workers,
+                                              extra_columns, dtype, usecols=usecols, end=end)
+        return data, header
+
+    header = load_header(csv_path, delimiter=delimiter)
+    if usecols is not None:
+        usecols = _resolve_usecols(header, usecols)
+        header = _project_header(header, usecols)
 
     # numpyをloaderに指定した場合
     if loader in ['np', 'numpy']:
-        data = _load_csv_with_numpy(csv_path, delimiter, fillna=fillna, fillna_value=fillna_value)    
+        data = _load_csv_with_numpy(csv_path, delimiter, fillna=fillna, fillna_value=fillna_value, usecols=usecols,
+                                    end=end)
         if data.shape == (0,):
             raise CSVFileReadError(csv_path, "arrayが空です")
         elif data.size  == 0:
             raise CSVFileReadError(csv_path, "Nan値のみが含まれています")
+        if extra_columns or np.dtype(dtype) != data.dtype:
+            _, data = _copy_into_output(data, extra_columns, dtype)
     # pandasをloaderに指定した場
     elif loader in ['pd', 'pandas']:
-        data = _load_csv_with_pandas(csv_path, delimiter)
+        if extra_columns:
+            raise ValueError("extra_columnsはloader='pd'では使用できません。")
+        data = _load_csv_with_pandas(csv_path, delimiter, usecols=usecols, end=end)
+        # pandasはusecolsをファイル内の順番で返すため、指定した順番に並べ替える
+        if usecols is not None and usecols != sorted(usecols):
+            data = data.iloc[:, [sorted(usecols).index(column) for column in usecols]]
         if data.empty:
             raise CSVFileReadError(csv_path, "DataFrameが空です")
-        elif data.isnull().all().all():
+        # 数値に変換できないセルは、他のloaderと同じく欠損値として扱い、fillnaの場合はfillna_valueで埋める
+        import pandas as pd
+        data = data.apply(pd.to_numeric, errors='coerce')
+        if data.isnull().all().all():
             raise CSVFileReadError(csv_path, "Nan値のみが含まれています")
+        if fillna:
+            data = data.fillna(fillna_value)
+        try:
+            data = data.astype(dtype)
+        except (TypeError, ValueError) as e:
+            raise CSVFileReadError(csv_path, e)
     else:
-        raise ValueError("loaderは'np'または'pd'を指定してください。")
+        raise ValueError("loaderは'np'、'pd'、'fast'または'parallel'を指定してください。")
     
-    return data, load_header(csv_path, delimiter=delimiter)
+    return data, header
+
+
+def load_csv_columns(csv_path, delimiter=',', loader='np', fillna=True, fillna_value=0, workers=None,
+                     extra_columns=0, dtype=np.float64, timestamp_dtype=np.float64, usecols=None, end=None):
+    """
+    CSVファイルを読み込み、1列目をタイムスタンプとして別の配列に分けて返します。
+    タイムスタンプは常に倍精度で解析してからtimestamp_dtypeに変換するため、
+    dtypeにnp.float32を指定してもタイムスタンプの精度は落ちません。
+
+    Args:
+        delimiter (str): CSVファイルの区切り文字（デフォルト: ','）
+        loader (str): 'np'、'pd'、'fast'または'parallel'を指定（デフォルト: 'np'）
+            'fast'と'parallel'は解析しながら直接それぞれの配列に書き込みます。
+        workers (int): loader='parallel'の場合のプロセス数（デフォルト: None、CPUコア数）
+        extra_columns (int): データの後ろに確保する、未初期化の列数（デフォルト: 0）
+        dtype (str または np.dtype): データ配列の型（デフォルト: np.float64）
+        timestamp_dtype (str または np.dtype): タイムスタンプ配列の型（デフォルト: np.float64）
+            整数型の場合は値を丸めて変換します。
+            datetime64/timedelta64の場合は値を秒（datetime64ではUNIX時間）として単位に合わせて変換します。
+        usecols (list): 読み込む列のインデックスまたはヘッダー名のリスト（デフォルト: None、全ての列）
+            1列目がタイムスタンプとして扱われるため、タイムスタンプの列を先頭に含めてください。
+        end (int): 読み込むバイト数（デフォルト: None、ファイルの最後まで）。load_csv_fileと同じです。
+
+    Returns:
+        tuple: (timestamps, data, header)
+            timestamps (np.ndarray): タイムスタンプの1次元配列
+            data (np.ndarray): タイムスタンプを除いたデータの2次元配列
+            header (str): ヘッダー文字列
+
+    Raises:
+        CSVFileReadError: CSVファイルの読み込みに失敗した場合に発生します
+        InvalidFileTypeError: ファイルがCSVファイルでない場合に発生します
+
+    Example:
+        timestamps, data, header = load_csv_columns('data.csv', loader='fast', dtype='float32')
+    """
+    if timestamp_dtype is None:
+        raise ValueError("timestamp_dtypeを指定してください。")
+
+    if is_binary_path(csv_path):
+        return _load_binary_columns(csv_path, extra_columns, dtype, timestamp_dtype, usecols)
+
+    if loader in ['fast', 'parallel']:
+        csv_path = validate_csv_path(csv_path)
+        if end is not None and is_compressed_path(csv_path):
+            raise ValueError(f"圧縮されたファイルにはendを指定できません。: {csv_path}")
+        return _load_csv_with_fast(csv_path, delimiter, loader, fillna, fillna_value, workers,
+                                   extra_columns, dtype, timestamp_dtype, usecols, end)
+
+    data, header = load_csv_file(csv_path, delimiter=delimiter, loader=loader, fillna=fillna,
+                                 fillna_value=fillna_value, workers=workers, usecols=usecols, end=end)
+    timestamps, data = _copy_into_output(np.asarray(data, dtype=np.float64), extra_columns, dtype, timestamp_dtype)
+    return timestamps, data, header
+
+
+def _load_binary_columns(path, extra_columns=0, dtype=np.float64, timestamp_dtype=np.float64, usecols=None):
+    """
+    save_binary_fileで保存したファイルをメモリマップで開き、load_csv_columnsと同じ形式の配列にコピーします。
+    数値の解析は行わず、usecolsの列の選択と型の変換のみを行います。
+    """
+    try:
+        stored_timestamps, stored_data, header, _ = load_binary_file(path)
+    except ValueError as e:
+        raise CSVFileReadError(path, e)
+    columns = None
+    if usecols is not None:
+        columns = _resolve_usecols(header, usecols)
+        if columns[0] != 0:
+            raise ValueError("usecolsの先頭にはタイムスタンプの列を指定してください。")
+        header = _project_header(header, columns)
+        columns = [column - 1 for column in columns[1:]]
+
+    num_columns = stored_data.shape[1] if columns is None else len(columns)
+    data = np.empty((stored_data.shape[0], num_columns + extra_columns), dtype=dtype)
+    data[:, :num_columns] = stored_data if columns is None else stored_data[:, columns]
+    return _convert_stored_timestamps(stored_timestamps, timestamp_dtype), data, header
+
+
+def _convert_stored_timestamps(values: np.ndarray, timestamp_dtype) -> np.ndarray:
+    """
+    保存時の型のタイムスタンプを、timestamp_dtypeの新しい配列に変換します。
+    datetime64/timedelta64から数値型への変換は、_convert_timestampsと逆に値を秒にします。
+    """
+    timestamp_dtype = np.dtype(timestamp_dtype)
+    if values.dtype == timestamp_dtype:
+        return np.array(values)
+    if values.dtype.kind in 'Mm':
+        if timestamp_dtype.kind in 'Mm':
+            return values.astype(timestamp_dtype)
+        unit, _ = np.datetime_data(values.dtype)
+        seconds = values.view(np.int64) * (np.timedelta64(1, unit) / np.timedelta64(1, 's'))
+        return _convert_timestamps(seconds, timestamp_dtype)
+    return _convert_timestamps(np.asarray(values, dtype=np.float64), timestamp_dtype)
+
+
+def _load_csv_with_fast(csv_path, delimiter=',', loader='fast', fillna=True, fillna_value=0, workers=None,
+                        extra_columns=0, dtype=np.float64, timestamp_dtype=None, usecols=None, end=None):
+    """
+    loader='fast'または'parallel'でCSVファイルを読み込みます。
+    endを指定した場合は、先頭からendバイトまでを読み込みます。
+    'fast'はファイルを一度だけ読み込み、ヘッダーとデータを同時に取得します。
+    'parallel'はファイルを改行位置でバイト範囲に分割し、プロセスプールで並列に読み込みます。
+    どちらもデータはブロックごとにまとめて変換し、事前に確保した配列に行の順番どおりに書き込みます。
+    usecolsを指定した場合は、指定した列のみを変換します。
+    ヘッダーは本体を読み込むために開いたファイルから取得し、ファイルを開き直しません。
+
+    Returns:
+        tuple: (timestamps, data, header) timestamp_dtypeがNoneの場合、timestampsはNoneです
+    """
+    try:
+        # 圧縮されたファイルはバイト範囲に分割できないため、'parallel'でも'fast'と同じく1回で展開して読み込む
+        if loader == 'fast' or is_compressed_path(csv_path):
+            # バッファを通さずに読み込み、ファイル本体のコピーを1つだけにする
+            with open_csv(csv_path, 'rb', buffering=0) as f:
+                header_line = f.readline()
+                body = f.read() if end is None else f.read(max(end - len(header_line), 0))
+            header, usecols = _header_with_usecols(header_line, delimiter, usecols)
+            timestamps, data = _parse_csv_body(body, delimiter, fillna, fillna_value,
+                                               extra_columns, dtype, timestamp_dtype, usecols)
+        else:
+            workers = workers or os.cpu_count() or 1
+            ranges, header_line = _split_byte_ranges(csv_path, workers, end)
+            header, usecols = _header_with_usecols(header_line, delimiter, usecols)
+
+            # 範囲が1つの場合はプロセスを起動せずに読み込む
+            if len(ranges) == 1:
+                timestamps, data = _parse_csv_range(csv_path, *ranges[0], delimiter, fillna, fillna_value,
+                                                    extra_columns, dtype, timestamp_dtype, usecols)
+            else:
+                with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+                    futures = [
+                        executor.submit(_parse_csv_range, csv_path, start, end, delimiter, fillna, fillna_value,
+                                        usecols=usecols)
+                        for start, end in ranges
+                    ]
+                    blocks = [future.result()[1] for future in futures]
+                timestamps, data = _stitch_blocks(blocks, extra_columns, dtype, timestamp_dtype)
+    except Exception as e:
+        raise CSVFileReadError(csv_path, e)
+
+    if data.shape == (0,):
+        raise CSVFileReadError(csv_path, "arrayが空です")
+    elif data.size == 0 and (timestamps is None or timestamps.size == 0):
+        raise CSVFileReadError(csv_path, "Nan値のみが含まれています")
+    return timestamps, data, header
+
+
+def iter_csv_chunks(csv_path, delimiter=',', chunk_rows=100000, fillna=True, fillna_value=0, usecols=None, end=None):
+    """
+    CSVファイルをchunk_rows行ずつ読み込み、チャンクごとのデータを順に返します。
+    ファイル全体をメモリに保持しないため、メモリ使用量はchunk_rowsにのみ依存します。
+    1行目はヘッダーとしてスキップし、NaNの扱いはloader='np'と同じです。
+
+    Args:
+        delimiter (str): CSVファイルの区切り文字（デフォルト: ','）
+        chunk_rows (int): 1チャンクあたりの行数（デフォルト: 100000）
+        usecols (list): 読み込む列のインデックスまたはヘッダー名のリスト（デフォルト: None、全ての列）
+        end (int): 読み込むバイト数（デフォルト: None、ファイルの最後まで）。
+            読み込み中に追記された行を含めないよう、find_last_line_endの戻り値などの行の境界を指定します。
+
+    Yields:
+        np.ndarray: チャンクごとの2次元データ配列
+
+    Raises:
+        CSVFileReadError: CSVファイルの読み込みに失敗した場合に発生します
+        InvalidFileTypeError: ファイルがCSVファイルでない場合に発生します
+
+    Example:
+        for chunk in iter_csv_chunks('data.csv', chunk_rows=100000):
+            print(chunk.shape)
+    """
+    csv_path = validate_csv_path(csv_path)
+    if chunk_rows < 1:
+        raise ValueError("chunk_rowsは1以上を指定してください。")
+    if end is not None and is_compressed_path(csv_path):
+        raise ValueError(f"圧縮されたファイルにはendを指定できません。: {csv_path}")
+    if usecols is not None:
+        usecols = _resolve_usecols(load_header(csv_path, delimiter=delimiter), usecols)
+
+    num_columns = None
+    with open_csv(csv_path, 'rb') as f:
+        f.readline()
+        # endを指定した場合は、endバイトまでの行のみを読み込む
+        lines_iter = f if end is None else _iter_lines_until(f, end)
+        while True:
+            lines = list(itertools.islice(lines_iter, chunk_rows))
+            if not lines:
+                break
+            try:
+                chunk = _parse_csv_block(b''.join(lines), delimiter, fillna, fillna_value, usecols)
+                if chunk.shape[0] == 0:
+                    continue
+                if num_columns is None:
+                    num_columns = chunk.shape[1]
+                elif chunk.shape[1] != num_columns:
+                    raise ValueError(f"列数が一致しません: {chunk.shape[1]} != {num_columns}")
+            except Exception as e:
+                raise CSVFileReadError(csv_path, e)
+            yield chunk
+
+    if num_columns is None:
+        raise CSVFileReadError(csv_path, "arrayが空です")
+
+
+def find_last_line_end(csv_path) -> int:
+    """
+    ファイルの最後の改行の直後のバイト位置を返します。
+    追記中のファイルの末尾にある書き込み途中の行（最後の改行より後ろ）を読み込まないための、読み込みの終了位置に使います。
+    改行がない場合は0を返します。
+    """
+    with open(csv_path, 'rb', buffering=0) as f:
+        position = os.fstat(f.fileno()).st_size
+        while position > 0:
+            start = max(position - TAIL_SEARCH_BYTES, 0)
+            f.seek(start)
+            block = f.read(position - start)
+            index = block.rfind(b'\n')
+            if index >= 0:
+                return start + index + 1
+            position = start
+    return 0
+
+
+def _iter_lines_until(f, end: int):
+    """
+    バイナリモードのファイルから、endバイト目までの行を順に返します。
+    """
+    position = f.tell()
+    for line in f:
+        if position >= end:
+            return
+        position += len(line)
+        yield line
+
+
+def _open_source(csv_path, end=None):
+    """
+    endを指定しない場合はパスを、指定した場合は先頭からendバイトまでを読み込んだファイルオブジェクトを返します。
+    np.genfromtxtやpd.read_csvに、読み込み中に追記された行を渡さないために使います。
+    """
+    if end is None:
+        return csv_path
+    with open(csv_path, 'rb') as f:
+        return io.BytesIO(f.read(end))
+
+
+def load_csv_tail(csv_path, offset, delimiter=',', fillna=True, fillna_value=0, usecols=None):
+    """
+    CSVファイルのoffsetバイト目以降に追記された行を読み込みます。
+    最後の改行より後ろの書き込み途中の行は読み込まず、次回の読み込みに残します。
+    offsetが0の場合は、1行目をヘッダーとしてスキップします。
+
+    Args:
+        offset (int): 読み込みを開始するバイト位置（前回の戻り値のnext_offset）
+        delimiter (str): CSVファイルの区切り文字（デフォルト: ','）
+        usecols (list): 読み込む列のインデックスまたはヘッダー名のリスト（デフォルト: None、全ての列）
+
+    Returns:
+        tuple: (data, next_offset)
+            data (np.ndarray): 追記された行の2次元データ配列（追記がない場合は0行）
+            next_offset (int): 次回の読み込みを開始するバイト位置
+
+    Raises:
+        CSVFileReadError: CSVファイルの読み込みに失敗した場合、またはファイルがoffsetより短くなった場合に発生します
+        InvalidFileTypeError: ファイルがCSVファイルでない場合に発生します
+    """
+    csv_path = validate_csv_path(csv_path)
+    if is_compressed_path(csv_path):
+        raise ValueError(f"圧縮されたファイルには追記された行の読み込みを使用できません。: {csv_path}")
+    try:
+        if usecols is not None:
+            usecols = _resolve_usecols(load_header(csv_path, delimiter=delimiter), usecols)
+        with open(csv_path, 'rb', buffering=0) as f:
+            if os.fstat(f.fileno()).st_size < offset:
+                raise ValueError(f"ファイルが前回の読み込み位置（{offset}バイト）より短くなりました。")
+            f.seek(offset)
+            if offset == 0:
+                f.readline()
+            start = f.tell()
+            body = f.read()
+        end = body.rfind(b'\n') + 1
+        data = _parse_csv_block(body[:end], delimiter, fillna, fillna_value, usecols) if end else np.empty((0, 0))
+    except Exception as e:
+        raise CSVFileReadError(csv_path, e)
+    return data, start + end
+
+
+def save_csv_file(save_path, data, header='', fmt='%8g', delimiter=',', comments='# '):
+    """
+    2次元配列をCSVファイルとして保存します。
+    np.savetxtと同じ出力を、行ごとではなくWRITE_BLOCK_ROWS行ずつまとめてフォーマットし、
+    大きなバッファを通して書き込みます。
+
+    save_pathの拡張子が.gz、.bz2、.xzの場合は、圧縮しながら保存します。
+
+    Args:
+        save_path (str または file): 保存先のパス、または書き込み可能なファイルオブジェクト
+        data (np.ndarray): 保存するデータ（1次元配列の場合は1列として保存）
+        header (str): 1行目に書き込むヘッダー（デフォルト: ''、空の場合は書き込まない）
+        fmt (str または list): 数値フォーマット（デフォルト: '%8g'）
+        delimiter (str): 区切り文字（デフォルト: ','）
+        comments (str): ヘッダーの先頭に付ける文字列（デフォルト: '# '）
+
+    Raises:
+        ValueError: dataが1次元または2次元配列でない場合、fmtの形式が列数と一致しない場合に発生します
+
+    Example:
+        save_csv_file('data.csv', data, header='time,wave1', fmt='%8g')
+    """
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    elif data.ndim != 2:
+        raise ValueError(f"1次元または2次元配列を指定してください。: {data.ndim}次元")
+    row_format = _row_format(fmt, data.shape[1], delimiter) + '\n'
+
+    def _write(f):
+        if len(header) > 0:
+            f.write(comments + header.replace('\n', '\n' + comments) + '\n')
+        for start in range(0, data.shape[0], WRITE_BLOCK_ROWS):
+            block = data[start:start + WRITE_BLOCK_ROWS]
+            f.write((row_format * block.shape[0]) % tuple(block.ravel().tolist()))
+
+    if hasattr(save_path, 'write'):
+        _write(save_path)
+    else:
+        with open_csv(save_path, 'w', buffering=WRITE_BUFFER_BYTES) as f:
+            _write(f)
+
+
+def _row_format(fmt, num_columns: int, delimiter: str = ',') -> str:
+    """
+    np.savetxtと同じ規則で、1行分のフォーマット文字列を作成します。
+    """
+    if type(fmt) in (list, tuple):
+        if len(fmt) != num_columns:
+            raise ValueError(f"fmtの長さが列数と一致しません。: {fmt}")
+        return delimiter.join(fmt)
+    if not isinstance(fmt, str):
+        raise ValueError(f"fmtの形式が正しくありません。: {fmt!r}")
+    num_formats = fmt.count('%')
+    if num_formats == 1:
+        return delimiter.join([fmt] * num_columns)
+    if num_formats != num_columns:
+        raise ValueError(f"fmtの%の数が列数と一致しません。: {fmt}")
+    return fmt
 
 
 def load_header(csv_path, delimiter: str = ','):
@@ -119,13 +545,329 @@ def load_header(csv_path, delimiter: str = ','):
     Raises:
         ValueError: データがロードされていない場合に発生します。
     """
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        header_line = f.readline().strip()
-    header = list(header_line.split(delimiter))
+    with open_csv(csv_path, 'r') as f:
+        header_line = f.readline()
+    return _parse_header(header_line, delimiter)
+
+
+def is_compressed_path(path) -> bool:
+    """
+    パスの拡張子が圧縮形式（.gz、.bz2、.xz）かどうかを返します。
+    """
+    return isinstance(path, str) and os.path.splitext(path)[1].lower() in COMPRESSION_MODULES
+
+
+def open_csv(path, mode='rb', buffering=-1):
+    """
+    CSVファイルを開きます。拡張子が.gz、.bz2、.xzの場合は、標準ライブラリで展開・圧縮しながら読み書きします。
+    圧縮されたファイルは、展開したデータをDECOMPRESS_BLOCK_BYTES（書き込みはWRITE_BUFFER_BYTES）ずつ
+    まとめて読み書きするバッファを通すため、小さな読み込みを繰り返しても展開の呼び出しは少なくなります。
+
+    Args:
+        path (str): ファイルのパス
+        mode (str): 'r'、'w'、'a'（テキスト、UTF-8）または'rb'、'wb'、'ab'（バイナリ）
+        buffering (int): 圧縮されていないファイルのバッファサイズ（openと同じ、デフォルト: -1）
+
+    Returns:
+        file: ファイルオブジェクト
+    """
+    binary = 'b' in mode
+    compression = os.path.splitext(path)[1].lower() if is_compressed_path(path) else None
+    if compression is None:
+        return open(path, mode, buffering=buffering, **({} if binary else {'encoding': 'utf-8'}))
+
+    base_mode = mode.replace('b', '').replace('t', '')
+    if base_mode == 'r':
+        f = io.BufferedReader(COMPRESSION_MODULES[compression].open(path, 'rb'), DECOMPRESS_BLOCK_BYTES)
+    else:
+        f = io.BufferedWriter(COMPRESSION_MODULES[compression].open(path, base_mode + 'b',
+                                                                    **COMPRESSION_WRITE_OPTIONS[compression]),
+                              WRITE_BUFFER_BYTES)
+    return f if binary else io.TextIOWrapper(f, encoding='utf-8')
+
+
+def _parse_header(header_line: str, delimiter: str = ',') -> str:
+    """
+    ヘッダー行を区切り文字で分割し、','区切りのヘッダー文字列に変換します。
+    """
+    header = list(header_line.strip().split(delimiter))
     header = ','.join(header)
     return header
 
 
+def _header_with_usecols(header_line: bytes, delimiter: str = ',', usecols=None):
+    """
+    読み込んだヘッダー行のバイト列から、ヘッダー文字列と列インデックスに変換したusecolsを返します。
+    usecolsを指定した場合、ヘッダーは指定した列のみになります。
+    """
+    header = _parse_header(header_line.decode('utf-8'), delimiter)
+    if usecols is not None:
+        usecols = _resolve_usecols(header, usecols)
+        header = _project_header(header, usecols)
+    return header, usecols
+
+
+def _resolve_usecols(header: str, usecols) -> list:
+    """
+    ヘッダー名またはインデックスで指定された列を、ファイル内の列インデックスのリストに変換します。
+
+    Raises:
+        ValueError: 存在しないヘッダー名または範囲外のインデックスが指定された場合、同じ列が重複して指定された場合に発生します
+    """
+    names = header.split(',')
+    columns = []
+    for column in ([usecols] if isinstance(usecols, (int, str)) else usecols):
+        if isinstance(column, str):
+            if column not in names:
+                raise ValueError(f"ヘッダーに{column}が存在しません。: {header}")
+            column = names.index(column)
+        elif not -len(names) <= column < len(names):
+            raise ValueError(f"列のインデックスが範囲外です。: {column}")
+        column = int(column) % len(names)
+        # 同じ列を2回読み込むと、保存するヘッダーにも同じ列名が重複する
+        if column in columns:
+            raise ValueError(f"usecolsで{names[column]}の列が重複して指定されています。: {usecols}")
+        columns.append(column)
+    return columns
+
+
+def _project_header(header: str, usecols: list) -> str:
+    """
+    ヘッダー文字列から、usecolsで指定した列のヘッダー名のみを取り出します。
+    """
+    names = header.split(',')
+    return ','.join(names[column] for column in usecols)
+
+
+def _split_blocks(body: bytes, block_bytes: int):
+    """
+    バイト列を改行の位置で区切り、おおよそblock_bytesごとのブロックを順に返します。
+    """
+    start = 0
+    size = len(body)
+    while start < size:
+        end = body.find(b'\n', start + block_bytes)
+        end = size if end == -1 else end + 1
+        yield body[start:end]
+        start = end
+
+
+def _parse_csv_body(body: bytes, delimiter: str = ',', fillna=True, fillna_value=0, extra_columns=0,
+                    dtype=np.float64, timestamp_dtype=None, usecols=None):
+    """
+    ヘッダーを含まないCSVのバイト列をブロックごとに変換し、事前に確保した配列に書き込みます。
+    配列の後ろにはextra_columns列の未初期化の列を確保します。
+
+    Returns:
+        tuple: (timestamps, data) timestamp_dtypeがNoneの場合、timestampsはNoneでdataの1列目に含まれます
+
+    Raises:
+        ValueError: ブロック間で列数が一致しない場合に発生します
+    """
+    timestamps = None
+    data = None
+    num_rows = 0
+    for block in _split_blocks(body, FAST_BLOCK_BYTES):
+        block_data = _parse_csv_block(block, delimiter, fillna, fillna_value, usecols)
+        if block_data.shape[0] == 0:
+            continue
+        # 最初のブロックで列数が決まるので、行数の上限で出力配列を確保
+        if data is None:
+            max_rows = body.count(b'\n') + 1
+            num_columns = block_data.shape[1]
+            timestamps, data = _allocate_output(max_rows, num_columns, extra_columns, dtype, timestamp_dtype)
+        elif block_data.shape[1] != num_columns:
+            raise ValueError(f"列数が一致しません: {block_data.shape[1]} != {num_columns}")
+        _write_block(timestamps, data, num_rows, block_data)
+        num_rows += block_data.shape[0]
+
+    if data is None:
+        return None, np.empty((0,))
+    return (None if timestamps is None else timestamps[:num_rows]), data[:num_rows]
+
+
+def _split_byte_ranges(csv_path: str, num_ranges: int, end=None):
+    """
+    ヘッダー行を除いたファイル本体（endを指定した場合はendバイトまで）を、改行位置で区切られたバイト範囲に分割します。
+    各範囲はPARALLEL_MIN_BYTES以上の大きさになります。
+
+    Returns:
+        tuple: (ranges, header_line)
+            ranges (list): (開始位置, 終了位置)のリスト
+            header_line (bytes): ヘッダー行
+    """
+    size = os.path.getsize(csv_path) if end is None else end
+    with open(csv_path, 'rb') as f:
+        header_line = f.readline()
+        offsets = [min(f.tell(), size)]
+        step = max((size - offsets[0]) // num_ranges, PARALLEL_MIN_BYTES)
+        while offsets[-1] + step < size:
+            # 範囲の途中にある行は、その範囲の最後まで含める
+            f.seek(offsets[-1] + step)
+            f.readline()
+            if f.tell() >= size:
+                break
+            offsets.append(f.tell())
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:])), header_line
+
+
+def _parse_csv_range(csv_path: str, start: int, end: int, delimiter: str = ',', fillna=True, fillna_value=0,
+                     extra_columns=0, dtype=np.float64, timestamp_dtype=None, usecols=None):
+    """
+    ファイルの指定したバイト範囲を読み込み、float配列に変換します。
+    プロセスプールのワーカーから呼び出されます。
+
+    Returns:
+        tuple: (timestamps, data) _parse_csv_bodyと同じ形式
+    """
+    with open(csv_path, 'rb', buffering=0) as f:
+        f.seek(start)
+        body = f.read(end - start)
+    return _parse_csv_body(body, delimiter, fillna, fillna_value, extra_columns, dtype, timestamp_dtype, usecols)
+
+
+def _stitch_blocks(blocks, extra_columns=0, dtype=np.float64, timestamp_dtype=None):
+    """
+    範囲ごとに変換された配列を、行の順番どおりに1つの連続した配列へ結合します。
+    配列の後ろにはextra_columns列の未初期化の列を確保します。
+
+    Returns:
+        tuple: (timestamps, data) _parse_csv_bodyと同じ形式
+
+    Raises:
+        ValueError: 範囲間で列数が一致しない場合に発生します
+    """
+    blocks = [block for block in blocks if block.size > 0]
+    if not blocks:
+        return None, np.empty((0,))
+    num_columns = blocks[0].shape[1]
+    if any(block.shape[1] != num_columns for block in blocks):
+        raise ValueError("範囲間で列数が一致しません。")
+
+    num_rows = sum(block.shape[0] for block in blocks)
+    timestamps, data = _allocate_output(num_rows, num_columns, extra_columns, dtype, timestamp_dtype)
+    row = 0
+    for block in blocks:
+        _write_block(timestamps, data, row, block)
+        row += block.shape[0]
+    return timestamps, data
+
+
+def _allocate_output(num_rows: int, num_columns: int, extra_columns=0, dtype=np.float64, timestamp_dtype=None):
+    """
+    読み込み結果を書き込む配列を確保します。
+    timestamp_dtypeを指定した場合は、1列目を別のタイムスタンプ配列として確保します。
+    """
+    if timestamp_dtype is None:
+        return None, np.empty((num_rows, num_columns + extra_columns), dtype=dtype)
+    timestamps = np.empty(num_rows, dtype=timestamp_dtype)
+    data = np.empty((num_rows, num_columns - 1 + extra_columns), dtype=dtype)
+    return timestamps, data
+
+
+def _write_block(timestamps, data, row: int, block: np.ndarray) -> None:
+    """
+    倍精度で変換されたブロックを、_allocate_outputで確保した配列のrow行目から書き込みます。
+    """
+    num_rows = block.shape[0]
+    if timestamps is None:
+        data[row:row + num_rows, :block.shape[1]] = block
+    else:
+        timestamps[row:row + num_rows] = _convert_timestamps(block[:, 0], timestamps.dtype)
+        data[row:row + num_rows, :block.shape[1] - 1] = block[:, 1:]
+
+
+def _convert_timestamps(values: np.ndarray, timestamp_dtype) -> np.ndarray:
+    """
+    倍精度のタイムスタンプをtimestamp_dtypeに変換します。
+    整数型は値を丸め、datetime64/timedelta64は値を秒として単位に合わせて変換します。
+    """
+    timestamp_dtype = np.dtype(timestamp_dtype)
+    if timestamp_dtype.kind in 'Mm':
+        unit, _ = np.datetime_data(timestamp_dtype)
+        scale = np.timedelta64(1, 's') / np.timedelta64(1, unit)
+        return np.rint(values * scale).astype(np.int64).view(timestamp_dtype)
+    if timestamp_dtype.kind in 'iu':
+        return np.rint(values).astype(timestamp_dtype)
+    return values.astype(timestamp_dtype)
+
+
+def _copy_into_output(data: np.ndarray, extra_columns=0, dtype=None, timestamp_dtype=None):
+    """
+    読み込み済みのdataを、_allocate_outputで確保した配列にコピーします。
+
+    Returns:
+        tuple: (timestamps, data) _parse_csv_bodyと同じ形式
+    """
+    data = np.atleast_2d(data)
+    timestamps, output = _allocate_output(data.shape[0], data.shape[1], extra_columns,
+                                          data.dtype if dtype is None else dtype, timestamp_dtype)
+    _write_block(timestamps, output, 0, data)
+    return timestamps, output
+
+
+def _reserve_columns(data: np.ndarray, extra_columns: int) -> np.ndarray:
+    """
+    dataの後ろにextra_columns列の未初期化の列を確保した配列を作成し、dataをコピーします。
+    """
+    return _copy_into_output(data, extra_columns)[1]
+
+
+def _parse_csv_block(block: bytes, delimiter: str = ',', fillna=True, fillna_value=0, usecols=None) -> np.ndarray:
+    """
+    ヘッダーを含まないCSVのバイト列を、行単位のPythonループなしで2次元のfloat配列に変換します。
+    空のフィールドはnp.genfromtxtと同様にfillna_value（fillna=Falseの場合はNaN）で埋めます。
+    数値以外の文字列やコメントが含まれる場合は、同じ意味論を保つためnp.genfromtxtで変換します。
+    usecolsを指定した場合は、指定した列のみを変換します。
+
+    Raises:
+        ValueError: 行ごとの列数が一致しない場合に発生します
+    """
+    if not block.strip():
+        return np.empty((0, 0))
+
+    # 欠損値のない数値データは、np.loadtxtのCパーサーで一括変換
+    try:
+        return np.loadtxt(io.BytesIO(block), delimiter=delimiter, ndmin=2, usecols=usecols)
+    except ValueError:
+        pass
+
+    sep = delimiter.encode('utf-8')
+    lines = [line for line in block.splitlines() if line.strip()]
+    num_rows = len(lines)
+    num_columns = lines[0].count(sep) + 1
+    if b'#' not in block:
+        counts = np.char.count(np.array(lines), sep)
+        if not (counts == num_columns - 1).all():
+            raise ValueError(f"列数が一致しない行があります（{num_columns}列）")
+
+        # 空のフィールドを含む場合は、フィールド単位の配列にしてからまとめて変換
+        fields = np.array(sep.join(lines).split(sep)).reshape(num_rows, num_columns)
+        if usecols is not None:
+            fields = fields[:, usecols]
+        missing = fields == b''
+        if fields.itemsize < 3:
+            fields = fields.astype('S3')
+        fields[missing] = b'nan'
+        try:
+            data = fields.astype(np.float64)
+        except ValueError:
+            data = None
+
+        if data is not None:
+            if fillna:
+                data[missing] = fillna_value
+            return data
+
+    args = {'delimiter': delimiter, 'ndmin': 2}
+    if fillna:
+        args['filling_values'] = fillna_value
+    if usecols is not None:
+        args['usecols'] = usecols
+    return np.genfromtxt(io.BytesIO(b'\n'.join(lines)), **args)
+
+
 def validate_csv_path(csv_path: str) -> str:
     """ 
     CSVファイルのパスを検証します。
@@ -134,7 +876,9 @@ def validate_csv_path(csv_path: str) -> str:
         InvalidFileTypeError: ファイルがCSVファイルでない場合に発生します
         FileNotFoundError: ファイルが見つからない場合に発生します
     """
-    if not csv_path.endswith('.csv'):
+    # 圧縮されたCSVファイル（.csv.gz、.csv.bz2、.csv.xz）も受け付ける
+    name = os.path.splitext(csv_path)[0] if is_compressed_path(csv_path) else csv_path
+    if not name.endswith('.csv'):
         raise InvalidFileTypeError("CSVファイルではありません。拡張子を確認してください。")
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"ファイルが存在しません。: {csv_path}") 
@@ -1,5 +1,15 @@
 import numpy as np
-from .csv_module import load_csv_file
+from .csv_module import load_csv_columns, load_header, iter_csv_chunks, load_csv_tail, save_csv_file, WRITE_BUFFER_BYTES
+from .csv_module import _copy_into_output, _resolve_usecols, _project_header, _convert_timestamps, _parse_csv_range
+from .csv_module import validate_csv_path, open_csv, find_last_line_end, is_compressed_path, CSVFileReadError
+from .binary_module import is_binary_path, save_binary_file
+from .cache_module import CSVCache, DEFAULT_CACHE_MAX_BYTES
+from .index_module import load_row_index, DEFAULT_INDEX_ROWS
+from .resample_module import TimeResampler, resample
+from .expression_module import DerivedColumns, parse_expressions
+from .pipeline_module import run_pipeline, DEFAULT_QUEUE_SIZE
+from .profile_module import profile_stage, file_size
+from .shared_module import SharedArrays
 import os
 from typing import Dict, Any, Optional
 
@@ -16,27 +26,72 @@ class CSVColumnSummer:
         combined_data (np.ndarray): 新しく生成された列を含む全データ配列。
         added_column (np.ndarray): 新しく生成された単一列データ配列。
         added_header (str): 新しく生成された単一列のヘッダー値。
+        derived_data (np.ndarray): expressionsオプションで指定した派生列のデータ配列（bufferのビュー）。
+        derived_names (list): 派生列の列名。
+        buffer (np.ndarray): データと新しく生成された列を格納する単一の配列。
+            data、combined_data、added_column、derived_dataはこの配列のビューです。
+            タイムスタンプは型を個別に指定できるよう、別の配列timestampsに格納します。
 
     Methods:
         set_config(**kwargs): CSVColumnSummerクラスのオプションを設定します。
             delimiter: str : CSVファイルの区切り文字 デフォルト: ','
             fmt: str : 保存時のCSVファイルのフォーマット デフォルト: '%.8g'
+            resample: float : ロード後、合計の前にデータを集計する区間の長さ（秒） デフォルト: None
         show_config(): 現在設定されているオプションを表示します。
-        add_sum_column(sum_target=None, timestamp=True): 選択した列の合計を新しい列として追加します。
+        add_sum_column(sum_target=None): 選択した列の合計を新しい列に書き込みます。
         save_data(save_path="./added_data.csv", header="AddedData", sum_target=None, timestamp=True): 生成された列を含むデータを新しいCSVファイルとして保存します。
+        stream_data(path, save_path="./added_data.csv", header="new_data"): CSVファイルをチャンクごとに読み込み、合計列を追加して保存します。
+        pipeline_data(path, save_path="./added_data.csv", header="new_data"): 読み込み、計算、書き込みを並行に実行し、load_data→save_dataと同じ結果を得ます。
+        load_range(path, t_start, t_end): 疎なインデックスを使い、指定した時間範囲の行のみをロードします。
+        update_data(): ロード後にCSVファイルに追記された行のみを読み込み、データと合計列、保存済みのCSVファイルに追加します。
         get_data(): ロードされたデータを返します。
-        get_header(): ロードされたデータのヘッダーを返します。
+        share_data(): 合計列を含むデータとタイムスタンプを共有メモリに配置し、他のプロセスに名前で渡せるようにします。
+        get_header(as_list=False): ロードされたデータのヘッダーを返します。
     """
 
     # - delimiter: str : CSVファイルの区切り文字 デフォルト: ','
     # - fmt: str : 保存するCSVファイルのフォーマット設定　ディフォルト：'%8g'
-    # - loader: str : データロード方法を指定、'np' または 'pd'
+    # - loader: str : データロード方法を指定、'np'、'pd'、'fast' または 'parallel'
     # - added_header: str : 新しく生成されるデータ列のヘッダー名
+    # - workers: int : loaderが'parallel'の場合のプロセス数 デフォルト: None（CPUコア数）
+    # - chunk_rows: int : stream_dataで1回に読み込む行数 デフォルト: 100000
+    # - cache: bool : 読み込み結果をディスクにキャッシュし、次回以降はメモリマップで読み込むかどうか デフォルト: False
+    # - cache_dir: str : キャッシュディレクトリ デフォルト: None（~/.cache/time_data_plotter）
+    # - cache_max_bytes: int : キャッシュディレクトリの最大合計バイト数 デフォルト: 1GiB
+    # - dtype: str : データ配列の型 デフォルト: 'float64'（'float32'でメモリ使用量が半分）
+    # - timestamp_dtype: str : タイムスタンプ配列の型 デフォルト: 'float64'（'int64'、'datetime64[ms]'など）
+    # - index_rows: int : load_rangeで使うインデックスに記録する行の間隔 デフォルト: 10000
+    # - index_dir: str : インデックスファイルを保存するディレクトリ デフォルト: None（~/.cache/time_data_plotter/index）
+    # - fillna: bool : 欠損値を埋めるかどうか デフォルト: True
+    # - fillna_value: float : 欠損値を埋める値 デフォルト: 0
+    # - usecols: list : 読み込むデータ列のインデックス（タイムデータを除く）またはヘッダー名 デフォルト: None（全ての列）
+    # - resample: float : 合計・保存の前にデータを集計する区間の長さ（秒） デフォルト: None（集計しない）
+    # - resample_method: str : 区間ごとの集計方法、'mean'、'min'、'max'または'last' デフォルト: 'mean'
+    # - expressions: dict : 合計列の後ろに追加する派生列の{列名: 式} デフォルト: None（合計列のみ）
+    # - pipeline: bool : stream_dataで読み込み、計算、書き込みを別のスレッドで並行に実行するかどうか デフォルト: False
+    # - queue_size: int : pipelineの段の間のキューに保持するチャンク数 デフォルト: 4
     DEFAULT_OPTIONS = {
         'delimiter': ',',
         'fmt': '%8g',
         'loader': 'np',
         'added_header': 'AddedData',
+        'workers': None,
+        'chunk_rows': 100000,
+        'cache': False,
+        'cache_dir': None,
+        'cache_max_bytes': DEFAULT_CACHE_MAX_BYTES,
+        'dtype': 'float64',
+        'timestamp_dtype': 'float64',
+        'index_rows': DEFAULT_INDEX_ROWS,
+        'index_dir': None,
+        'fillna': True,
+        'fillna_value': 0,
+        'usecols': None,
+        'resample': None,
+        'resample_method': 'mean',
+        'expressions': None,
+        'pipeline': False,
+        'queue_size': DEFAULT_QUEUE_SIZE,
     }
 
     def __init__(self, path: str = None, options: Optional[Dict[str, Any]] = None):
@@ -55,8 +110,23 @@ class CSVColumnSummer:
         self.num_columns: Optional[int] = None
         self.num_raws: Optional[int] = None
         
+        self.buffer: Optional[np.ndarray] = None
         self.combined_data = None
         self.added_column = None
+        self.derived_data = None
+        self.derived_names = []
+        self.new_data_name = None
+        self._derived: Optional[DerivedColumns] = None
+        # bufferのデータ列の後ろに確保した列数（合計列と派生列）
+        self._num_added = 1
+
+        # update_dataで追記された行を読み込むための状態
+        self.source_path: Optional[str] = None
+        self.save_path: Optional[str] = None
+        self.sum_target = None
+        self._read_offset = 0
+        self._storage: Optional[np.ndarray] = None
+        self._timestamp_storage: Optional[np.ndarray] = None
 
         self.process_options = self.DEFAULT_OPTIONS.copy()
 
@@ -75,8 +145,35 @@ class CSVColumnSummer:
             **kwargs: オプションのキーワード引数
                 delimiter (str): CSVファイルの区切り文字 デフォルト: ','
                 fmt (str): 保存時のCSVファイルのフォーマット デフォルト: '%.8g'
-                loader (str): 'np'または'pd'を指定（デフォルト: 'np'）
+                loader (str): 'np'、'pd'、'fast'または'parallel'を指定（デフォルト: 'np'）
                 added_header (str): 新しく生成された列のヘッダー名（デフォルト: 'AddedData'）
+                workers (int): loaderが'parallel'の場合のプロセス数（デフォルト: None、CPUコア数）
+                chunk_rows (int): stream_dataで1回に読み込む行数（デフォルト: 100000）
+                cache (bool): 読み込み結果をディスクにキャッシュするかどうか（デフォルト: False）
+                cache_dir (str): キャッシュディレクトリ（デフォルト: None、~/.cache/time_data_plotter）
+                cache_max_bytes (int): キャッシュディレクトリの最大合計バイト数（デフォルト: 1GiB）
+                dtype (str): データ配列の型（デフォルト: 'float64'）。合計は倍精度で計算します。
+                timestamp_dtype (str): タイムスタンプ配列の型（デフォルト: 'float64'）
+                    整数型は値を丸め、datetime64/timedelta64は値を秒として変換します。
+                index_rows (int): load_rangeで使うインデックスに記録する行の間隔（デフォルト: 10000）
+                index_dir (str): インデックスファイルを保存するディレクトリ（デフォルト: None、~/.cache/time_data_plotter/index）
+                fillna (bool): 欠損値を埋めるかどうか（デフォルト: True）
+                fillna_value (float): 欠損値を埋める値（デフォルト: 0）
+                usecols (list): 読み込むデータ列のインデックス（タイムデータを除く）またはヘッダー名のリスト
+                    （デフォルト: None、全ての列）。タイムデータの列は常に読み込みます。
+                    指定した列のみを解析・保持するため、読み込み時間とメモリ使用量は選択した列数に比例します。
+                    sum_targetのインデックスは、選択した列の中での順番になります。
+                resample (float): ロード後、合計・保存・プロットの前にデータを集計する区間の長さ（秒）
+                    （デフォルト: None、集計しない）。区間は時刻0を基準に区切り、区間の開始時刻をタイムスタンプにします。
+                    行がない区間は出力しません。stream_dataではチャンクをまたぐ区間もまとめて集計します。
+                resample_method (str): 区間ごとの集計方法、'mean'、'min'、'max'または'last'（デフォルト: 'mean'）
+                expressions (dict または list): 合計列の後ろに追加する派生列の{列名: 式}の辞書、
+                    または'列名=式'のリスト（デフォルト: None、合計列のみ）。式では列をヘッダー名で参照します。
+                    例: {'diff12': 'wave1 - wave2', 'power': 'rms(wave1, wave2)', 'smooth': 'ma(wave1, 100)'}
+                    使用できる関数はexpression_module.DerivedColumnsを参照してください。
+                pipeline (bool): stream_dataで、読み込み、計算、書き込みを別のスレッドで並行に実行するかどうか
+                    （デフォルト: False）。pipeline_dataは常に並行に実行します。
+                queue_size (int): pipelineの段の間のキューに保持するチャンク数（デフォルト: 4）
         """
         if not kwargs:
             raise ValueError("オプションを指定してください。")
@@ -93,20 +190,249 @@ class CSVColumnSummer:
     def load_data(self, path) -> None:
         """
         指定したパスのCSVファイルをロードし、クラス内部の変数にデータを保存します。
+        読み込みを始める時点の最後の改行までを読み込み、その位置を記録して、update_dataでそれ以降に追記された行のみを読み込めるようにします。
+        読み込み中に追記された行や、末尾の書き込み途中の行（最後の改行より後ろ）はupdate_dataで読み込みます。
+        拡張子が.npy、.npz、.colsの場合は、save_dataでバイナリ形式で保存したファイルを解析せずに読み込みます。
         """
         loader = self.process_options.get('loader', 'np')
         delimiter = self.process_options.get('delimiter', ',')
+        workers = self.process_options.get('workers')
+        
+        dtype = self.process_options.get('dtype', 'float64')
+        timestamp_dtype = self.process_options.get('timestamp_dtype', 'float64')
+        usecols = self._get_file_usecols()
+        fillna = self.process_options.get('fillna', True)
+        fillna_value = self.process_options.get('fillna_value', 0)
+        num_added = self._get_num_added()
+        # 読み込み中に追記される行を含めないよう、読み込みを始める時点の最後の改行までを読み込む
+        # バイナリ形式のファイルには行を追記できず、圧縮されたファイルは途中から読めないため、ファイル全体を読み込む
+        end = None
+        if not is_binary_path(path) and not is_compressed_path(path):
+            end = find_last_line_end(validate_csv_path(path))
         
-        data, header_line = load_csv_file(path, delimiter=delimiter,loader=loader)
-        num_columns = len(data[0])
+        with profile_stage('load', num_bytes=file_size(path), path=path) as stage:
+            # 合計列の分を確保した配列に直接読み込み、合計はその列に書き込む
+            # バイナリ形式のファイルは解析が不要なため、キャッシュを使用しない
+            if self.process_options.get('cache') and not is_binary_path(path):
+                cache = CSVCache(self.process_options.get('cache_dir'), self.process_options.get('cache_max_bytes'))
+                data, header_line = cache.load(path, delimiter=delimiter, loader=loader, workers=workers,
+                                               fillna=fillna, fillna_value=fillna_value, usecols=usecols, end=end)
+                timestamps, buffer = _copy_into_output(data, num_added, dtype, timestamp_dtype)
+            else:
+                timestamps, buffer, header_line = load_csv_columns(path, delimiter=delimiter, loader=loader,
+                                                                   fillna=fillna, fillna_value=fillna_value,
+                                                                   workers=workers, extra_columns=num_added,
+                                                                   dtype=dtype, timestamp_dtype=timestamp_dtype,
+                                                                   usecols=usecols, end=end)
+            stage['rows'] = len(timestamps)
+        # update_dataは読み込んだバイト位置から、それ以降に追記された行を読み込む
+        self._read_offset = end or 0
+        # バイナリ形式のファイルには行を追記できないため、update_dataの対象にしない
+        self.source_path = None if is_binary_path(path) else path
+        self.save_path = None
+        self.sum_target = None
+
+        self.csv_header = header_line
+        self._set_derived(header_line, num_added)
+        timestamps, buffer = self._resample_storage(timestamps, buffer)
+        self._set_storage(timestamps, buffer, len(timestamps))
+
+        self._get_combined_data()
+
+    def load_range(self, path, t_start, t_end) -> None:
+        """
+        タイムスタンプがt_start以上t_end以下の行のみをロードし、load_dataと同様にクラス内部の変数に保存します。
+        最初の呼び出しでindex_rows行ごとのバイト位置とタイムスタンプの疎なインデックスを作成して保存し、
+        以降はインデックスを二分探索して、時間範囲を含む部分のみをファイルから読み込みます。
+        タイムスタンプはCSVファイルの値（timestamp_dtypeで変換する前の値）で比較し、昇順である必要があります。
+        ロード後の合計、保存、プロットはload_dataの場合と同じように使用できます。
+
+        Args:
+            path (str): CSVファイルのパス
+            t_start (float): 読み込む範囲の開始時刻
+            t_end (float): 読み込む範囲の終了時刻
+
+        Raises:
+            ValueError: 時間範囲に行が含まれない場合に発生します。
+            CSVFileReadError: CSVファイルの読み込みに失敗した場合に発生します
+        """
+        if t_start > t_end:
+            raise ValueError(f"t_startはt_end以下を指定してください。: {t_start} > {t_end}")
+        path = validate_csv_path(path)
+        delimiter = self.process_options.get('delimiter', ',')
+        dtype = self.process_options.get('dtype', 'float64')
+        timestamp_dtype = self.process_options.get('timestamp_dtype', 'float64')
+
+        header_line = load_header(path, delimiter=delimiter)
+        usecols = self._get_file_usecols()
+        if usecols is not None:
+            usecols = _resolve_usecols(header_line, usecols)
+            header_line = _project_header(header_line, usecols)
 
-        self.timestamps = data[:,0]
-        self.data = data[:,1:]
+        num_added = self._get_num_added()
+        index = load_row_index(path, delimiter=delimiter, index_rows=self.process_options.get('index_rows'),
+                               index_dir=self.process_options.get('index_dir'))
+        start, end = index.locate(t_start, t_end)
+        # 範囲の判定のため、タイムスタンプは倍精度で読み込んでから変換する
+        with profile_stage('load_range', num_bytes=end - start, path=path) as stage:
+            try:
+                timestamps, buffer = _parse_csv_range(path, start, end, delimiter,
+                                                      self.process_options.get('fillna', True),
+                                                      self.process_options.get('fillna_value', 0),
+                                                      extra_columns=num_added, dtype=dtype, timestamp_dtype=np.float64,
+                                                      usecols=usecols)
+            except Exception as e:
+                raise CSVFileReadError(path, e)
+            stage['rows'] = 0 if timestamps is None else len(timestamps)
+        if timestamps is None:
+            raise ValueError(f"{t_start}から{t_end}の範囲に行がありません。")
+        first = int(np.searchsorted(timestamps, t_start, side='left'))
+        last = int(np.searchsorted(timestamps, t_end, side='right'))
+        if first >= last:
+            raise ValueError(f"{t_start}から{t_end}の範囲に行がありません。")
+
+        # 範囲外の行を除いた部分はビューのため、コピーしない
+        buffer = buffer[first:last]
+        timestamps = _convert_timestamps(timestamps[first:last], timestamp_dtype)
+
+        # 範囲のみのデータのため、update_dataでの追記には使用できない
+        self.source_path = None
+        self.save_path = None
+        self.sum_target = None
         self.csv_header = header_line
-        self.num_columns = num_columns-1
-        self.num_data = len(self.timestamps)
+        self._set_derived(header_line, num_added)
+        timestamps, buffer = self._resample_storage(timestamps, buffer)
+        self._set_storage(timestamps, buffer, len(timestamps))
+
+        self._get_combined_data()
+        print(f"{path}の{t_start}から{t_end}の範囲（{self.num_data}行）をロードしました。")
+
+    def _resample_storage(self, timestamps, storage):
+        """
+        resampleオプションを指定した場合に、ロードしたデータを区間ごとに集計し、合計列と派生列の分を確保した新しい配列を返します。
+        指定していない場合は、timestampsとstorageをそのまま返します。
+        """
+        interval = self.process_options.get('resample')
+        if not interval:
+            return timestamps, storage
+        num_columns = storage.shape[1] - self._num_added
+        num_rows = len(timestamps)
+        with profile_stage('resample', rows=num_rows, num_bytes=storage[:, :num_columns].nbytes):
+            timestamps, values = resample(timestamps, storage[:, :num_columns], interval,
+                                          self.process_options.get('resample_method', 'mean'))
+            resampled = np.empty((len(timestamps), storage.shape[1]), dtype=storage.dtype)
+            resampled[:, :num_columns] = values
+        print(f"{interval}秒ごとに集計しました。: {num_rows}行 → {len(timestamps)}行")
+        return timestamps, resampled
+
+    def _get_num_added(self):
+        """
+        データ列の後ろに確保する列数（合計列と、expressionsオプションで指定した派生列）を返します。
+        """
+        return 1 + len(parse_expressions(self.process_options.get('expressions')))
+
+    def _set_derived(self, header_line, num_added):
+        """
+        ロードしたデータのヘッダーから、expressionsオプションの派生列の式を準備します。
+        """
+        expressions = self.process_options.get('expressions')
+        self._derived = DerivedColumns(expressions, header_line.split(',')[1:]) if expressions else None
+        self.derived_names = self._derived.names if self._derived is not None else []
+        self._num_added = num_added
+
+    def _set_storage(self, timestamp_storage, storage, num_data):
+        """
+        確保済みの配列の先頭num_data行を、timestamps、data、combined_data、added_column、derived_dataのビューとして設定します。
+        storageはupdate_dataで追記できるよう、num_dataより多くの行を確保している場合があります。
+        """
+        num_columns = storage.shape[1] - self._num_added
+        buffer = storage[:num_data]
 
-        self.combined_data = self._get_combined_data()
+        self._storage = storage
+        self._timestamp_storage = timestamp_storage
+        self.buffer = buffer
+        self.timestamps = timestamp_storage[:num_data]
+        self.data = buffer[:,:num_columns]
+        self.combined_data = buffer
+        self.added_column = buffer[:,num_columns]
+        self.derived_data = buffer[:,num_columns + 1:]
+        self.num_columns = num_columns
+        self.num_data = num_data
+
+    def update_data(self) -> int:
+        """
+        load_dataの後にCSVファイルに追記された行のみを読み込み、タイムスタンプ、データ、合計列を延長します。
+        合計列は最後にadd_sum_columnで指定したsum_targetで計算します。
+        save_dataで保存済みの場合は、追記された行を保存したCSVファイルの末尾にも追加します。
+        配列は2倍ずつ大きく確保し直すため、追記を繰り返してもコピーの合計は行数に比例します。
+        確保し直した場合、以前にget_dataで取得した配列は更新されないため、再度get_dataを実行してください。
+
+        Returns:
+            int: 追加した行数
+
+        Raises:
+            ValueError: データがロードされていない場合、または追記された行の列数が一致しない場合に発生します。
+        """
+        self._data_check()
+        if self.source_path is None:
+            raise ValueError("update_dataはload_dataでロードしたデータにのみ使用できます。")
+        # 最後の区間は保存済みのため、追記された行をまとめて集計し直せない
+        if self.process_options.get('resample'):
+            raise ValueError("resampleを指定した場合、update_dataは使用できません。")
+
+        rows, self._read_offset = load_csv_tail(
+            self.source_path, self._read_offset,
+            delimiter=self.process_options.get('delimiter', ','),
+            fillna=self.process_options.get('fillna', True),
+            fillna_value=self.process_options.get('fillna_value', 0),
+            usecols=self._get_file_usecols())
+        num_new = rows.shape[0]
+        if num_new == 0:
+            return 0
+        if rows.shape[1] != self.num_columns + 1:
+            raise ValueError(f"追記された行の列数が一致しません: {rows.shape[1] - 1} != {self.num_columns}")
+
+        start = self.num_data
+        num_data = start + num_new
+        storage, timestamp_storage = self._storage, self._timestamp_storage
+        if num_data > len(storage):
+            capacity = max(num_data, 2 * len(storage))
+            storage = _grow_rows(storage, start, capacity)
+            timestamp_storage = _grow_rows(timestamp_storage, start, capacity)
+        timestamp_storage[start:num_data] = _convert_timestamps(rows[:, 0], timestamp_storage.dtype)
+        storage[start:num_data, :self.num_columns] = rows[:, 1:]
+        self._set_storage(timestamp_storage, storage, num_data)
+
+        new_rows = self.buffer[start:]
+        _sum_columns(new_rows[:, :self.num_columns], self.sum_target, out=new_rows[:, self.num_columns])
+        # 移動平均などは追記前の行も参照するため、データ全体を渡して追記された行のみを計算する
+        if self._derived is not None:
+            self._derived.evaluate(self.data, self.derived_data[start:], start=start)
+
+        # バイナリ形式は末尾に追加できないため、全ての行を保存し直す
+        if self.save_path is not None and is_binary_path(self.save_path):
+            save_binary_file(self.save_path, self.timestamps, self.combined_data, self.added_header,
+                             new_data_name=self.new_data_name)
+        elif self.save_path is not None:
+            with open_csv(self.save_path, 'a', buffering=WRITE_BUFFER_BYTES) as f:
+                save_csv_file(f, new_rows, fmt=self.process_options['fmt'])
+        return num_new
+
+    def _get_file_usecols(self):
+        """
+        usecolsオプションを、タイムデータの列を先頭に含むファイル内の列の指定に変換します。
+        インデックスはタイムデータを除いた順番のため、1を加えてファイル内の列インデックスにします。
+        負のインデックスは末尾からの順番で、ファイル内でも同じ列を指すため、そのまま使用します。
+        タイムデータの列を指定した場合（ヘッダー名、またはデータ列の数を超える負のインデックス）は、
+        先頭のタイムデータの列と重複するため、列を変換するときにValueErrorになります。
+        """
+        usecols = self.process_options.get('usecols')
+        if usecols is None:
+            return None
+        if isinstance(usecols, (int, str)):
+            usecols = [usecols]
+        return [0] + [column if isinstance(column, str) or int(column) < 0 else int(column) + 1
+                      for column in usecols]
 
     def _data_check(self) -> None:
         """
@@ -119,26 +445,48 @@ class CSVColumnSummer:
             raise ValueError("データがロードされていません。loadメソッドを実行してください。")
 
 
-    def _get_combined_data(self, sum_target=None):
+    def add_sum_column(self, sum_target=None):
+        """
+        各行ごとに選択された列の値を合計し、新しい列に書き込みます。
+        新しい配列は確保せず、ロード時に確保した列を上書きします。
+
+        Args:
+            sum_target (int、list、sliceまたはNone): 合計する列のインデックス（タイムデータを除く）。
+                Noneの場合は全ての列を合計します。
+
+        Returns:
+            np.ndarray: 新しく生成された列を含むデータ配列（bufferのビュー）
+        """
+        self._data_check()
+        return self._get_combined_data(sum_target)
+
+    def _get_combined_data(self, sum_target=None, data=None, history=None):
         """
         各行ごとにデータの選択された列の値を合計し、新しい列を生成します。
-        新しく生成された列は既存データの最後の列に追加されます。
-        結果にタイムスタンプデータを含めるかどうかを選択できます。
+        新しく生成された列は既存データの最後の列に追加され、expressionsオプションの派生列はその後ろに追加されます。
+        dataを指定しない場合は、ロード済みのbufferの合計列と派生列に直接書き込み、combined_dataを返します。
+        dataを指定した場合は、dataに合計列と派生列を追加した新しい配列を返します。
+        historyには、派生列の移動平均などで参照するdataの直前の行を指定します。
         """        
-        data = self.data
+        if data is None:
+            with profile_stage('combine', rows=self.num_data, num_bytes=self.data.nbytes):
+                _sum_columns(self.data, sum_target, out=self.added_column)
+                self.sum_target = sum_target
+                if self._derived is not None:
+                    self._derived.evaluate(self.data, self.derived_data)
+            return self.combined_data
 
-        # 合計する列のインデックスが指定されていない場合は全ての列を合計
-        if sum_target is None:
-            sum_row = data.sum(axis=1)
-        # 合計する列のインデックスが指定されている場合はその列のみを合計
-        else:
-            selected_data = data[:, sum_target]
-            sum_row = selected_data.sum(axis=1)
-        
-        # 1次元配列を2次元に変換
-        sum_row = sum_row.reshape(-1, 1)  
-        # 新しいテータと既存データを結合
-        combined_data = np.hstack((data, sum_row))
+        dtype = self.process_options.get('dtype', 'float64')
+        num_columns = data.shape[1]
+        combined_data = np.empty((data.shape[0], num_columns + self._num_added), dtype=dtype)
+        combined_data[:, :num_columns] = data
+        _sum_columns(combined_data[:, :num_columns], sum_target, out=combined_data[:, num_columns])
+        if self._derived is not None:
+            if history is not None and len(history):
+                self._derived.evaluate(np.vstack([history, data]), combined_data[:, num_columns + 1:],
+                                       start=len(history))
+            else:
+                self._derived.evaluate(data, combined_data[:, num_columns + 1:])
         return combined_data
 
     def save_data(self, 
@@ -146,18 +494,185 @@ class CSVColumnSummer:
                 header='new_data'): 
         """
         新しく生成されたデータと結合データをCSVファイルとして保存します。
+        save_pathの拡張子が.npy、.npz、.colsの場合は、タイムスタンプを含めてバイナリ形式で保存し、
+        ヘッダー名と新しい列のヘッダー名をメタデータとして記録します。テキストへのフォーマットが不要なため、
+        CSVファイルより高速に保存でき、load_dataで解析せずに読み込めます。
         """
         self._data_check()
         save_path = save_path_check(save_path)
         combined_data = self.combined_data
         
-        header = self.csv_header + ',' +  header
+        new_data_name = header
+        header = ','.join([self.csv_header, header] + self.derived_names)
         self.added_header = header
+        self.new_data_name = new_data_name
 
-        np.savetxt(save_path, combined_data, delimiter=',',  header=self.added_header, fmt=self.process_options['fmt'])
+        with profile_stage('save', rows=self.num_data, path=save_path) as stage:
+            if is_binary_path(save_path):
+                save_binary_file(save_path, self.timestamps, combined_data, self.added_header, new_data_name=new_data_name)
+            else:
+                save_csv_file(save_path, combined_data, header=self.added_header, fmt=self.process_options['fmt'])
+            stage['bytes'] = file_size(save_path)
+        self.save_path = save_path
         print(f"生成されたデータが {save_path}に保存されました。 新しい列データのheader: {header}")
         return combined_data, header
-    
+
+    def stream_data(self,
+                path,
+                save_path="./added_data.csv",
+                header='new_data'):
+        """
+        CSVファイルをchunk_rows行ずつ読み込み、チャンクごとに合計列を追加して保存します。
+        ファイル全体をメモリに保持しないため、メモリより大きいファイルも処理できます。
+        保存されるファイルの内容はload_data→save_dataの結果と同じです。
+        ロードしたデータはクラス内部に保持しないため、get_dataは使用できません。
+        pipelineオプションを指定した場合は、読み込み、計算、書き込みを別のスレッドで並行に実行します。
+
+        Returns:
+            tuple: (num_data, header)
+                num_data (int): 処理した行数（resampleを指定した場合は集計後の行数）
+                header (str): 保存したファイルのヘッダー
+        """
+        num_data, header = self._process_chunks(path, save_path, header, keep=False,
+                                                pipeline=self.process_options.get('pipeline', False))
+        print(f"生成されたデータが {save_path}に保存されました。 新しい列データのheader: {header}")
+        return num_data, header
+
+    def pipeline_data(self,
+                path,
+                save_path="./added_data.csv",
+                header='new_data'):
+        """
+        load_data→save_dataと同じ処理を、読み込み、計算、書き込みの3段のパイプラインで並行に実行します。
+        読み込みスレッドがchunk_rows行ずつ読み込んで解析し、呼び出したスレッドが合計列と派生列を計算して
+        データを保持し、書き込みスレッドがフォーマットして保存します。段の間はqueue_sizeチャンクまでのキューでつなぎます。
+        保存されるファイルの内容とロードしたデータはload_data→save_dataの結果と同じで、get_data、update_dataも使用できます。
+
+        Returns:
+            tuple: (combined_data, header) save_dataと同じ形式
+        """
+        # 読み込み中に追記される行を含めないよう、読み込みを始める時点の最後の改行までを読み込み、
+        # update_dataはその位置から読み込む
+        end = None if is_compressed_path(path) else find_last_line_end(validate_csv_path(path))
+        self._process_chunks(path, save_path, header, keep=True, pipeline=True, end=end)
+        self._read_offset = end or 0
+        self.source_path = path
+        self.save_path = save_path
+        self.sum_target = None
+        print(f"生成されたデータが {save_path}に保存されました。 新しい列データのheader: {self.added_header}")
+        return self.combined_data, self.added_header
+
+    def _process_chunks(self, path, save_path, header, keep=False, pipeline=False, end=None):
+        """
+        CSVファイルをchunk_rows行ずつ読み込み、集計、合計列と派生列の計算、保存をチャンクごとに行います。
+        keepがTrueの場合は、計算したチャンクを2倍ずつ大きく確保し直す配列に追加し、load_dataと同様に保持します。
+        pipelineがTrueの場合はrun_pipelineで各段を並行に実行します。
+        endを指定した場合は、ファイルの先頭からendバイトまでの行のみを処理します。
+
+        Returns:
+            tuple: (num_data, header)
+        """
+        delimiter = self.process_options.get('delimiter', ',')
+        chunk_rows = self.process_options.get('chunk_rows', 100000)
+        dtype = self.process_options.get('dtype', 'float64')
+        timestamp_dtype = self.process_options.get('timestamp_dtype', 'float64')
+        if is_binary_path(save_path):
+            raise ValueError(f"stream_data、pipeline_dataではCSVファイルのみ保存できます。: {save_path}")
+        save_path = save_path_check(save_path)
+
+        usecols = self._get_file_usecols()
+
+        csv_header = load_header(path, delimiter=delimiter)
+        if usecols is not None:
+            usecols = _resolve_usecols(csv_header, usecols)
+            csv_header = _project_header(csv_header, usecols)
+        self._set_derived(csv_header, self._get_num_added())
+        header = ','.join([csv_header, header] + self.derived_names)
+        halo = self._derived.halo if self._derived is not None else 0
+        interval = self.process_options.get('resample')
+        resampler = TimeResampler(interval, self.process_options.get('resample_method', 'mean')) if interval else None
+        state = {'num_data': 0, 'num_columns': None, 'history': None, 'storage': None, 'timestamps': None}
+
+        def _compute(chunk, flush=False):
+            if chunk is not None:
+                state['num_columns'] = chunk.shape[1] - 1
+                timestamps, data = chunk[:,0], chunk[:,1:]
+            # 集計する場合は、確定した区間のみを書き込み、最後の区間は次のチャンクとまとめる
+            if resampler is not None:
+                timestamps, data = resampler.flush() if flush else resampler.push(timestamps, data)
+            if len(data) == 0:
+                return None
+            start = state['num_data']
+            state['num_data'] += len(data)
+            if keep:
+                return _append(start, timestamps, data)
+            combined_data = self._get_combined_data(data=data, history=state['history'])
+            # 次のチャンクの派生列の計算用に、直前のhalo行を保持する
+            if halo:
+                history = state['history']
+                state['history'] = np.vstack([history, data])[-halo:] if history is not None else data[-halo:].copy()
+            return combined_data
+
+        def _append(start, timestamps, data):
+            num_data, num_columns = state['num_data'], data.shape[1]
+            storage, timestamp_storage = state['storage'], state['timestamps']
+            if storage is None:
+                storage = np.empty((num_data, num_columns + self._num_added), dtype=dtype)
+                timestamp_storage = np.empty(num_data, dtype=_convert_timestamps(timestamps[:1], timestamp_dtype).dtype)
+            elif num_data > len(storage):
+                capacity = max(num_data, 2 * len(storage))
+                storage = _grow_rows(storage, start, capacity)
+                timestamp_storage = _grow_rows(timestamp_storage, start, capacity)
+            state['storage'], state['timestamps'] = storage, timestamp_storage
+            timestamp_storage[start:num_data] = _convert_timestamps(timestamps, timestamp_storage.dtype)
+            rows = storage[start:num_data]
+            rows[:, :num_columns] = data
+            _sum_columns(rows[:, :num_columns], None, out=rows[:, num_columns])
+            # 移動平均などは前のチャンクの行も参照するため、保持した全ての行を渡して追加した行のみを計算する
+            if self._derived is not None:
+                self._derived.evaluate(storage[:num_data, :num_columns], rows[:, num_columns + 1:], start=start)
+            return rows
+
+        # 読み込み、計算、保存が重なるため、チャンクごとではなく全体を1つの段として計測する
+        with profile_stage('pipeline' if pipeline else 'stream', num_bytes=file_size(path), path=path) as stage:
+            chunks = iter_csv_chunks(path, delimiter=delimiter, chunk_rows=chunk_rows,
+                                     fillna=self.process_options.get('fillna', True),
+                                     fillna_value=self.process_options.get('fillna_value', 0),
+                                     usecols=usecols, end=end)
+            with open_csv(save_path, 'w', buffering=WRITE_BUFFER_BYTES) as f:
+                written = [0]
+
+                def _write(combined_data):
+                    # ヘッダーは最初に書き込む行にのみ付ける
+                    save_csv_file(f, combined_data, header=header if written[0] == 0 else '',
+                                  fmt=self.process_options['fmt'])
+                    written[0] += len(combined_data)
+
+                if pipeline:
+                    timings = run_pipeline(chunks, _compute, _write,
+                                           self.process_options.get('queue_size', DEFAULT_QUEUE_SIZE))
+                    print("pipeline: " + ", ".join(f"{name}={seconds:.3f}s" for name, seconds in timings.items()))
+                    stage['pipeline_seconds'] = timings
+                else:
+                    for chunk in chunks:
+                        combined_data = _compute(chunk)
+                        if combined_data is not None:
+                            _write(combined_data)
+                if resampler is not None:
+                    combined_data = _compute(None, flush=True)
+                    if combined_data is not None:
+                        _write(combined_data)
+
+            stage['rows'] = state['num_data']
+        self.csv_header = csv_header
+        self.added_header = header
+        if keep:
+            self._set_storage(state['timestamps'], state['storage'], state['num_data'])
+        else:
+            self.num_columns = state['num_columns']
+            self.num_data = state['num_data']
+        return state['num_data'], header
+
     def get_data(self, combined=True):
         """
         ロードされたデータとタイムスタンプを返します。
@@ -183,6 +698,78 @@ class CSVColumnSummer:
         y_data = self.timestamps
         return x_data, y_data
 
+    def share_data(self) -> SharedArrays:
+        """
+        合計列を含むデータ（combined_data）とタイムスタンプを、multiprocessing.shared_memoryのセグメントに配置します。
+        返したSharedArraysのdescriptorを他のプロセスに渡すと、pickleで配列をコピーせずに
+        attach_shared_arraysで'combined_data'と'timestamps'のキーから同じデータを参照できます。
+        セグメントは呼び出し側が所有し、使い終わったらclose()で削除してください。
+
+        Returns:
+            SharedArrays: 'combined_data'と'timestamps'を配置した共有メモリ
+
+        Raises:
+            ValueError: データがロードされていない場合に発生します。
+        """
+        self._data_check()
+        with profile_stage('share_data', rows=self.num_data) as stage:
+            shared = SharedArrays({'combined_data': self.combined_data, 'timestamps': self.timestamps})
+            stage['bytes'] = shared.nbytes
+        return shared
+
+    def get_header(self, as_list=False):
+        """
+        ロードされたデータのヘッダーを返します。usecolsを指定した場合は選択した列のヘッダーのみを返します。
+
+        Args:
+            as_list (bool): Trueの場合、ヘッダー名のリストを返します。
+
+        Returns:
+            str または list: タイムデータを含むヘッダー
+
+        Raises:
+            ValueError: データがロードされていない場合に発生します。
+        """
+        if self.csv_header is None:
+            raise ValueError("データがロードされていません。loadメソッドを実行してください。")
+        return self.csv_header.split(',') if as_list else self.csv_header
+
+
+def _sum_columns(data, sum_target=None, out=None):
+    """
+    各行ごとにdataの選択された列の値を合計し、outに書き込みます。
+    sum_targetを指定した場合も選択した列のコピーは作成せず、1列ずつ加算します。
+    float32などの低精度のデータでも、合計は倍精度で計算してからoutの型に変換します。
+    """
+    accumulator_dtype = np.promote_types(data.dtype, np.float64)
+
+    # 合計する列のインデックスが指定されていない場合は全ての列を合計
+    if sum_target is None:
+        return np.sum(data, axis=1, dtype=accumulator_dtype, out=out)
+
+    # 合計する列のインデックスが指定されている場合はその列のみを合計
+    # outが倍精度の場合は、outに直接加算して新しい配列を確保しない
+    if out is not None and out.dtype == accumulator_dtype:
+        total = out
+        total[...] = 0
+    else:
+        total = np.zeros(data.shape[0], dtype=accumulator_dtype)
+    for column in np.atleast_1d(np.arange(data.shape[1])[sum_target]):
+        total += data[:, column]
+    if out is None or out is total:
+        return total
+    out[...] = total
+    return out
+
+
+def _grow_rows(array, num_rows, capacity):
+    """
+    arrayの先頭num_rows行をコピーした、capacity行の新しい配列を返します。
+    """
+    grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:num_rows] = array[:num_rows]
+    return grown
+
 
 def save_path_check(path):
     """
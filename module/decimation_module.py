@@ -0,0 +1,206 @@
+import numpy as np
+
+# 指定できる間引き方法
+DECIMATION_METHODS = ('minmax', 'lttb')
+
+
+def decimate(timestamps, values, num_points, method='minmax'):
+    """
+    全ての列をまとめて間引き、各列をおよそnum_points点に減らします。
+    行数がnum_points以下の場合は間引かずにそのまま返します。
+
+    Args:
+        timestamps (np.ndarray): 1次元のタイムスタンプ配列
+        values (np.ndarray): 各列が異なる時系列データを表す2次元配列
+        num_points (int): 間引き後の1列あたりの点数の目安
+        method (str): 'minmax'（区間ごとの最小値と最大値）または'lttb'（Largest-Triangle-Three-Buckets）
+
+    Returns:
+        tuple: (timestamps, values)
+            timestamps (np.ndarray): 間引き後のタイムスタンプ。間引いた場合は列ごとに異なるため2次元配列
+            values (np.ndarray): 間引き後のデータ配列
+
+    Raises:
+        ValueError: methodが'minmax'または'lttb'でない場合に発生します
+    """
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"methodは{DECIMATION_METHODS}のいずれかを指定してください。: {method}")
+    if len(timestamps) <= num_points:
+        return timestamps, values
+
+    if method == 'minmax':
+        # 1区間から最小値と最大値の2点を残すため、区間数は点数の半分にする
+        indices = minmax_indices(values, max(num_points // 2, 1))
+    else:
+        indices = lttb_indices(timestamps, values, max(num_points, 3))
+    columns = np.arange(values.shape[1])
+    return timestamps[indices], values[indices, columns]
+
+
+def minmax_indices(values, num_buckets):
+    """
+    行を同じ行数の区間に分け、各列について区間ごとの最小値と最大値の行インデックスを時間順に返します。
+    区間内のピークは必ず残るため、間引いた後も波形の包絡線が変わりません。
+
+    Returns:
+        np.ndarray: (区間数 * 2, 列数)の行インデックス配列
+    """
+    return _minmax_bucket_indices(values, -(-values.shape[0] // num_buckets))
+
+
+def minmax_pyramid(values, max_points, base_rows=4, factor=4):
+    """
+    拡大・縮小の表示用に、区間の行数をfactor倍ずつ大きくした最小値・最大値のピラミッドを作成します。
+    各段は前の段の点から作成するため、作成にかかる時間は最初の段の作成とほぼ同じです。
+    点数がmax_points以下になる段まで作成します。
+
+    Returns:
+        list: (bucket_rows, indices)のリスト。区間の行数が小さい段から順に並びます。
+            bucket_rows (int): 1区間の行数。行rはr // bucket_rows番目の区間に含まれます
+            indices (np.ndarray): (区間数 * 2, 列数)の行インデックス配列
+    """
+    return extend_minmax_pyramid([], values, 0, max_points, base_rows, factor)
+
+
+def extend_minmax_pyramid(levels, values, start_row, max_points, base_rows=4, factor=4):
+    """
+    valuesのstart_row行目以降が追加・変更された場合に、影響する区間のみを計算し直したピラミッドを返します。
+    各段で計算し直すのはstart_rowを含む区間以降のみのため、計算量は追加された行数と段数に比例します。
+    levelsが空の場合は、全ての行からピラミッドを作成します。
+
+    Returns:
+        list: minmax_pyramidと同じ形式のピラミッド
+    """
+    if start_row >= values.shape[0]:
+        return levels
+
+    bucket_rows = base_rows
+    first = start_row // bucket_rows
+    indices = _minmax_bucket_indices(values[first * bucket_rows:], bucket_rows) + first * bucket_rows
+    if levels:
+        indices = np.vstack([levels[0][1][:2 * first], indices])
+    new_levels = [(bucket_rows, indices)]
+
+    while len(indices) > max_points:
+        # 前の段のfirst番目の区間以降から、この段のfirst // factor番目の区間以降を作成する
+        # 以前のピラミッドにない段は全ての区間を作成する
+        previous = levels[len(new_levels)][1] if len(new_levels) < len(levels) else None
+        first = first // factor if previous is not None else 0
+        indices = _merge_minmax_buckets(indices[2 * first * factor:], values, factor)
+        if previous is not None:
+            indices = np.vstack([previous[:2 * first], indices])
+        bucket_rows *= factor
+        new_levels.append((bucket_rows, indices))
+    return new_levels
+
+
+def select_pyramid_level(levels, start, end, max_points):
+    """
+    行start:endを表示するのに、点数がmax_points以下となる最も細かい段の行インデックスを返します。
+    表示範囲の端で線が途切れないよう、前後に1区間ずつ余分に含めます。
+
+    Returns:
+        np.ndarray または None: (点数, 列数)の行インデックス配列。
+            表示する行数がmax_points以下の場合は、間引かずに表示できるためNoneを返します。
+    """
+    if end - start <= max_points:
+        return None
+    for bucket_rows, indices in levels:
+        first = max(start // bucket_rows - 1, 0)
+        last = end // bucket_rows + 2
+        if 2 * (last - first) <= max_points:
+            break
+    return indices[2 * first:2 * last]
+
+
+def _merge_minmax_buckets(indices, values, factor):
+    """
+    1つ下の段のfactor区間ずつの最小値・最大値の点から、1つ上の段の区間の最小値・最大値の点を求めます。
+    """
+    num_columns = values.shape[1]
+    columns = np.arange(num_columns)
+    group = 2 * factor
+    # 最後の点を繰り返して埋めても、区間の最小値・最大値は変わらない
+    padding = -len(indices) % group
+    if padding:
+        indices = np.vstack([indices, np.repeat(indices[-1:], padding, axis=0)])
+    grouped = indices.reshape(-1, group, num_columns)
+    grouped_values = values[grouped, columns]
+    lower = np.take_along_axis(grouped, grouped_values.argmin(axis=1)[:, np.newaxis], axis=1)[:, 0]
+    upper = np.take_along_axis(grouped, grouped_values.argmax(axis=1)[:, np.newaxis], axis=1)[:, 0]
+    return np.stack([np.minimum(lower, upper), np.maximum(lower, upper)], axis=1).reshape(-1, num_columns)
+
+
+def _minmax_bucket_indices(values, bucket_rows):
+    """
+    行をbucket_rows行ずつの区間に分け、各列について区間ごとの最小値と最大値の行インデックスを時間順に返します。
+    """
+    num_rows = values.shape[0]
+    num_full = num_rows // bucket_rows
+
+    # 行数が割り切れる部分はコピーせずに(区間, 区間内の行, 列)の形に変形してまとめて求める
+    full = values[:num_full * bucket_rows].reshape(num_full, bucket_rows, values.shape[1])
+    offsets = (np.arange(num_full) * bucket_rows)[:, np.newaxis]
+    lower = full.argmin(axis=1) + offsets
+    upper = full.argmax(axis=1) + offsets
+
+    # 余りの行は最後の区間として扱う
+    if num_full * bucket_rows < num_rows:
+        tail = values[num_full * bucket_rows:]
+        lower = np.vstack([lower, tail.argmin(axis=0) + num_full * bucket_rows])
+        upper = np.vstack([upper, tail.argmax(axis=0) + num_full * bucket_rows])
+
+    # 線が時間を逆行しないよう、区間内では前にある点を先にする
+    indices = np.stack([np.minimum(lower, upper), np.maximum(lower, upper)], axis=1)
+    return indices.reshape(-1, values.shape[1])
+
+
+def lttb_indices(timestamps, values, num_points):
+    """
+    Largest-Triangle-Three-Bucketsで、各列について残す行インデックスを返します。
+    区間の選択は前の区間で選んだ点に依存するため区間ごとに順番に処理しますが、
+    各区間の計算は全ての列についてまとめて行います。
+
+    Returns:
+        np.ndarray: (num_points, 列数)の行インデックス配列
+    """
+    num_rows, num_columns = values.shape
+    times = _as_float_times(timestamps)
+
+    # 最初と最後の点は必ず残し、残りの行をnum_points - 2個の区間に分ける
+    edges = np.linspace(1, num_rows - 1, num_points - 1).astype(np.int64)
+    sums = np.add.reduceat(values[1:num_rows - 1], edges[:-1] - 1, axis=0)
+    time_sums = np.add.reduceat(times[1:num_rows - 1], edges[:-1] - 1)
+    counts = np.diff(edges)[:, np.newaxis]
+    # 各区間の次の区間の平均点（最後の区間の次は最後の点）
+    next_values = np.vstack([sums[1:] / counts[1:], values[-1:]])
+    next_times = np.append(time_sums[1:] / counts[1:, 0], times[-1])
+
+    indices = np.empty((num_points, num_columns), dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = num_rows - 1
+    columns = np.arange(num_columns)
+    previous_time = np.full(num_columns, times[0])
+    previous_value = values[0].astype(np.float64)
+    for bucket in range(num_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bucket_times = times[start:end, np.newaxis]
+        bucket_values = values[start:end]
+        # 前に選んだ点、区間内の点、次の区間の平均点でできる三角形の面積（の2倍）
+        area = np.abs((previous_time - next_times[bucket]) * (bucket_values - previous_value)
+                      - (previous_time - bucket_times) * (next_values[bucket] - previous_value))
+        selected = np.nan_to_num(area, nan=-1.0).argmax(axis=0) + start
+        indices[bucket + 1] = selected
+        previous_time = times[selected]
+        previous_value = values[selected, columns]
+    return indices
+
+
+def _as_float_times(timestamps):
+    """
+    面積の計算用に、タイムスタンプをfloat64の配列に変換します。
+    datetime64/timedelta64は単位のまま整数値として扱います。
+    """
+    if timestamps.dtype.kind in 'mM':
+        return timestamps.view(np.int64).astype(np.float64)
+    return timestamps.astype(np.float64, copy=False)
@@ -0,0 +1,286 @@
+import ast
+import numpy as np
+
+# 派生列を計算する1ブロックの行数（ブロック内の一時配列がキャッシュに収まる大きさ）
+DERIVED_BLOCK_ROWS = 1 << 15
+
+# 要素ごとに計算する関数
+ELEMENTWISE_FUNCTIONS = {
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+    'exp': np.exp,
+    'log': np.log,
+    'log10': np.log10,
+    'sin': np.sin,
+    'cos': np.cos,
+}
+
+# 複数の列を行ごとにまとめる関数
+ROW_FUNCTIONS = ('sum', 'mean', 'rms', 'min', 'max')
+
+# 前の行を参照する関数
+WINDOW_FUNCTIONS = ('ma', 'diff')
+
+_BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+}
+
+
+def parse_expressions(expressions):
+    """
+    派生列の指定を、(列名, 式)のリストに変換します。
+
+    Args:
+        expressions (dict または list): {列名: 式}の辞書、または'列名=式'の文字列のリスト
+
+    Returns:
+        list: (name, expression)のリスト（指定した順番）
+
+    Raises:
+        ValueError: 指定の形式が正しくない場合、列名が重複している場合に発生します
+    """
+    if expressions is None:
+        return []
+    if isinstance(expressions, dict):
+        items = [(str(name), str(expression)) for name, expression in expressions.items()]
+    else:
+        if isinstance(expressions, str):
+            expressions = [expressions]
+        items = []
+        for item in expressions:
+            name, separator, expression = item.partition('=')
+            if not separator or not name.strip() or not expression.strip():
+                raise ValueError(f"派生列は'列名=式'の形式で指定してください。: {item}")
+            items.append((name.strip(), expression.strip()))
+
+    names = [name for name, _ in items]
+    if len(set(names)) != len(names):
+        raise ValueError(f"派生列の列名が重複しています。: {names}")
+    return items
+
+
+class DerivedColumns:
+    """
+    ヘッダー名で列を参照する複数の式から、派生列をまとめて計算します。
+    式は最初に構文木から関数に変換し、データをDERIVED_BLOCK_ROWS行ずつのブロックに分けて、
+    ブロックごとに全ての式を計算して出力先の配列に直接書き込みます。
+    ブロックの列がキャッシュに載っている間に全ての式を計算するため、式ごとに全行を読み直すより高速です。
+
+    式で使用できるもの:
+        列の参照: ヘッダー名（wave1など）、またはcol('wave 1')（名前に空白などを含む列）、col(0)（タイムデータを除くインデックス）
+            参照できるのは読み込んだデータの列のみで、合計列は参照できません。合計はsum(...)で計算してください。
+        演算子: +、-、*、/、**、数値
+        要素ごとの関数: abs、sqrt、exp、log、log10、sin、cos
+        行ごとの関数: sum(a, b, ...)、mean(...)、rms(...)、min(...)、max(...)
+        前の行を参照する関数: ma(x, n)（直前n行の移動平均、先頭のn-1行は存在する行のみの平均）、
+            diff(x)（前の行との差、先頭の行は0）
+
+    Attributes:
+        names (list): 派生列の列名
+        halo (int): 式の計算に必要な前の行数
+
+    Methods:
+        evaluate(data, out, start=0): dataのstart行目以降の派生列をoutに書き込みます。
+    """
+
+    def __init__(self, expressions, header):
+        """
+        Args:
+            expressions (dict または list): parse_expressionsと同じ形式の派生列の指定
+            header (list): dataの列のヘッダー名（タイムデータを除く）
+
+        Raises:
+            ValueError: 式の構文が正しくない場合、存在しない列や使用できない関数を指定した場合に発生します
+        """
+        self._header = list(header)
+        self.names = []
+        self._programs = []
+        self.halo = 0
+        for name, expression in parse_expressions(expressions):
+            try:
+                tree = ast.parse(expression, mode='eval')
+            except SyntaxError as e:
+                raise ValueError(f"派生列{name}の式が正しくありません。: {expression} ({e.msg})")
+            program, halo = self._compile(tree.body, name)
+            self.names.append(name)
+            self._programs.append(program)
+            self.halo = max(self.halo, halo)
+
+    def evaluate(self, data, out, start=0, block_rows=DERIVED_BLOCK_ROWS):
+        """
+        dataのstart行目以降の各行について派生列を計算し、outに書き込みます。
+        ma、diffの計算には、start行目より前のhalo行を使用します。
+
+        Args:
+            data (np.ndarray): 式が参照する列のデータ配列
+            out (np.ndarray): (data.shape[0] - start, 派生列の数)の出力先の配列（ビューでも可）
+            start (int): 計算する最初の行（前の行は参照のみに使用します）
+            block_rows (int): 1ブロックの行数
+
+        Returns:
+            np.ndarray: out
+        """
+        for block_start in range(start, data.shape[0], block_rows):
+            block_end = min(block_start + block_rows, data.shape[0])
+            # ブロックの前のhalo行も含めて計算し、ブロックの行の結果のみを書き込む
+            context_start = max(block_start - self.halo, 0)
+            block = data[context_start:block_end]
+            skip = block_start - context_start
+            for column, program in enumerate(self._programs):
+                result = program(block)
+                out[block_start - start:block_end - start, column] = result[skip:] if np.ndim(result) else result
+        return out
+
+    def _compile(self, node, name):
+        """
+        構文木のノードを、ブロックを受け取って結果の配列を返す関数に変換します。
+
+        Returns:
+            tuple: (program, halo) 関数と、計算に必要な前の行数
+        """
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            value = float(node.value)
+            return (lambda block: value), 0
+
+        if isinstance(node, ast.Name):
+            return self._column(node.id, name), 0
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand, halo = self._compile(node.operand, name)
+            if isinstance(node.op, ast.UAdd):
+                return operand, halo
+            return (lambda block: np.negative(operand(block))), halo
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            operator = _BINARY_OPERATORS[type(node.op)]
+            left, left_halo = self._compile(node.left, name)
+            right, right_halo = self._compile(node.right, name)
+            return (lambda block: operator(left(block), right(block))), max(left_halo, right_halo)
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            return self._compile_call(node.func.id, node.args, name)
+
+        raise ValueError(f"派生列{name}の式に使用できない要素が含まれています。: {ast.unparse(node)}")
+
+    def _compile_call(self, function, args, name):
+        """
+        関数呼び出しを、ブロックを受け取って結果の配列を返す関数に変換します。
+        """
+        if function == 'col':
+            if len(args) != 1 or not isinstance(args[0], ast.Constant):
+                raise ValueError(f"派生列{name}: colには列名または列のインデックスを1つ指定してください。")
+            return self._column(args[0].value, name), 0
+
+        if function in ELEMENTWISE_FUNCTIONS:
+            if len(args) != 1:
+                raise ValueError(f"派生列{name}: {function}には引数を1つ指定してください。")
+            ufunc = ELEMENTWISE_FUNCTIONS[function]
+            operand, halo = self._compile(args[0], name)
+            return (lambda block: ufunc(operand(block))), halo
+
+        if function in ROW_FUNCTIONS:
+            if not args:
+                raise ValueError(f"派生列{name}: {function}には引数を1つ以上指定してください。")
+            compiled = [self._compile(arg, name) for arg in args]
+            operands = [program for program, _ in compiled]
+            halo = max(halo for _, halo in compiled)
+            return _row_function(function, operands), halo
+
+        if function == 'ma':
+            if len(args) != 2 or not isinstance(args[1], ast.Constant) or not isinstance(args[1].value, int) \
+                    or args[1].value < 1:
+                raise ValueError(f"派生列{name}: maには列と1以上の整数の行数を指定してください。 例: ma(wave1, 10)")
+            operand, halo = self._compile(args[0], name)
+            window = args[1].value
+            return (lambda block: _moving_average(operand(block), window, len(block))), halo + window - 1
+
+        if function == 'diff':
+            if len(args) != 1:
+                raise ValueError(f"派生列{name}: diffには引数を1つ指定してください。")
+            operand, halo = self._compile(args[0], name)
+            return (lambda block: _difference(operand(block), len(block))), halo + 1
+
+        raise ValueError(f"派生列{name}: {function}は使用できない関数です。")
+
+    def _column(self, column, name):
+        """
+        ヘッダー名またはインデックスで指定した列を、ブロックから取り出す関数を返します。
+        """
+        if isinstance(column, str):
+            if column not in self._header:
+                raise ValueError(f"派生列{name}: ヘッダーに{column}が存在しません。")
+            index = self._header.index(column)
+        elif isinstance(column, int) and 0 <= column < len(self._header):
+            index = column
+        else:
+            raise ValueError(f"派生列{name}: 列のインデックスが範囲外です。: {column}")
+        return lambda block: block[:, index]
+
+
+def _row_function(function, operands):
+    """
+    複数の列を行ごとにまとめる関数を返します。引数ごとの結果を順番に加算し、列を結合した配列は作成しません。
+    """
+    if function in ('min', 'max'):
+        ufunc = np.minimum if function == 'min' else np.maximum
+
+        def _evaluate(block):
+            result = operands[0](block)
+            for operand in operands[1:]:
+                result = ufunc(result, operand(block))
+            return result
+        return _evaluate
+
+    def _evaluate(block):
+        total = np.zeros(len(block), dtype=np.float64)
+        for operand in operands:
+            value = operand(block)
+            total += value * value if function == 'rms' else value
+        if function == 'sum':
+            return total
+        total /= len(operands)
+        return np.sqrt(total, out=total) if function == 'rms' else total
+    return _evaluate
+
+
+def _moving_average(values, window, num_rows):
+    """
+    直前window行の移動平均を累積和から計算します。先頭のwindow - 1行は存在する行のみで平均します。
+    累積和はNaNやinfを0にした値で計算し、NaN、inf、-infの行数はウィンドウごとに数えます。
+    NaNやinfを含むウィンドウのみを、その値を合計した場合と同じNaN、inf、-infにするため、
+    1つのNaNやinfがブロックの後ろの全ての行に影響することはなく、結果はブロックの大きさによりません。
+    """
+    values = np.broadcast_to(values, num_rows)
+    finite = np.isfinite(values)
+    rows = np.arange(1, num_rows + 1)
+    lower = np.maximum(rows - window, 0)
+
+    def _window_sum(array):
+        cumulative = np.concatenate([[0], np.cumsum(array, dtype=np.float64)])
+        return cumulative[rows] - cumulative[lower]
+
+    result = _window_sum(np.where(finite, values, 0.0)) / (rows - lower)
+    if finite.all():
+        return result
+    nan = _window_sum(np.isnan(values)) > 0
+    positive = _window_sum(values == np.inf) > 0
+    negative = _window_sum(values == -np.inf) > 0
+    result[positive] = np.inf
+    result[negative] = -np.inf
+    result[nan | (positive & negative)] = np.nan
+    return result
+
+
+def _difference(values, num_rows):
+    """
+    前の行との差を計算します。先頭の行は0にします。
+    """
+    values = np.broadcast_to(values, num_rows)
+    result = np.empty(num_rows, dtype=np.float64)
+    result[:1] = 0.0
+    np.subtract(values[1:], values[:-1], out=result[1:])
+    return result
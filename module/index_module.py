@@ -0,0 +1,196 @@
+import hashlib
+import os
+import numpy as np
+from .csv_module import validate_csv_path, is_compressed_path, CSVFileReadError, FAST_BLOCK_BYTES
+from .cache_module import DEFAULT_CACHE_DIR
+
+# インデックスファイルを保存するディレクトリと、インデックスに記録する行の間隔のデフォルト値
+DEFAULT_INDEX_DIR = os.path.join(DEFAULT_CACHE_DIR, 'index')
+DEFAULT_INDEX_ROWS = 10000
+
+
+class CSVRowIndex:
+    """
+    CSVファイルのindex_rows行ごとに、行の先頭のバイト位置とタイムスタンプを記録した疎なインデックスです。
+    タイムスタンプが昇順のCSVファイルで、指定した時間範囲の行を含むバイト範囲を二分探索で求めます。
+
+    Attributes:
+        csv_path (str): CSVファイルのパス
+        index_rows (int): インデックスに記録する行の間隔
+        offsets (np.ndarray): 記録した行の先頭のバイト位置
+        timestamps (np.ndarray): 記録した行のタイムスタンプ（CSVファイルの値そのまま）
+        data_end (int): 最後の行の終わりのバイト位置（作成時のファイルサイズ）
+        mtime_ns (int): 作成時のCSVファイルの更新時刻
+
+    Methods:
+        build(csv_path, delimiter=',', index_rows=10000): CSVファイルを1回読み込んでインデックスを作成します。
+        locate(t_start, t_end): 時間範囲の行を含むバイト範囲を返します。
+        save(path) / load(path, csv_path): インデックスをファイルに保存・読み込みします。
+    """
+
+    def __init__(self, csv_path, index_rows, offsets, timestamps, data_end, mtime_ns):
+        self.csv_path = csv_path
+        self.index_rows = index_rows
+        self.offsets = offsets
+        self.timestamps = timestamps
+        self.data_end = data_end
+        self.mtime_ns = mtime_ns
+
+    @classmethod
+    def build(cls, csv_path, delimiter=',', index_rows=DEFAULT_INDEX_ROWS):
+        """
+        CSVファイルをブロックごとに読み込み、改行の位置からindex_rows行ごとの行の先頭のバイト位置を求めます。
+        タイムスタンプは記録する行の1列目のみを変換するため、ファイル全体を数値に変換するより高速です。
+
+        Raises:
+            CSVFileReadError: CSVファイルの読み込みに失敗した場合に発生します
+        """
+        csv_path = validate_csv_path(csv_path)
+        if is_compressed_path(csv_path):
+            raise ValueError(f"圧縮されたファイルはバイト位置で読み込めないため、インデックスを作成できません。: {csv_path}")
+        if index_rows < 1:
+            raise ValueError("index_rowsは1以上を指定してください。")
+        separator = delimiter.encode('utf-8')
+        # 作成中に追記された行はインデックスに含めず、作成前のファイルサイズまでを対象にする
+        stat = os.stat(csv_path)
+
+        offsets = []
+        timestamps = []
+        row = 0
+        # 記録する行のタイムスタンプを変換できない場合に、次の行を記録するために前のブロックから探し続けているか
+        pending = False
+        try:
+            with open(csv_path, 'rb', buffering=0) as f:
+                position = len(f.readline())
+                remainder = b''
+                while True:
+                    chunk = f.read(min(FAST_BLOCK_BYTES, stat.st_size - position - len(remainder)))
+                    block = remainder + chunk
+                    if not chunk:
+                        # 改行で終わらない最後の行も1行として扱う
+                        if not block:
+                            break
+                        block += b'\n'
+                    end = block.rfind(b'\n') + 1
+                    block, remainder = block[:end], block[end:]
+
+                    raw = np.frombuffer(block, dtype=np.uint8)
+                    line_ends = np.flatnonzero(raw == ord('\n'))
+                    line_starts = np.concatenate([[0], line_ends[:-1] + 1])
+                    # 空行はローダーと同様に行として数えない
+                    lengths = line_ends - line_starts
+                    blank = (lengths == 0) | ((lengths == 1) & (raw[line_starts] == ord('\r')))
+                    line_starts = line_starts[~blank]
+
+                    selected = np.flatnonzero((row + np.arange(len(line_starts))) % index_rows == 0).tolist()
+                    if pending:
+                        selected.insert(0, 0)
+                    # タイムスタンプを変換できない行（空、数値以外、コメントなど）はローダーと同様に読み飛ばし、
+                    # 変換できる次の行を記録する
+                    searched = 0
+                    for i in selected:
+                        if i < searched:
+                            continue
+                        pending = True
+                        for searched in range(i, len(line_starts)):
+                            timestamp = _parse_timestamp(block, int(line_starts[searched]), separator)
+                            if timestamp is not None:
+                                timestamps.append(timestamp)
+                                offsets.append(position + int(line_starts[searched]))
+                                pending = False
+                                break
+                        searched += 1
+                    row += len(line_starts)
+                    position += len(block)
+                    if not chunk:
+                        break
+        except Exception as e:
+            raise CSVFileReadError(csv_path, e)
+
+        return cls(csv_path, index_rows, np.array(offsets, dtype=np.int64),
+                   np.array(timestamps, dtype=np.float64), stat.st_size, stat.st_mtime_ns)
+
+    def locate(self, t_start, t_end):
+        """
+        タイムスタンプがt_start以上t_end以下の行を全て含むバイト範囲を返します。
+        範囲はインデックスに記録した行の位置で区切るため、前後にindex_rows行程度の余分な行を含みます。
+
+        Returns:
+            tuple: (start, end) 読み込む範囲のバイト位置
+        """
+        # t_startと同じタイムスタンプの行が記録した行の前にも続いている場合があるため、
+        # t_startより前の最後の記録した行から読み込む
+        first = max(int(np.searchsorted(self.timestamps, t_start, side='left')) - 1, 0)
+        last = int(np.searchsorted(self.timestamps, t_end, side='right'))
+        start = int(self.offsets[first]) if len(self.offsets) else self.data_end
+        end = int(self.offsets[last]) if last < len(self.offsets) else self.data_end
+        return start, end
+
+    def save(self, path):
+        """
+        インデックスと、作成時のCSVファイルのサイズ・更新時刻を.npzファイルに保存します。
+        """
+        # 途中で中断されても壊れたインデックスが残らないよう、一時ファイルに書き込んでから置き換える
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, offsets=self.offsets, timestamps=self.timestamps,
+                     state=np.array([self.index_rows, self.data_end, self.mtime_ns], dtype=np.int64))
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path, csv_path):
+        """
+        保存したインデックスを読み込みます。CSVファイルのサイズ・更新時刻が保存時と異なる場合はNoneを返します。
+        """
+        with np.load(path) as saved:
+            index_rows, data_end, mtime_ns = saved['state'].tolist()
+            stat = os.stat(csv_path)
+            if (data_end, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                return None
+            return cls(csv_path, index_rows, saved['offsets'], saved['timestamps'], data_end, mtime_ns)
+
+
+def _parse_timestamp(block, start, separator):
+    """
+    blockのstartから始まる行の1列目をタイムスタンプに変換します。変換できない場合はNoneを返します。
+    """
+    line_end = block.find(b'\n', start)
+    field_end = block.find(separator, start, line_end)
+    try:
+        timestamp = float(block[start:field_end if field_end >= 0 else line_end])
+    except ValueError:
+        return None
+    # NaNは二分探索で比較できないため、変換できない行と同様に扱う
+    return None if np.isnan(timestamp) else timestamp
+
+
+def load_row_index(csv_path, delimiter=',', index_rows=DEFAULT_INDEX_ROWS, index_dir=None):
+    """
+    CSVファイルの疎なインデックスを返します。保存済みの有効なインデックスがあれば読み込み、
+    なければ作成してindex_dirに保存します。CSVファイルが変更された場合は作成し直します。
+
+    Args:
+        delimiter (str): CSVファイルの区切り文字（デフォルト: ','）
+        index_rows (int): インデックスに記録する行の間隔（デフォルト: 10000）
+        index_dir (str): インデックスファイルを保存するディレクトリ（デフォルト: None、~/.cache/time_data_plotter/index）
+
+    Returns:
+        CSVRowIndex: CSVファイルのインデックス
+    """
+    csv_path = validate_csv_path(csv_path)
+    index_dir = index_dir or DEFAULT_INDEX_DIR
+    os.makedirs(index_dir, exist_ok=True)
+    key = hashlib.sha1(f"{os.path.abspath(csv_path)}|{delimiter}|{index_rows}".encode('utf-8')).hexdigest()[:16]
+    index_path = os.path.join(index_dir, key + '_index.npz')
+
+    if os.path.exists(index_path):
+        try:
+            index = CSVRowIndex.load(index_path, csv_path)
+            if index is not None:
+                return index
+        # 壊れたインデックスは作成し直す
+        except (OSError, ValueError, KeyError):
+            pass
+
+    index = CSVRowIndex.build(csv_path, delimiter=delimiter, index_rows=index_rows)
+    index.save(index_path)
+    return index
@@ -0,0 +1,112 @@
+import queue
+import threading
+import time
+
+# 段の間のキューに保持するチャンク数のデフォルト値
+DEFAULT_QUEUE_SIZE = 4
+
+# キューの終わりを表す値
+_END = object()
+
+
+def run_pipeline(source, compute, write, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    読み込み、計算、書き込みの3段を、サイズの上限があるキューでつないで並行に実行します。
+    sourceの反復（ファイルの読み込みと解析）は読み込みスレッドで、writeは書き込みスレッドで、
+    computeは呼び出したスレッドで実行します。キューの上限により、メモリ使用量はqueue_sizeチャンク程度に収まります。
+    numpyの処理やファイルの読み書きの間はGILが解放されるため、全体の時間は各段の時間の合計より短くなります。
+
+    Args:
+        source (iterable): チャンクを順に返すイテラブル
+        compute (callable): チャンクを受け取り、書き込む値を返す関数。Noneを返した場合は書き込みません
+        write (callable): computeの結果を受け取り、書き込む関数
+        queue_size (int): 段の間のキューに保持するチャンク数（デフォルト: 4）
+
+    Returns:
+        dict: read、compute、writeの各段の処理時間と、全体の経過時間total（秒）
+
+    Raises:
+        Exception: いずれかの段で発生した例外をそのまま発生させます
+    """
+    read_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    timings = {'read': 0.0, 'compute': 0.0, 'write': 0.0}
+
+    def _put(target, item):
+        # 他の段でエラーが発生した場合に、満杯のキューで待ち続けないようにする
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader():
+        try:
+            iterator = iter(source)
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    timings['read'] += time.perf_counter() - start
+                if not _put(read_queue, chunk):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        _put(read_queue, _END)
+
+    def _writer():
+        while True:
+            item = write_queue.get()
+            if item is _END:
+                return
+            # エラーの後は書き込まずにキューを空にし、計算の段が止まらないようにする
+            if stop.is_set():
+                continue
+            start = time.perf_counter()
+            try:
+                write(item)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            timings['write'] += time.perf_counter() - start
+
+    started = time.perf_counter()
+    reader = threading.Thread(target=_reader, name='pipeline-reader', daemon=True)
+    writer = threading.Thread(target=_writer, name='pipeline-writer', daemon=True)
+    reader.start()
+    writer.start()
+    try:
+        while not stop.is_set():
+            try:
+                chunk = read_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if chunk is _END:
+                break
+            start = time.perf_counter()
+            result = compute(chunk)
+            timings['compute'] += time.perf_counter() - start
+            if result is not None:
+                _put(write_queue, result)
+    except BaseException as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        # 書き込みスレッドはキューの終わりまで処理してから終了する
+        write_queue.put(_END)
+        writer.join()
+        stop.set()
+        reader.join()
+
+    if errors:
+        raise errors[0]
+    timings['total'] = time.perf_counter() - started
+    return timings
@@ -1,5 +1,22 @@
-import matplotlib.pyplot as plt
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+import matplotlib
+# matplotlib.pyplotはバックエンドの初期化に時間がかかるため、画面に表示する場合のみ各メソッドでimportする
 import matplotlib.gridspec as gridspec
+from .decimation_module import decimate, minmax_pyramid, extend_minmax_pyramid, select_pyramid_level
+from .shared_module import attach_shared_arrays
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# layout='auto'で、1つのAxesに重ねて描画するレイアウトに切り替える列数
+STACKED_MIN_COLUMNS = 32
+# 選択できるレイアウト
+PLOT_LAYOUTS = ('auto', 'subplots', 'stacked')
+# PlotWorkerで保存を待つ共有メモリの最大数。これを超えるとsubmitは古いものの保存が終わるまで待つ
+DEFAULT_MAX_PENDING_PLOTS = 2
 
 class Plotter:
     """
@@ -28,31 +45,62 @@ class Plotter:
             * 入力がリストの場合はリストの長さはx_dataの列数と一致する必要があります。
         title (str): プロットのタイトル
         xlabel (str): X軸のラベル
+        decimation (str or None): 描画前の間引き方法。'minmax'、'lttb'またはNone（間引かない）
+            行数が多い場合は、各列をFigureの横幅のピクセル数程度の点に減らしてから描画します。
+        max_points (int or None): 間引き後の1列あたりの点数 デフォルト: None（Figureの横幅のピクセル数の2倍）
+        layout (str): 'subplots'（列ごとのサブプロット）、'stacked'（1つのAxesに列をずらして重ねる）または
+            'auto'（列数がSTACKED_MIN_COLUMNS以上の場合にstacked）
+            stackedでは全ての列を1つのLineCollectionとして描画するため、列数が多くてもFigureの作成と保存が速くなります。
+        headless (bool): Trueの場合、pyplotを使わずにAggのFigureを直接作成します。
+            画面への表示はできませんが、ディスプレイのないサーバーや複数プロセスでも画像を保存できます。
+        pyramid (list or None): decimationが'minmax'の場合に作成する、拡大・縮小表示用の最小値・最大値のピラミッド
+            x軸の表示範囲が変わると、表示範囲の行数に合った段に線のデータを差し替えるため、
+            再描画の時間は全体の行数によらずほぼ一定です。タイムスタンプは昇順である必要があります。
         
     Methods:
-        set_plot(x_data, y_data, labels=None, title='Plot', xlabel='Time'):
+        set_plot(x_data, y_data, labels=None, title='Plot', xlabel='Time', decimation='minmax', max_points=None,
+                 layout='auto'):
             指定したデータとラベルでプロットを設定する
         draw_plot():
             プロットを表示する
         save_plot(name, fmt='.png'):
             指定した名前と形式でプロットをファイルに保存する
+        update_plot(x_data, y_data):
+            行が追記されたデータで、Figureを作り直さずに線のデータを更新する
+        tail_plot(update_func, interval=1.0):
+            プロットを表示したまま、一定間隔で追記されたデータを取得して線を更新する
+
+    モジュール関数のrender_pagesで、列をページに分けた画像をプロセスプールで並列に保存できます。
+    PlotWorkerで、共有メモリに配置したデータの画像を別のプロセスで保存できます。
     """
-    def __init__(self, x_data=None, y_data=None, labels=None, title='Plot', xlabel='Time'):
+    def __init__(self, x_data=None, y_data=None, labels=None, title='Plot', xlabel='Time',
+                 decimation='minmax', max_points=None, layout='auto', headless=False):
         
         self.axes = None
         self.fig = None
+        self.headless = headless
 
         self.x_data = x_data
         self.y_data = y_data
         self.labels = labels
         self.title = title
         self.xlabel = xlabel
+        self.decimation = decimation
+        self.max_points = max_points
+        self.layout = layout
+        self.pyramid = None
+        self._search_times = None
+        self._refreshed_xlim = None
+        self._trace_collection = None
+        self._trace_offsets = None
+        self._trace_scales = None
         
         if x_data is not None and y_data is not None:
-            self.set_plot(x_data,y_data,labels,title,xlabel)
+            self.set_plot(x_data,y_data,labels,title,xlabel,decimation,max_points,layout)
         
 
-    def set_plot(self, x_data, y_data, labels=None, title='Plot', xlabel='Time'):
+    def set_plot(self, x_data, y_data, labels=None, title='Plot', xlabel='Time', decimation='minmax', max_points=None,
+                 layout='auto'):
         """
         指定したデータとラベルでプロットを設定します。
         Args:
@@ -61,10 +109,17 @@ class Plotter:
             labels (list): 各プロットのラベルリスト。
             title (str): プロットのタイトル。
             xlabel (str): x軸のラベル。
+            decimation (str): 描画前の間引き方法。'minmax'、'lttb'またはNone（間引かない）。デフォルトは'minmax'。
+                'minmax'はピクセル列ごとの最小値と最大値を残すため、ピークが消えません。
+            max_points (int): 間引き後の1列あたりの点数。デフォルトはNone（Figureの横幅のピクセル数の2倍）。
+            layout (str): 'subplots'、'stacked'または'auto'。デフォルトは'auto'。
+                'stacked'では各列を最小値・最大値で正規化し、1つのAxesに上から順にずらして描画します。
+                ラベルは凡例の代わりにy軸の目盛りに表示します。
         
         Raises:
             ValueError: x_dataは2次元配列、y_dataは1次元配列である必要があります。
             ValueError: x_dataの行数とy_dataの長さが一致していません。
+            ValueError: layoutが'auto'、'subplots'または'stacked'ではありません。
         """
         def _plot_single_subplot(gs, idx, fig, x_data, y_data, label, color, sharex=None):
             """
@@ -92,20 +147,48 @@ class Plotter:
             raise ValueError("x_data must be a 2D array and y_data must be a 1D array.")
         if x_data.shape[0] != y_data.shape[0]:
             raise ValueError("The number of rows in x_data must match the length of y_data.")
+        if layout not in PLOT_LAYOUTS:
+            raise ValueError(f"layout must be one of {PLOT_LAYOUTS}.")
+        # timedelta64のタイムスタンプは秒に変換してプロットする（datetime64はmatplotlibがそのまま扱える）
+        if y_data.dtype.kind == 'm':
+            y_data = y_data / np.timedelta64(1, 's')
         
         # 既存のプロットがあれば閉じる
         if self.fig is not None:
             self.close_plot()
 
         cols = x_data.shape[1]
-        fig = plt.figure(figsize=(10, cols))
+        if layout == 'auto':
+            layout = 'stacked' if cols >= STACKED_MIN_COLUMNS else 'subplots'
+        # stackedでは1列あたりの高さを小さくし、Figureの高さに上限を設ける
+        fig_height = cols if layout == 'subplots' else min(2 + 0.15 * cols, 30)
+        if self.headless:
+            # pyplotの状態に登録せず、Aggのキャンバスに直接描画する
+            fig = Figure(figsize=(10, fig_height))
+            FigureCanvasAgg(fig)
+        else:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=(10, fig_height))
+            fig.canvas.manager.set_window_title(title)
         fig.suptitle(title)
-        fig.canvas.manager.set_window_title(title)
         fig.supxlabel(xlabel)
-        gs = gridspec.GridSpec(cols, 1, height_ratios=[0.8] * cols, hspace=0)
+
+        # 1ピクセルに複数の点を描画しても見た目は変わらないため、全ての列をまとめて間引いてから描画する
+        plot_x_data, plot_y_data = x_data, y_data
+        pyramid = None
+        if decimation is not None:
+            if max_points is None:
+                max_points = 2 * int(fig.get_figwidth() * fig.dpi)
+            # minmaxの場合はピラミッドを1度だけ作成し、全体の表示にも拡大・縮小時の表示にも使う
+            if decimation == 'minmax' and len(y_data) > max_points:
+                pyramid = minmax_pyramid(x_data, max_points)
+                indices = select_pyramid_level(pyramid, 0, len(y_data), max_points)
+                plot_y_data, plot_x_data = y_data[indices], x_data[indices, np.arange(cols)]
+            else:
+                plot_y_data, plot_x_data = decimate(y_data, x_data, max_points, decimation)
 
         axes = []
-        color_map = plt.get_cmap('tab10')
+        color_map = matplotlib.colormaps['tab10']
         color_list = [color_map(i % color_map.N) for i in range(cols)]
 
         if labels is None:
@@ -121,13 +204,20 @@ class Plotter:
             if len(labels) != cols:
                 raise ValueError("The length of labels must match the number of columns in x_data. Use a dictionary to specify labels for specific columns.")
 
-        for i in range(cols):
-            sharex = axes[0] if i > 0 else None
-            label = labels[i]
-            color = color_list[i]
+        self._trace_collection = None
+        if layout == 'stacked':
+            axes.append(self._plot_stacked(fig, x_data, y_data, plot_x_data, plot_y_data, labels, color_list))
+        else:
+            gs = gridspec.GridSpec(cols, 1, height_ratios=[0.8] * cols, hspace=0)
+            for i in range(cols):
+                sharex = axes[0] if i > 0 else None
+                label = labels[i]
+                color = color_list[i]
 
-            ax = _plot_single_subplot(gs, i, fig, y_data, x_data[:, i], label, color, sharex)
-            axes.append(ax)
+                # 間引いた場合はタイムスタンプが列ごとに異なる
+                timestamps = plot_y_data[:, i] if plot_y_data.ndim == 2 else plot_y_data
+                ax = _plot_single_subplot(gs, i, fig, timestamps, plot_x_data[:, i], label, color, sharex)
+                axes.append(ax)
         
         self.fig  = fig
         self.axes = axes
@@ -137,10 +227,159 @@ class Plotter:
         self.labels = labels
         self.title = title
         self.xlabel = xlabel
+        self.decimation = decimation
+        self.max_points = max_points
+        self.layout = layout
+        self.pyramid = pyramid
+
+        if pyramid is not None:
+            self._connect_pyramid()
 
         return fig, axes
+
+    def update_plot(self, x_data, y_data):
+        """
+        行が追記されたデータで、Figureを作り直さずに線のデータを更新します。
+        x_data、y_dataは追記後の全てのデータで、先頭の行はset_plotで設定したデータと同じである必要があります。
+        ピラミッドは追記された行に影響する区間のみを計算し直します。
+        x軸の表示範囲が最後の行を含んでいた場合は、追記された行も表示されるよう表示範囲を広げます。
+
+        Raises:
+            ValueError: プロットが設定されていない場合、または列数が一致しない場合に発生します。
+        """
+        self.__data_check()
+        if x_data.ndim != 2 or x_data.shape[1] != self.x_data.shape[1] or x_data.shape[0] != y_data.shape[0]:
+            raise ValueError("x_data must have the same number of columns as the current plot and match y_data.")
+        if y_data.dtype.kind == 'm':
+            y_data = y_data / np.timedelta64(1, 's')
+
+        num_old = len(self.y_data)
+        old_last = _as_plot_times(self.y_data[-1:])[0]
+        new_last = _as_plot_times(y_data[-1:])[0]
+        x_min, x_max = self.axes[0].get_xlim()
+        self.x_data = x_data
+        self.y_data = y_data
+
+        if self.pyramid is not None:
+            self.pyramid = extend_minmax_pyramid(self.pyramid, x_data, num_old, self.max_points)
+        elif self.decimation == 'minmax' and len(y_data) > self.max_points:
+            self.pyramid = minmax_pyramid(x_data, self.max_points)
+            self._connect_pyramid()
+        if self.pyramid is not None:
+            self._search_times = _as_plot_times(y_data)
+            # データが変わったため、表示範囲が同じでも線を更新する
+            self._refreshed_xlim = None
+
+        if x_max >= old_last:
+            x_max += new_last - old_last
+        # ピラミッドの場合は、表示範囲を設定するとxlim_changedのコールバックで線が更新される
+        if self.pyramid is None:
+            self._refresh_lines(x_min, x_max)
+        self.axes[0].set_xlim(x_min, x_max)
+        if self._trace_collection is None:
+            for ax in self.axes:
+                ax.relim()
+                ax.autoscale_view(scalex=False)
+        self.fig.canvas.draw_idle()
+
+    def _connect_pyramid(self):
+        """
+        共有しているx軸の表示範囲が変わったら、表示範囲に合った段に線のデータを差し替えるよう設定します。
+        """
+        # datetime64のx軸の範囲はmatplotlibの日付の数値で渡されるため、同じ単位で検索する
+        self._search_times = _as_plot_times(self.y_data)
+        self._refreshed_xlim = None
+        # x軸を共有するAxesは全てxlim_changedを発生させるため、全てに接続すると1回の変更で列数回更新してしまう。
+        # どのAxesの範囲を変えても共有しているaxes[0]で発生するため、axes[0]にのみ接続する
+        self.axes[0].callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def _on_xlim_changed(self, ax):
+        """
+        x軸の表示範囲が変わった場合に、全ての線のデータを表示範囲に合わせて更新します。
+        共有しているAxesへの反映で同じ範囲の通知が繰り返される場合は、最初の1回のみ更新します。
+        """
+        xlim = ax.get_xlim()
+        if xlim == self._refreshed_xlim:
+            return
+        self._refreshed_xlim = xlim
+        self._refresh_lines(*xlim)
+
+    def _refresh_lines(self, x_min, x_max):
+        """
+        x軸の表示範囲の行をsearchsortedで求め、表示範囲の行数に合ったピラミッドの段を全ての線に設定します。
+        ピラミッドがない場合は、全ての行を（decimationを指定した場合は間引いてから）設定します。
+        """
+        if self.pyramid is None:
+            plot_y_data, plot_x_data = self.y_data, self.x_data
+            if self.decimation is not None:
+                plot_y_data, plot_x_data = decimate(self.y_data, self.x_data, self.max_points, self.decimation)
+            if self._trace_collection is not None:
+                self._set_stacked_segments(plot_y_data, plot_x_data)
+                return
+            for i, axis in enumerate(self.axes):
+                timestamps = plot_y_data[:, i] if plot_y_data.ndim == 2 else plot_y_data
+                axis.lines[0].set_data(timestamps, plot_x_data[:, i])
+            return
+
+        num_rows = len(self._search_times)
+        start = max(int(np.searchsorted(self._search_times, x_min, side='left')) - 1, 0)
+        end = min(int(np.searchsorted(self._search_times, x_max, side='right')) + 1, num_rows)
+
+        indices = select_pyramid_level(self.pyramid, start, end, self.max_points)
+        if self._trace_collection is not None:
+            if indices is None:
+                self._set_stacked_segments(self.y_data[start:end], self.x_data[start:end])
+            else:
+                self._set_stacked_segments(self.y_data[indices], self.x_data[indices, np.arange(indices.shape[1])])
+            return
+        for i, axis in enumerate(self.axes):
+            line = axis.lines[0]
+            if indices is None:
+                line.set_data(self.y_data[start:end], self.x_data[start:end, i])
+            else:
+                line.set_data(self.y_data[indices[:, i]], self.x_data[indices[:, i], i])
     
 
+    def _plot_stacked(self, fig, x_data, y_data, plot_x_data, plot_y_data, labels, color_list):
+        """
+        全ての列を1つのAxesに、1列目が一番上になるよう1ずつずらして1つのLineCollectionとして描画します。
+        各列は全体の最小値・最大値で正規化するため、振幅の異なる列も同じ高さで表示されます。
+        """
+        cols = x_data.shape[1]
+        ax = fig.add_subplot(1, 1, 1)
+
+        # 正規化の係数は間引く前のデータから求め、拡大・縮小で線のデータを差し替えても変わらないようにする
+        lower = np.nanmin(x_data, axis=0).astype(np.float64)
+        upper = np.nanmax(x_data, axis=0).astype(np.float64)
+        span = np.where(upper > lower, upper - lower, 1.0)
+        self._trace_offsets = (cols - 1 - np.arange(cols)) - 0.4 - lower * 0.8 / span
+        self._trace_scales = 0.8 / span
+
+        self._trace_collection = LineCollection([], colors=color_list, linewidths=0.8)
+        ax.add_collection(self._trace_collection)
+        self._set_stacked_segments(plot_y_data, plot_x_data)
+
+        if y_data.dtype.kind == 'M':
+            ax.xaxis_date()
+        times = _as_plot_times(y_data[[0, -1]])
+        ax.set_xlim(times[0], times[-1])
+        ax.set_ylim(-0.6, cols - 0.4)
+        ax.set_yticks(np.arange(cols)[::-1], labels)
+        ax.tick_params(axis='x', direction='in', length=4, width=1, top=True)
+        ax.tick_params(axis='y', direction='in', labelsize=max(3, min(8, 400 // cols)))
+        return ax
+
+    def _set_stacked_segments(self, timestamps, values):
+        """
+        正規化してずらした各列のデータを、LineCollectionの線として設定します。
+        timestampsは全ての列で共通の1次元配列か、列ごとに異なる2次元配列です。
+        """
+        timestamps = _as_plot_times(timestamps)
+        if timestamps.ndim == 1:
+            timestamps = np.broadcast_to(timestamps[:, np.newaxis], values.shape)
+        traces = values * self._trace_scales + self._trace_offsets
+        self._trace_collection.set_segments(np.stack([timestamps.T, traces.T], axis=-1))
+
     def __data_check(self):
         """
         データがロードされているかを確認し、ロードされていない場合は例外を発生させます。
@@ -152,11 +391,38 @@ class Plotter:
         
     def draw_plot(self):
         """
-        プロットを表示します。
+        プロットを表示します。headlessモードでは表示しません。
         """
         self.__data_check()
+        if self.headless:
+            print("headlessモードではプロットを表示しません。save_plotで保存してください。")
+            return
+        import matplotlib.pyplot as plt
         plt.show()
 
+    def tail_plot(self, update_func, interval=1.0):
+        """
+        プロットを表示したまま、interval秒ごとにupdate_funcを呼び出し、新しいデータがあれば線を更新します。
+        ウィンドウを閉じると終了します。
+
+        Args:
+            update_func (callable): 追記がない場合はNone、追記があった場合は追記後の全データ(x_data, y_data)を返す関数
+            interval (float): update_funcを呼び出す間隔（秒）
+
+        Raises:
+            ValueError: headlessモードの場合に発生します。
+        """
+        self.__data_check()
+        if self.headless:
+            raise ValueError("tail_plot cannot be used in headless mode.")
+        import matplotlib.pyplot as plt
+        plt.show(block=False)
+        while plt.fignum_exists(self.fig.number):
+            data = update_func()
+            if data is not None:
+                self.update_plot(*data)
+            plt.pause(interval)
+
     def save_plot(self, name, fmt='.png'):
         """
         指定した名前と形式でプロットをファイルに保存します。
@@ -174,4 +440,159 @@ class Plotter:
         プロットを閉じます。
         """
         self.__data_check()
-        plt.close(self.fig)
\ No newline at end of file
+        # headlessのFigureはpyplotに登録されていないため、参照を外すだけでよい
+        if not self.headless:
+            import matplotlib.pyplot as plt
+            plt.close(self.fig)
+
+
+def render_pages(x_data, y_data, name, labels=None, columns_per_page=None, workers=None, fmt='.png', **plot_options):
+    """
+    列をcolumns_per_page列ずつのページに分け、ページごとの画像をプロセスプールで並列に保存します。
+    各ページはheadlessのPlotterで作成するため、pyplotの状態を使わず、画像の見た目はsave_plotと同じです。
+
+    Args:
+        x_data (np.ndarray): 各列が異なるデータ系列を表す2次元配列
+        y_data (np.ndarray): タイムスタンプの1次元配列
+        name (str): 保存するファイル名。複数ページの場合は末尾に_1、_2、...を付けます。
+        labels (list): 各列のラベルのリスト（デフォルト: None、wave1, wave2, ...）
+        columns_per_page (int): 1ページあたりの列数（デフォルト: None、全ての列を1ページ）
+        workers (int): プロセス数（デフォルト: None、CPUコア数）。1の場合はプロセスを起動しません。
+        fmt (str): ファイルの形式（デフォルト: '.png'）
+        **plot_options: set_plotのtitle、xlabel、decimation、max_points、layout
+
+    Returns:
+        list: 保存したファイルのパスのリスト
+    """
+    cols = x_data.shape[1]
+    if labels is None:
+        labels = [f"wave{i+1}" for i in range(cols)]
+    columns_per_page = columns_per_page or cols
+    if not fmt.startswith('.'):
+        fmt = '.' + fmt
+
+    pages = []
+    for page, start in enumerate(range(0, cols, columns_per_page)):
+        page_name = name if columns_per_page >= cols else f"{name}_{page + 1}"
+        end = start + columns_per_page
+        pages.append((x_data[:, start:end], y_data, labels[start:end], page_name, fmt, plot_options))
+
+    workers = min(workers or os.cpu_count() or 1, len(pages))
+    if workers == 1:
+        return [_render_page(*page) for page in pages]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_render_page, *page) for page in pages]
+        return [future.result() for future in futures]
+
+
+def _render_page(x_data, y_data, labels, name, fmt, plot_options):
+    """
+    1ページ分の画像をheadlessのPlotterで作成して保存し、保存したパスを返します。
+    """
+    plotter = Plotter(headless=True)
+    plotter.set_plot(x_data, y_data, labels=labels, **plot_options)
+    plotter.save_plot(name, fmt)
+    plotter.close_plot()
+    return name + fmt
+
+
+class PlotWorker:
+    """
+    共有メモリ（SharedArrays）に配置したデータの画像を、別のプロセスで保存するクラスです。
+    ワーカープロセスにはセグメントの名前だけを渡し、ワーカーはコピーせずにデータを参照して描画するため、
+    データが大きくてもpickleのコストはかかりません。submitは保存の完了を待たずに戻るため、
+    呼び出し側は画像の保存と並行に次のファイルの読み込みや合計を進められます。
+
+    submitに渡したSharedArraysの所有権はPlotWorkerに移り、保存が終わった（または失敗した）時点で削除します。
+    close()（またはwithの終了）で全ての保存を待ち、残っているセグメントを削除してプロセスを終了します。
+
+    Attributes:
+        max_pending (int): 保存を待つ共有メモリの最大数。超えた場合、submitは古いものの保存が終わるまで待ちます。
+        futures (list): submitで依頼した保存のFutureのリスト（依頼した順）
+
+    Methods:
+        submit(shared, name, labels=None, columns_per_page=None, fmt='.png', **plot_options):
+            共有メモリのデータの画像の保存をワーカープロセスに依頼し、Futureを返す
+        close(): 全ての保存を待ち、ワーカープロセスを終了する
+    """
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING_PLOTS):
+        self.max_pending = max_pending
+        self.futures = []
+        self._executor = None
+        self._pending = {}
+
+    def submit(self, shared, name, labels=None, columns_per_page=None, fmt='.png', **plot_options):
+        """
+        sharedの'combined_data'と'timestamps'の画像を、ワーカープロセスでrender_pagesと同じ方法で保存します。
+
+        Args:
+            shared (SharedArrays): CSVColumnSummer.share_dataで作成した共有メモリ。所有権はPlotWorkerに移ります。
+            name (str): 保存するファイル名。複数ページの場合は末尾に_1、_2、...を付けます。
+            labels (list): 各列のラベルのリスト
+            columns_per_page (int): 1ページあたりの列数（デフォルト: None、全ての列を1ページ）
+            fmt (str): ファイルの形式（デフォルト: '.png'）
+            **plot_options: set_plotのtitle、xlabel、decimation、max_points、layout
+
+        Returns:
+            concurrent.futures.Future: 結果は保存したファイルのパスのリスト
+        """
+        try:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=1)
+            # 共有メモリの使用量が増え続けないよう、保存待ちが多い場合は古いものが終わるまで待つ
+            while len(self._pending) >= self.max_pending:
+                wait(self._pending, return_when=FIRST_COMPLETED)
+                self._release_done()
+            future = self._executor.submit(_render_shared, shared.descriptor, name, labels, columns_per_page, fmt,
+                                           plot_options)
+        except BaseException:
+            shared.close()
+            raise
+        self._pending[future] = shared
+        self.futures.append(future)
+        return future
+
+    def _release_done(self):
+        """
+        保存が終わったFutureの共有メモリを削除します。
+        """
+        for future in [future for future in self._pending if future.done()]:
+            self._pending.pop(future).close()
+
+    def close(self):
+        """
+        全ての保存を待ち、共有メモリを削除してワーカープロセスを終了します。
+        保存の失敗は各Futureの結果として返るため、ここでは例外を発生させません。
+        """
+        try:
+            wait(self._pending)
+        finally:
+            for shared in self._pending.values():
+                shared.close()
+            self._pending.clear()
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _render_shared(descriptor, name, labels, columns_per_page, fmt, plot_options):
+    """
+    PlotWorkerのワーカープロセスで、共有メモリのセグメントに接続し、コピーせずにページごとの画像を保存します。
+    """
+    with attach_shared_arrays(descriptor) as arrays:
+        return render_pages(arrays['combined_data'], arrays['timestamps'], name, labels=labels,
+                            columns_per_page=columns_per_page, workers=1, fmt=fmt, **plot_options)
+
+
+def _as_plot_times(timestamps):
+    """
+    タイムスタンプを、matplotlibのx軸の範囲と比較できる数値に変換します。
+    datetime64はmatplotlibの日付の数値に変換し、それ以外はそのまま返します。
+    """
+    return mdates.date2num(timestamps) if timestamps.dtype.kind == 'M' else timestamps
@@ -0,0 +1,255 @@
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windowsではresourceが使用できないため、最大RSSは記録しない
+    resource = None
+
+# プロファイルのJSONレポートの形式のバージョン
+PROFILE_REPORT_VERSION = 1
+
+# 有効なプロファイラ（profilingの中でのみ設定される）
+_active_profiler = None
+
+
+class StageProfiler:
+    """
+    処理の段（ロード、合計、保存、プロットなど）ごとに、経過時間、CPU時間、ピークメモリ、
+    処理した行数とバイト数を記録し、JSONのレポートとして出力します。
+    ピークメモリはプロセスのRSSの最大値で、Linuxでは段の開始時に/proc/self/clear_refsで最大値をリセットして段ごとに求めます。
+    tracemallocのように割り当てを追跡しないため、計測による処理の遅れはありません。
+    リセットできない環境では、peak_rss_bytesはそれまでのプロセス全体の最大値になり、peak_memory_bytesはNoneになります。
+
+    Attributes:
+        stages (list): 記録した段ごとの辞書のリスト（開始した順番）
+
+    Methods:
+        stage(name, rows=None, num_bytes=None, **info): 段を計測するコンテキストマネージャを返します。
+        report(**info): 記録した内容をJSONに変換できる辞書で返します。
+        save_report(path, **info): レポートをJSONファイルとして保存します。
+        print_summary(): 段ごとの計測結果を表示します。
+    """
+
+    def __init__(self):
+        self.stages = []
+        self._stack = []
+        self._started_at = datetime.now().astimezone()
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        # 段ごとにRSSの最大値をリセットするため、プロセス全体の最大値はここで保持する
+        self._max_rss = _memory_usage()[1]
+
+    @contextmanager
+    def stage(self, name, rows=None, num_bytes=None, **info):
+        """
+        withの中の処理を1つの段として計測します。処理した行数とバイト数は、返された辞書の
+        'rows'、'bytes'に処理の後で設定することもできます。段は入れ子にでき、外側の段のピークメモリは内側の段を含みます。
+
+        Args:
+            name (str): 段の名前
+            rows (int): 処理した行数
+            num_bytes (int): 処理したバイト数（読み込んだファイルや保存したファイルのサイズなど）
+            **info: レポートに含めるその他の情報（ファイルのパスなど）
+        """
+        record = {'name': name, 'rows': rows, 'bytes': num_bytes}
+        record.update(info)
+        current, peak = self._memory_usage()
+        # 内側の段で最大値をリセットするため、外側の段のそれまでの最大値を保存しておく
+        if self._stack and peak is not None:
+            self._stack[-1]['_peak'] = max(self._stack[-1]['_peak'] or 0, peak)
+        reset = _reset_peak_memory()
+        record['_base'] = current if reset else None
+        record['_peak'] = current if reset else None
+        record['depth'] = len(self._stack)
+        self._stack.append(record)
+        self.stages.append(record)
+        start = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - start
+            record['cpu_seconds'] = time.process_time() - start_cpu
+            self._stack.pop()
+            current, peak = self._memory_usage()
+            base, saved_peak = record.pop('_base'), record.pop('_peak')
+            if peak is not None and saved_peak is not None:
+                peak = max(peak, saved_peak)
+            record['rss_bytes'] = current
+            record['peak_rss_bytes'] = peak
+            record['peak_memory_bytes'] = peak - base if base is not None and peak is not None else None
+            if self._stack and peak is not None:
+                self._stack[-1]['_peak'] = max(self._stack[-1]['_peak'] or 0, peak)
+            _add_throughput(record)
+
+    def _memory_usage(self):
+        """
+        現在のRSSとRSSの最大値を返し、プロセス全体の最大値を更新します。
+        """
+        current, peak = _memory_usage()
+        if peak is not None:
+            self._max_rss = max(self._max_rss or 0, peak)
+        return current, peak
+
+    def report(self, **info):
+        """
+        記録した内容を、JSONに変換できる辞書で返します。
+
+        Args:
+            **info: レポートに含めるその他の情報（実行時のオプションなど）
+        """
+        self._memory_usage()
+        return {
+            'version': PROFILE_REPORT_VERSION,
+            'started_at': self._started_at.isoformat(timespec='seconds'),
+            'total_wall_seconds': time.perf_counter() - self._start,
+            'total_cpu_seconds': time.process_time() - self._start_cpu,
+            'max_rss_bytes': self._max_rss,
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'argv': sys.argv,
+            },
+            'info': info,
+            'stages': self.stages,
+        }
+
+    def save_report(self, path, **info):
+        """
+        レポートをJSONファイルとして保存します。
+
+        Returns:
+            dict: 保存したレポート
+        """
+        report = self.report(**info)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=_to_json)
+        print(f"プロファイルのレポートを {path}に保存しました。")
+        return report
+
+    def print_summary(self):
+        """
+        段ごとの経過時間、CPU時間、ピークメモリ、スループットを表示します。
+        """
+        print(f"{'stage':<24}{'wall[s]':>9}{'cpu[s]':>9}{'peak[MB]':>10}{'rows/s':>14}{'MB/s':>9}")
+        for record in self.stages:
+            name = '  ' * record['depth'] + record['name']
+            peak = '-' if record['peak_memory_bytes'] is None else f"{record['peak_memory_bytes'] / 1e6:.1f}"
+            rows_per_second = '-' if record['rows_per_second'] is None else f"{record['rows_per_second']:,.0f}"
+            megabytes_per_second = '-' if record['bytes_per_second'] is None else f"{record['bytes_per_second'] / 1e6:.1f}"
+            print(f"{name:<24}{record['wall_seconds']:>9.3f}{record['cpu_seconds']:>9.3f}{peak:>10}"
+                  f"{rows_per_second:>14}{megabytes_per_second:>9}")
+
+
+@contextmanager
+def profiling():
+    """
+    withの中でprofile_stageによる計測を有効にし、StageProfilerを返します。
+
+    Examples:
+        with profiling() as profiler:
+            main(csv_file_path)
+        profiler.save_report('./profile.json')
+    """
+    global _active_profiler
+    previous = _active_profiler
+    profiler = StageProfiler()
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
+
+
+@contextmanager
+def profile_stage(name, rows=None, num_bytes=None, **info):
+    """
+    profilingの中であれば、withの中の処理を1つの段として計測します。
+    profilingの外では何も計測せず、行数などを設定するための辞書のみを返します。
+    """
+    if _active_profiler is None:
+        yield {}
+        return
+    with _active_profiler.stage(name, rows=rows, num_bytes=num_bytes, **info) as record:
+        yield record
+
+
+def file_size(path):
+    """
+    ファイルのサイズを返します。ファイルが存在しない場合はNoneを返します。
+    """
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return None
+
+
+def _add_throughput(record):
+    """
+    経過時間と行数、バイト数から、rows_per_secondとbytes_per_secondを追加します。
+    """
+    seconds = record['wall_seconds']
+    for key, rate in (('rows', 'rows_per_second'), ('bytes', 'bytes_per_second')):
+        value = record.get(key)
+        record[rate] = value / seconds if value is not None and seconds > 0 else None
+
+
+def _memory_usage():
+    """
+    プロセスの現在のRSSと、RSSの最大値（バイト）を返します。
+    /proc/self/statusを読めない環境では、現在のRSSはNone、最大値はgetrusageの値になります。
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            status = dict(line.split(':', 1) for line in f if ':' in line)
+        # 値は'12345 kB'の形式
+        return int(status['VmRSS'].split()[0]) * 1024, int(status['VmHWM'].split()[0]) * 1024
+    except (OSError, KeyError, ValueError):
+        return None, _max_rss_bytes()
+
+
+def _reset_peak_memory():
+    """
+    プロセスのRSSの最大値（VmHWM）を現在のRSSにリセットします。リセットできた場合はTrueを返します。
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _max_rss_bytes():
+    """
+    プロセスの最大RSS（バイト）を返します。取得できない場合はNoneを返します。
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSはバイト、Linuxはキロバイト単位
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _to_json(value):
+    """
+    json.dumpで変換できない値（numpyの数値や配列など）を変換します。
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
@@ -0,0 +1,200 @@
+import numpy as np
+
+# 指定できるリサンプリングの集計方法
+RESAMPLE_METHODS = ('mean', 'min', 'max', 'last')
+
+
+def resample(timestamps, values, interval, method='mean'):
+    """
+    タイムスタンプをinterval秒ごとの区間に分け、区間ごとに各列の値を集計します。
+    行が1つもない区間は出力しません。
+
+    Args:
+        timestamps (np.ndarray): 昇順の1次元のタイムスタンプ配列
+        values (np.ndarray): 各列が異なる時系列データを表す2次元配列
+        interval (float): 区間の長さ（秒）。datetime64/timedelta64の場合も秒で指定します
+        method (str): 'mean'、'min'、'max'または'last'（デフォルト: 'mean'）
+
+    Returns:
+        tuple: (timestamps, values)
+            timestamps (np.ndarray): 区間の開始時刻（元のタイムスタンプと同じ型）
+            values (np.ndarray): 区間ごとに集計したデータ配列（元のデータと同じ型）
+    """
+    resampler = TimeResampler(interval, method)
+    head_times, head_values = resampler.push(timestamps, values)
+    tail_times, tail_values = resampler.flush()
+    if len(tail_times) == 0:
+        return head_times, head_values
+    return np.concatenate([head_times, tail_times]), np.vstack([head_values, tail_values])
+
+
+class TimeResampler:
+    """
+    チャンクごとに渡される時系列データを、interval秒ごとの区間に集計します。
+    区間は時刻0を基準に区切るため、チャンクの分け方によらず結果はresampleと同じになります。
+    最後の区間は次のチャンクに続く可能性があるため、集計途中の値（1行分）のみを保持し、
+    次のpushまたはflushで出力します。
+
+    Attributes:
+        interval (float): 区間の長さ（秒）
+        method (str): 'mean'、'min'、'max'または'last'
+
+    Methods:
+        push(timestamps, values): チャンクを追加し、確定した区間の集計結果を返します。
+        flush(): 保持している最後の区間の集計結果を返します。
+    """
+
+    def __init__(self, interval, method='mean'):
+        if method not in RESAMPLE_METHODS:
+            raise ValueError(f"methodは{RESAMPLE_METHODS}のいずれかを指定してください。: {method}")
+        if not interval > 0:
+            raise ValueError(f"intervalは0より大きい値を指定してください。: {interval}")
+        self.interval = interval
+        self.method = method
+        # 集計途中の最後の区間（区間番号、集計値、行数）と、最後の行のタイムスタンプ
+        self._pending = None
+        self._last_time = None
+        self._time_dtype = None
+        self._value_dtype = None
+
+    def push(self, timestamps, values):
+        """
+        チャンクを追加し、確定した区間の集計結果を返します。
+        チャンクの最初の区間が前のチャンクの最後の区間と同じ場合は、まとめて集計します。
+
+        Returns:
+            tuple: (timestamps, values) resampleと同じ形式
+
+        Raises:
+            ValueError: タイムスタンプが昇順でない場合に発生します
+        """
+        values = np.asarray(values)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        self._time_dtype = timestamps.dtype
+        self._value_dtype = values.dtype
+        if len(timestamps) == 0:
+            return self._empty(values.shape[1])
+
+        ticks = _as_ticks(timestamps)
+        if np.any(ticks[1:] < ticks[:-1]) or (self._last_time is not None and ticks[0] < self._last_time):
+            raise ValueError("タイムスタンプが昇順ではありません。")
+        self._last_time = ticks[-1]
+
+        bucket_ids = _bucket_ids(ticks, _interval_ticks(self.interval, timestamps.dtype))
+        starts = np.concatenate([[0], np.flatnonzero(bucket_ids[1:] != bucket_ids[:-1]) + 1])
+        ids = bucket_ids[starts]
+        aggregated = _reduce_buckets(values, starts, self.method)
+        counts = np.diff(np.append(starts, len(bucket_ids)))
+
+        if self._pending is not None:
+            pending_id, pending_aggregated, pending_count = self._pending
+            if ids[0] == pending_id:
+                aggregated[0] = _merge_bucket(pending_aggregated, aggregated[0], self.method)
+                counts[0] += pending_count
+            else:
+                ids = np.insert(ids, 0, pending_id)
+                aggregated = np.vstack([pending_aggregated, aggregated])
+                counts = np.insert(counts, 0, pending_count)
+
+        self._pending = (ids[-1], aggregated[-1].copy(), counts[-1])
+        return self._finalize(ids[:-1], aggregated[:-1], counts[:-1])
+
+    def flush(self):
+        """
+        保持している最後の区間の集計結果を返します。flushの後は新しいデータとして集計を始めます。
+
+        Returns:
+            tuple: (timestamps, values) resampleと同じ形式。保持している区間がない場合は0行の配列
+        """
+        if self._pending is None:
+            return self._empty(0)
+        pending_id, pending_aggregated, pending_count = self._pending
+        self._pending = None
+        self._last_time = None
+        return self._finalize(np.array([pending_id]), pending_aggregated[np.newaxis], np.array([pending_count]))
+
+    def _finalize(self, ids, aggregated, counts):
+        """
+        区間番号を区間の開始時刻に、集計値を出力する値に変換します。
+        """
+        if self.method == 'mean':
+            aggregated = aggregated / counts[:, np.newaxis]
+        times = _bucket_times(ids, self.interval, self._time_dtype)
+        return times, aggregated.astype(self._value_dtype, copy=False)
+
+    def _empty(self, num_columns):
+        time_dtype = np.float64 if self._time_dtype is None else self._time_dtype
+        value_dtype = np.float64 if self._value_dtype is None else self._value_dtype
+        return np.empty(0, dtype=time_dtype), np.empty((0, num_columns), dtype=value_dtype)
+
+
+def _reduce_buckets(values, starts, method):
+    """
+    startsで区切られた区間ごとに、各列の値を集計します。'mean'の場合は合計を倍精度で返します。
+    """
+    if method == 'mean':
+        return np.add.reduceat(values, starts, axis=0, dtype=np.float64)
+    if method == 'min':
+        return np.minimum.reduceat(values, starts, axis=0)
+    if method == 'max':
+        return np.maximum.reduceat(values, starts, axis=0)
+    return values[np.append(starts[1:], len(values)) - 1]
+
+
+def _merge_bucket(previous, current, method):
+    """
+    2つのチャンクにまたがる区間の、前のチャンクの集計値と次のチャンクの集計値をまとめます。
+    """
+    if method == 'mean':
+        return previous + current
+    if method == 'min':
+        return np.minimum(previous, current)
+    if method == 'max':
+        return np.maximum(previous, current)
+    return current
+
+
+def _as_ticks(timestamps):
+    """
+    区間の計算用に、datetime64/timedelta64を単位のまま整数値に変換します。
+    """
+    if timestamps.dtype.kind in 'mM':
+        return timestamps.view(np.int64)
+    return timestamps
+
+
+def _bucket_ids(ticks, interval):
+    """
+    各行が含まれる区間の番号を返します。
+    浮動小数点数の割り算の誤差で、区間の境界上の時刻（0.03 / 0.01 = 2.9999...など）が前の区間に入らないよう、
+    商が整数に十分近い場合はその整数を区間の番号にします。
+    """
+    if ticks.dtype.kind in 'iu' and isinstance(interval, (int, np.integer)):
+        return ticks // interval
+    quotients = np.asarray(ticks, dtype=np.float64) / interval
+    nearest = np.round(quotients)
+    on_edge = np.abs(quotients - nearest) <= 1e-9 * np.maximum(np.abs(nearest), 1.0)
+    return np.where(on_edge, nearest, np.floor(quotients)).astype(np.int64)
+
+
+def _interval_ticks(interval, dtype):
+    """
+    秒で指定したintervalを、タイムスタンプの単位での区間の長さに変換します。
+    """
+    if dtype.kind not in 'mM':
+        return interval
+    unit = np.datetime_data(dtype)[0]
+    ticks = int(round(interval * (np.timedelta64(1, 's') / np.timedelta64(1, unit))))
+    if ticks < 1:
+        raise ValueError(f"intervalがタイムスタンプの単位（{unit}）より小さいです。: {interval}")
+    return ticks
+
+
+def _bucket_times(ids, interval, dtype):
+    """
+    区間番号から、元のタイムスタンプと同じ型の区間の開始時刻を作成します。
+    """
+    if dtype.kind in 'mM':
+        return (ids.astype(np.int64) * _interval_ticks(interval, dtype)).view(dtype)
+    return (ids * interval).astype(dtype, copy=False)
@@ -0,0 +1,423 @@
+import http.client
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .data_module import CSVColumnSummer
+
+# サーバーのデフォルトの待ち受けアドレス（外部から接続できないよう、localhostのみ）
+DEFAULT_SERVER_HOST = '127.0.0.1'
+DEFAULT_SERVER_PORT = 8765
+
+# メモリに保持するデータの最大合計バイト数のデフォルト値
+DEFAULT_SERVER_MAX_BYTES = 1 << 30
+
+# リクエストで指定できる処理
+SERVER_ACTIONS = ('load', 'sum', 'save', 'render', 'stats', 'evict')
+
+
+class SummerCache:
+    """
+    ロード済みのCSVColumnSummerを、ファイルの絶対パスとオプションをキーにしてメモリに保持するLRUキャッシュです。
+    保持しているデータ（bufferとtimestamps）の合計がmax_bytesを超えた場合は、最も長く使用されていないものから破棄します。
+    取り出すたびにファイルの更新時刻とサイズを確認し、変更されていた場合は読み込み直します。
+
+    複数のスレッドから同時に使用できます。キーごとにロックを持ち、同じデータへの処理は順番に、
+    異なるデータへの処理は並行に実行します。
+
+    Methods:
+        use(path, options): キーのエントリのロックを取得してCSVColumnSummerを返すコンテキストマネージャ。
+        evict(path=None): 指定したファイル（Noneの場合は全て）のエントリを破棄します。
+        stats(): エントリ数、合計バイト数、ヒット数などを返します。
+    """
+
+    def __init__(self, max_bytes=DEFAULT_SERVER_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+
+    def use(self, path, options=None):
+        """
+        pathとoptionsのCSVColumnSummerを返すコンテキストマネージャです。キャッシュにない場合、
+        またはファイルが変更されている場合はロードします。withの中ではエントリのロックを保持します。
+
+        Examples:
+            with cache.use('data.csv', {'delimiter': ','}) as (summer, cached):
+                summer.add_sum_column([0, 1])
+        """
+        return _EntryContext(self, os.path.abspath(path), dict(options or {}))
+
+    def evict(self, path=None):
+        """
+        指定したファイルのエントリ（pathがNoneの場合は全てのエントリ）を破棄し、破棄した数を返します。
+        """
+        path = os.path.abspath(path) if path is not None else None
+        with self._lock:
+            keys = [key for key in self._entries if path is None or key[0] == path]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def stats(self):
+        """
+        エントリ数、保持しているバイト数、ヒット数、ミス数、ファイルの変更による読み込み直しの回数を返します。
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(entry.nbytes for entry in self._entries.values()),
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'reloads': self._reloads,
+                'files': [key[0] for key in self._entries],
+            }
+
+    def _acquire(self, path, options):
+        """
+        エントリを取り出してロックを取得し、(entry, cached)を返します。
+        """
+        key = (path, json.dumps(options, sort_keys=True, default=str))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _CacheEntry()
+            self._entries.move_to_end(key)
+        entry.lock.acquire()
+        try:
+            signature = _file_signature(path)
+            cached = entry.summer is not None and entry.signature == signature
+            if not cached:
+                with self._lock:
+                    if entry.summer is not None:
+                        self._reloads += 1
+                    self._misses += 1
+                # 読み込み中は他のエントリへの処理を止めないよう、キャッシュ全体のロックは保持しない
+                entry.summer = CSVColumnSummer(path, options)
+                entry.signature = signature
+                entry.nbytes = entry.summer.buffer.nbytes + entry.summer.timestamps.nbytes
+                self._evict_over_limit(key)
+            else:
+                with self._lock:
+                    self._hits += 1
+        except BaseException:
+            entry.lock.release()
+            with self._lock:
+                if self._entries.get(key) is entry and entry.summer is None:
+                    del self._entries[key]
+            raise
+        return entry, cached
+
+    def _evict_over_limit(self, keep_key):
+        """
+        合計バイト数がmax_bytesを超えている間、最も長く使用されていないエントリを破棄します。
+        keep_keyのエントリ（今回使用するもの）は破棄しません。
+        """
+        with self._lock:
+            total = sum(entry.nbytes for entry in self._entries.values())
+            for key in list(self._entries):
+                if total <= self.max_bytes:
+                    break
+                if key == keep_key:
+                    continue
+                total -= self._entries.pop(key).nbytes
+
+
+class _CacheEntry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.summer = None
+        self.signature = None
+        self.nbytes = 0
+
+
+class _EntryContext:
+    def __init__(self, cache, path, options):
+        self._cache = cache
+        self._path = path
+        self._options = options
+        self._entry = None
+
+    def __enter__(self):
+        self._entry, cached = self._cache._acquire(self._path, self._options)
+        return self._entry.summer, cached
+
+    def __exit__(self, *exc_info):
+        self._entry.lock.release()
+        return False
+
+
+class SummerService:
+    """
+    サーバーが受け付けるリクエストを処理します。リクエストとレスポンスはJSONに変換できる辞書です。
+
+    リクエスト:
+        {'action': 'load', 'path': ..., 'options': {...}}: ファイルをロード（キャッシュにあれば再利用）します。
+        {'action': 'sum', 'path': ..., 'options': {...}, 'sum_target': [0, 2]}: 選択した列の合計を計算し直します。
+        {'action': 'save', 'path': ..., 'options': {...}, 'save_path': ..., 'header': ..., 'sum_target': ...}: save_dataで保存します。
+            sum_targetはそのリクエストの間だけ適用し、キャッシュのデータの合計列（全ての列の合計）は変更しません。
+        {'action': 'render', 'path': ..., 'options': {...}, 'image_name': ..., 'decimation', 'layout',
+            'columns_per_page', 'labels'}: headlessでプロットのイメージを保存します。
+        {'action': 'stats'}: キャッシュの状態を返します。
+        {'action': 'evict', 'path': ...}: ファイルのエントリ（pathを省略した場合は全て）を破棄します。
+
+    レスポンス:
+        成功した場合は'ok': Trueと処理の結果、失敗した場合は'ok': Falseと'error'を含む辞書です。
+    """
+
+    def __init__(self, max_bytes=DEFAULT_SERVER_MAX_BYTES):
+        self.cache = SummerCache(max_bytes)
+
+    def handle(self, request):
+        """
+        リクエストを処理し、レスポンスの辞書を返します。例外は'error'としてレスポンスに含めます。
+        """
+        start = time.perf_counter()
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("リクエストはJSONのオブジェクトで指定してください。")
+            action = request.get('action')
+            if action not in SERVER_ACTIONS:
+                raise ValueError(f"actionは{SERVER_ACTIONS}のいずれかを指定してください。: {action}")
+            response = getattr(self, '_' + action)(request)
+            response['ok'] = True
+        except Exception as e:
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        response['seconds'] = time.perf_counter() - start
+        return response
+
+    def _load(self, request):
+        with self.cache.use(_require(request, 'path'), request.get('options')) as (summer, cached):
+            return _describe(summer, cached)
+
+    def _sum(self, request):
+        with self.cache.use(_require(request, 'path'), request.get('options')) as (summer, cached), \
+                _request_sum(summer, request.get('sum_target')):
+            response = _describe(summer, cached)
+            response['sum'] = _summarize(summer.added_column)
+            return response
+
+    def _save(self, request):
+        with self.cache.use(_require(request, 'path'), request.get('options')) as (summer, cached), \
+                _request_sum(summer, request.get('sum_target')):
+            save_path = request.get('save_path', './added_data.csv')
+            _, header = summer.save_data(save_path=save_path, header=request.get('header', 'synthetic wave'))
+            response = _describe(summer, cached)
+            response.update(save_path=save_path, saved_header=header)
+            return response
+
+    def _render(self, request):
+        # matplotlibのimportは時間がかかるため、イメージを保存する場合のみimportする
+        from .plot_module import render_pages
+        with self.cache.use(_require(request, 'path'), request.get('options')) as (summer, cached):
+            x_data, y_data = summer.get_data()
+            new_data_name = summer.new_data_name or request.get('header', 'synthetic wave')
+            labels = request.get('labels') or \
+                summer.get_header(as_list=True)[1:] + [new_data_name] + summer.derived_names
+            pages = render_pages(x_data, y_data, _require(request, 'image_name'), labels=labels,
+                                 columns_per_page=request.get('columns_per_page'), workers=1,
+                                 decimation=request.get('decimation', 'minmax'), layout=request.get('layout', 'auto'))
+            response = _describe(summer, cached)
+            response['images'] = pages
+            return response
+
+    def _stats(self, request):
+        return self.cache.stats()
+
+    def _evict(self, request):
+        return {'evicted': self.cache.evict(request.get('path'))}
+
+
+@contextmanager
+def _request_sum(summer, sum_target=None):
+    """
+    1つのリクエストの間だけ、キャッシュのCSVColumnSummerの合計列をsum_targetで計算し直すコンテキストマネージャです。
+    CSVColumnSummerは他のクライアントと共有しているため、終了時に合計列とsave_dataで設定されるヘッダーを元に戻し、
+    sum_targetを指定しない他のクライアントのリクエストに影響しないようにします。
+    エントリのロックを取得したwithの中で使用してください。
+    """
+    # added_headerはsave_dataを実行するまで設定されない
+    state = (summer.sum_target, summer.new_data_name, getattr(summer, 'added_header', None), summer.save_path)
+    try:
+        if sum_target != state[0]:
+            summer.add_sum_column(sum_target)
+        yield summer
+    finally:
+        if summer.sum_target != state[0]:
+            summer.add_sum_column(state[0])
+        _, summer.new_data_name, summer.added_header, summer.save_path = state
+
+
+def serve(host=DEFAULT_SERVER_HOST, port=DEFAULT_SERVER_PORT, unix_socket=None, max_bytes=DEFAULT_SERVER_MAX_BYTES):
+    """
+    リクエストを受け付けるサーバーを起動し、Ctrl+Cで終了するまで処理を続けます。
+    unix_socketを指定した場合はUnixドメインソケット（1行に1つのJSON）、指定しない場合はlocalhostのHTTP
+    （POST /、本文がJSON）で受け付けます。リクエストはスレッドごとに並行に処理します。
+
+    Args:
+        host (str): HTTPサーバーのアドレス（デフォルト: 127.0.0.1）
+        port (int): HTTPサーバーのポート番号（デフォルト: 8765）
+        unix_socket (str): Unixドメインソケットのパス（デフォルト: None、HTTPで受け付ける）
+        max_bytes (int): メモリに保持するデータの最大合計バイト数（デフォルト: 1GiB）
+    """
+    server = make_server(SummerService(max_bytes), host, port, unix_socket)
+    address = unix_socket or f"http://{server.server_address[0]}:{server.server_address[1]}"
+    print(f"サーバーを起動しました。: {address} (最大{max_bytes / (1 << 20):.0f}MB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("サーバーを終了します。")
+    finally:
+        server.server_close()
+        if unix_socket is not None and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+
+def make_server(service, host=DEFAULT_SERVER_HOST, port=DEFAULT_SERVER_PORT, unix_socket=None):
+    """
+    serviceでリクエストを処理するサーバーを作成します（serve_foreverは呼び出しません）。
+    """
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        handler = type('UnixRequestHandler', (_UnixRequestHandler,), {'service': service})
+        server = socketserver.ThreadingUnixStreamServer(unix_socket, handler)
+    else:
+        handler = type('HTTPRequestHandler', (_HTTPRequestHandler,), {'service': service})
+        server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def send_request(action, host=DEFAULT_SERVER_HOST, port=DEFAULT_SERVER_PORT, unix_socket=None, timeout=None,
+                 **params):
+    """
+    サーバーにリクエストを送信し、レスポンスの辞書を返します。
+
+    Examples:
+        send_request('load', path='data.csv', options={'loader': 'fast'})
+        send_request('save', path='data.csv', save_path='./result.csv', unix_socket='/tmp/tdp.sock')
+    """
+    body = json.dumps(dict(params, action=action), ensure_ascii=False).encode('utf-8')
+    if unix_socket is not None:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(unix_socket)
+            sock.sendall(body + b'\n')
+            with sock.makefile('rb') as f:
+                return json.loads(f.readline())
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request('POST', '/', body=body, headers={'Content-Type': 'application/json'})
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+class _HTTPRequestHandler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError as e:
+            request = None
+            response = {'ok': False, 'error': f"JSONDecodeError: {e}"}
+        if request is not None:
+            response = self.service.handle(request)
+        response, body = _encode_response(response)
+        self.send_response(200 if response['ok'] else 400)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # リクエストごとのログは表示しない
+        pass
+
+
+class _UnixRequestHandler(socketserver.StreamRequestHandler):
+    service = None
+
+    def handle(self):
+        # 1行に1つのJSONのリクエストを、接続が閉じられるまで順に処理する
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.service.handle(json.loads(line))
+            except ValueError as e:
+                response = {'ok': False, 'error': f"JSONDecodeError: {e}"}
+            _, body = _encode_response(response)
+            self.wfile.write(body + b'\n')
+            self.wfile.flush()
+
+
+def _encode_response(response):
+    """
+    レスポンスをJSONのバイト列に変換します。NaNやinfはJSONの値として正しくないため、
+    含まれる場合はエラーのレスポンスに置き換えます。
+
+    Returns:
+        tuple: (response, body) 変換したレスポンスの辞書とバイト列
+    """
+    try:
+        return response, json.dumps(response, ensure_ascii=False, default=str, allow_nan=False).encode('utf-8')
+    except ValueError as e:
+        response = {'ok': False, 'error': f"ValueError: {e}", 'seconds': response.get('seconds')}
+        return response, json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+
+def _summarize(values):
+    """
+    合計列の最小値、最大値、平均値を、NaNとinfを除いた値で計算します。
+    除いた行数はnon_finiteに含め、有限の値がない場合は最小値などをNoneにします。
+    """
+    finite = values[np.isfinite(values)]
+    return {
+        'min': float(np.min(finite)) if len(finite) else None,
+        'max': float(np.max(finite)) if len(finite) else None,
+        'mean': float(np.mean(finite)) if len(finite) else None,
+        'non_finite': int(len(values) - len(finite)),
+    }
+
+
+def _require(request, key):
+    if request.get(key) is None:
+        raise ValueError(f"{request.get('action')}には{key}を指定してください。")
+    return request[key]
+
+
+def _describe(summer, cached):
+    """
+    ロードしたデータの行数、列数、ヘッダーなどを、レスポンスの辞書として返します。
+    """
+    return {
+        'cached': cached,
+        'rows': int(summer.num_data),
+        'columns': int(summer.num_columns),
+        'header': summer.csv_header,
+        'derived_names': summer.derived_names,
+        'nbytes': int(summer.buffer.nbytes + summer.timestamps.nbytes),
+    }
+
+
+def _file_signature(path):
+    """
+    ファイルの変更を検出するための(更新時刻, サイズ)を返します。
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
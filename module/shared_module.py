@@ -0,0 +1,115 @@
+import gc
+import weakref
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+
+class SharedArrays:
+    """
+    numpy配列をmultiprocessing.shared_memoryのセグメントに配置し、他のプロセスから名前で参照できるようにするクラスです。
+    配列ごとに1つのセグメントを作成し、作成時に1回だけコピーします。
+    descriptor（セグメント名、形状、型の辞書）は小さいため、配列の代わりに他のプロセスへ渡しても
+    pickleのコストはデータの大きさによりません。受け取ったプロセスはattach_shared_arraysで、コピーせずに同じメモリを参照します。
+
+    セグメントは作成したプロセスが所有し、close()で閉じて削除（unlink）します。
+    close()を呼ばなかった場合も、オブジェクトが破棄されたときやプロセスの終了時に削除します。
+
+    Attributes:
+        descriptor (dict): {キー: (セグメント名, 形状, 型の文字列)}
+        nbytes (int): 全てのセグメントに配置した配列のバイト数の合計
+
+    Methods:
+        close(): セグメントを閉じて削除します。2回目以降の呼び出しは何もしません。
+    """
+    def __init__(self, arrays):
+        """
+        Args:
+            arrays (dict): {キー: np.ndarray} 共有メモリに配置する配列
+        """
+        self.descriptor = {}
+        self.nbytes = 0
+        self._segments = []
+        self._finalizer = weakref.finalize(self, _unlink_segments, self._segments)
+        try:
+            for key, array in arrays.items():
+                array = np.asarray(array)
+                # サイズ0のセグメントは作成できないため、空の配列でも1バイト確保する
+                segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._segments.append(segment)
+                _as_array(segment, array.shape, array.dtype.str)[...] = array
+                self.descriptor[key] = (segment.name, array.shape, array.dtype.str)
+                self.nbytes += array.nbytes
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        セグメントを閉じて削除します。
+        """
+        self._finalizer()
+
+    @property
+    def closed(self):
+        return not self._finalizer.alive
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+@contextmanager
+def attach_shared_arrays(descriptor):
+    """
+    SharedArraysのdescriptorのセグメントに接続し、{キー: np.ndarray}の辞書を返すコンテキストマネージャです。
+    配列はセグメントのメモリを直接参照するビューで、コピーしません。
+    終了時にセグメントを閉じるため、配列（とそのビュー）はwithの外に持ち出さないでください。
+    セグメントの削除は作成したプロセスが行います。
+    """
+    segments = []
+    arrays = {}
+    try:
+        for key, (name, shape, dtype) in descriptor.items():
+            segment = SharedMemory(name=name)
+            segments.append(segment)
+            arrays[key] = _as_array(segment, shape, dtype)
+        yield arrays
+    finally:
+        arrays.clear()
+        for segment in segments:
+            _close_segment(segment)
+
+
+def _as_array(segment, shape, dtype):
+    """
+    セグメントのメモリを参照するndarrayを作成します。
+    """
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+
+def _close_segment(segment):
+    """
+    セグメントを閉じます。matplotlibのFigureなど、循環参照で配列のビューが残っている場合は
+    ガベージコレクションで解放してから閉じ直します。
+    """
+    try:
+        segment.close()
+    except BufferError:
+        gc.collect()
+        segment.close()
+
+
+def _unlink_segments(segments):
+    """
+    作成したセグメントを閉じて削除します。
+    """
+    for segment in segments:
+        _close_segment(segment)
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+    segments.clear()
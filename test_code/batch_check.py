@@ -0,0 +1,73 @@
+import gzip
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from main import main_batch
+
+
+def write_waves(path, rows, cols, seed):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rng = np.random.default_rng(seed)
+    header = 'time,' + ','.join(f"wave{i+1}" for i in range(cols))
+    np.savetxt(path, np.column_stack([np.arange(rows) * 0.001, rng.normal(0, 1, (rows, cols))]),
+               delimiter=',', header=header, comments='', fmt='%.6f')
+
+
+def expect_error(function, message):
+    """
+    functionがValueErrorを発生させることを確認します。
+    """
+    try:
+        with redirect_stdout(io.StringIO()):
+            function()
+    except ValueError as e:
+        print(f"  {message}: {e}")
+        return
+    raise AssertionError(f"ValueErrorが発生しませんでした。: {message}")
+
+
+if __name__ == "__main__":
+    # option
+    rows = 1000
+    cols = 3
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 別のディレクトリにある同じ名前のファイルと、データのない読み込めないファイル
+        inputs = [os.path.join(tmp_dir, 'data', day, 'capture.csv') for day in ('day1', 'day2')]
+        for seed, path in enumerate(inputs):
+            write_waves(path, rows, cols + seed, seed)
+        broken = os.path.join(tmp_dir, 'data', 'day2', 'broken.csv')
+        with open(broken, 'w') as f:
+            f.write('time,wave1\n')
+
+        save_dir = os.path.join(tmp_dir, 'result')
+        with redirect_stdout(io.StringIO()):
+            results = main_batch(inputs + [broken], save_dir=save_dir, batch_workers=2, save_graph=True)
+
+        # 同じ名前のファイルの結果は、共通の親ディレクトリからの相対パスに別々に保存されること
+        for seed, day in enumerate(('day1', 'day2')):
+            result_path = os.path.join(save_dir, day, 'capture.csv')
+            with open(result_path) as f:
+                assert f.readline().count(',') == cols + seed + 1, result_path
+            assert os.path.exists(os.path.join(save_dir, day, 'capture.png')), day
+        # 1つのファイルのエラーは、他のファイルの結果に影響しないこと
+        assert [result['ok'] for result in results] == [True, True, False], results
+        assert results[2]['error'] is not None
+        print(f"batch check: {len(results)}ファイル, 失敗: {results[2]['path']} ({results[2]['error']})")
+
+        # 保存先が重なる場合は、処理を始める前にエラーにすること
+        expect_error(lambda: main_batch(inputs, save_dir=os.path.join(tmp_dir, 'data')), "入力ファイルへの上書き")
+        compressed = os.path.join(tmp_dir, 'data', 'day1', 'capture.csv.gz')
+        with open(inputs[0], 'rb') as src:
+            with gzip.open(compressed, 'wb') as dst:
+                dst.write(src.read())
+        expect_error(lambda: main_batch([inputs[0], compressed], save_dir=save_dir, save_graph=True),
+                     "イメージ名の重複")
+    print("batch check OK")
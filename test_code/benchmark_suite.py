@@ -0,0 +1,217 @@
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.csv_module import load_csv_file
+from module.data_module import CSVColumnSummer
+from module.plot_module import Plotter
+from module.profile_module import StageProfiler
+from wave_generator import generate_wave_csv, wave_csv_name
+
+# 計測する条件のプリセット。各条件は(行数, 列数, 欠損値の割合, 区切り文字)
+PRESETS = {
+    'quick': [
+        (10**3, 2, 0.0, ','),
+        (10**5, 8, 0.0, ','),
+        (10**5, 8, 0.01, ','),
+        (10**5, 8, 0.0, ';'),
+        (10**4, 500, 0.0, ','),
+    ],
+    'standard': [
+        (10**3, 2, 0.0, ','),
+        (10**5, 8, 0.0, ','),
+        (10**6, 8, 0.0, ','),
+        (10**6, 8, 0.01, ','),
+        (10**6, 8, 0.0, '\t'),
+        (10**5, 100, 0.0, ','),
+        (10**5, 500, 0.0, ','),
+    ],
+    'full': [
+        (10**3, 2, 0.0, ','),
+        (10**6, 8, 0.0, ','),
+        (10**6, 8, 0.1, ','),
+        (10**6, 500, 0.0, ','),
+        (10**7, 8, 0.0, ','),
+        (10**8, 2, 0.0, ','),
+    ],
+}
+
+# loader='np'（np.genfromtxt）は遅いため、この行数を超える条件ではload_csv_file_npを計測せず、
+# load_dataはloader='fast'で計測する
+NP_LOADER_MAX_ROWS = 10**6
+
+# 経過時間がこれより短い段は、ばらつきが大きいため比較しない（秒）
+MIN_COMPARE_SECONDS = 0.01
+
+# ピークメモリの増加を比較する基準の最小値（バイト）
+MIN_COMPARE_MEMORY_BYTES = 1 << 20
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+
+def case_key(rows, cols, nan_density, delimiter):
+    """
+    条件を表すキー（生成するファイル名から拡張子を除いたもの）を返します。
+    """
+    return os.path.splitext(wave_csv_name(rows, cols, nan_density, delimiter))[0]
+
+
+def run_case(path, rows, delimiter, work_dir, repeat):
+    """
+    1つの条件のファイルについて、各段をrepeat回ずつ計測し、経過時間が最小の回の記録を返します。
+    各段が表示するメッセージは計測結果の表示の妨げになるため表示しません。
+
+    Returns:
+        dict: {段の名前: StageProfilerの記録}
+    """
+    loader = 'np' if rows <= NP_LOADER_MAX_ROWS else 'fast'
+    save_path = os.path.join(work_dir, 'benchmark_result.csv')
+    image_name = os.path.join(work_dir, 'benchmark_result')
+    num_bytes = os.path.getsize(path)
+    best = {}
+
+    def _keep(record):
+        if record['name'] not in best or record['wall_seconds'] < best[record['name']]['wall_seconds']:
+            best[record['name']] = record
+
+    for _ in range(repeat):
+        profiler = StageProfiler()
+        with redirect_stdout(io.StringIO()):
+            if rows <= NP_LOADER_MAX_ROWS:
+                with profiler.stage('load_csv_file_np', rows=rows, num_bytes=num_bytes):
+                    load_csv_file(path, delimiter=delimiter, loader='np')
+            with profiler.stage('load_csv_file_pd', rows=rows, num_bytes=num_bytes):
+                load_csv_file(path, delimiter=delimiter, loader='pd')
+
+            summer = CSVColumnSummer(options={'delimiter': delimiter, 'loader': loader})
+            with profiler.stage('load_data', rows=rows, num_bytes=num_bytes, loader=loader):
+                summer.load_data(path)
+            with profiler.stage('save_data', rows=rows) as stage:
+                summer.save_data(save_path=save_path, header='synthetic wave')
+                stage['bytes'] = os.path.getsize(save_path)
+
+            x_data, y_data = summer.get_data()
+            plotter = Plotter(headless=True)
+            with profiler.stage('set_plot', rows=rows):
+                plotter.set_plot(x_data, y_data)
+            with profiler.stage('save_plot', rows=rows) as stage:
+                plotter.save_plot(image_name)
+                stage['bytes'] = os.path.getsize(image_name + '.png')
+            plotter.close_plot()
+            del summer, x_data, y_data
+
+        for record in profiler.stages:
+            _keep(record)
+    return best
+
+
+def compare_results(results, baseline, threshold, memory_threshold):
+    """
+    計測結果をベースラインと比較し、悪化した段のリストを返します。
+    経過時間がベースラインの(1 + threshold)倍を超えた場合、
+    ピークメモリの増加がベースラインの(1 + memory_threshold)倍を超えた場合を悪化とします。
+
+    Returns:
+        list: (条件のキー, 段の名前, 指標, ベースラインの値, 今回の値)のリスト
+    """
+    regressions = []
+    for key, stages in results.items():
+        for name, record in stages.items():
+            base = baseline.get(key, {}).get(name)
+            if base is None:
+                continue
+            if base['wall_seconds'] >= MIN_COMPARE_SECONDS \
+                    and record['wall_seconds'] > base['wall_seconds'] * (1 + threshold):
+                regressions.append((key, name, 'wall_seconds', base['wall_seconds'], record['wall_seconds']))
+            base_memory, memory = base.get('peak_memory_bytes'), record.get('peak_memory_bytes')
+            # ベースラインの増加が小さい場合は、MIN_COMPARE_MEMORY_BYTESを基準にする
+            if base_memory is not None and memory is not None \
+                    and memory > max(base_memory, MIN_COMPARE_MEMORY_BYTES) * (1 + memory_threshold):
+                regressions.append((key, name, 'peak_memory_bytes', base_memory, memory))
+    return regressions
+
+
+def print_results(results, baseline):
+    """
+    条件ごとに各段の経過時間、スループット、ピークメモリと、ベースラインとの比を表示します。
+    """
+    for key, stages in results.items():
+        print(key)
+        for name, record in stages.items():
+            base = baseline.get(key, {}).get(name)
+            ratio = f"x{record['wall_seconds'] / base['wall_seconds']:.2f}" if base and base['wall_seconds'] > 0 else '-'
+            peak = '-' if record['peak_memory_bytes'] is None else f"{record['peak_memory_bytes'] / 1e6:.1f}"
+            megabytes_per_second = '-' if record['bytes_per_second'] is None else f"{record['bytes_per_second'] / 1e6:.1f}"
+            print(f"  {name:<18}{record['wall_seconds']:9.3f}s {record['rows_per_second']:>14,.0f} rows/s "
+                  f"{megabytes_per_second:>8} MB/s  peak {peak:>8} MB  baseline {ratio}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成した波形CSVファイルで各段の処理時間とピークメモリを計測し、ベースラインと比較する")
+    parser.add_argument("--preset", default="quick", choices=list(PRESETS), help="計測する条件のプリセット（デフォルト: quick）")
+    parser.add_argument("--repeat", type=int, default=3, help="各段の計測回数。経過時間が最小の回を記録します（デフォルト: 3）")
+    parser.add_argument("--data-dir", default=None, help="生成したCSVファイルを保存するディレクトリ。既存のファイルは再利用します（デフォルト: 一時ディレクトリ）")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="比較するベースラインのJSONファイル")
+    parser.add_argument("--save-baseline", action="store_true", help="今回の結果をベースラインとして保存する")
+    parser.add_argument("--threshold", type=float, default=0.25, help="経過時間の悪化とみなす増加の割合（デフォルト: 0.25）")
+    parser.add_argument("--memory-threshold", type=float, default=0.5, help="ピークメモリの悪化とみなす増加の割合（デフォルト: 0.5）")
+    parser.add_argument("--output", default=None, help="今回の結果を保存するJSONファイル")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        for rows, cols, nan_density, delimiter in PRESETS[args.preset]:
+            key = case_key(rows, cols, nan_density, delimiter)
+            path = os.path.join(data_dir, wave_csv_name(rows, cols, nan_density, delimiter))
+            if not os.path.exists(path):
+                generate_wave_csv(path, rows, cols, nan_density, delimiter)
+            print(f"{key}: {os.path.getsize(path) / 1e6:.1f} MB")
+            results[key] = run_case(path, rows, delimiter, tmp_dir, args.repeat)
+
+    report = {
+        'preset': args.preset,
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"ベースラインを {args.baseline}に保存しました。")
+        sys.exit(0)
+
+    if not baseline:
+        print(f"ベースライン（{args.baseline}）がないため、比較しません。--save-baselineで保存できます。")
+        sys.exit(0)
+    regressions = compare_results(results, baseline, args.threshold, args.memory_threshold)
+    for key, name, metric, base, value in regressions:
+        ratio = f"x{value / base:.2f}" if base else '-'
+        print(f"悪化: {key} {name} {metric}: {base:.4g} → {value:.4g} ({ratio})")
+    print(f"ベースラインとの比較: 悪化 {len(regressions)}件")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+from wave_generator import generate_wave_csv
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"rows={rows}, cols={cols}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wave.csv')
+        generate_wave_csv(path, rows, cols)
+        summer = CSVColumnSummer(path, {'loader': 'fast'})
+
+        for extension in ['.csv', '.npy', '.npz', '.cols']:
+            save_path = os.path.join(tmp, 'added' + extension)
+            start = time.perf_counter()
+            summer.save_data(save_path=save_path, header='wsum')
+            save_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded = CSVColumnSummer(save_path, {'loader': 'fast'})
+            load_time = time.perf_counter() - start
+            # CSVファイルにはタイムスタンプが保存されないため、バイナリ形式のみ元のデータと比較する
+            matched = '-' if extension == '.csv' else np.array_equal(loaded.data, summer.combined_data)
+            print(f"{extension:>5}: save={save_time:6.3f}s, load_data={load_time:6.3f}s, "
+                  f"size={os.path.getsize(save_path) / 1e6:7.1f}MB, matches={matched}")
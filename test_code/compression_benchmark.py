@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.csv_module import COMPRESSION_MODULES, COMPRESSION_WRITE_OPTIONS, iter_csv_chunks
+from module.data_module import CSVColumnSummer
+from wave_generator import generate_wave_csv
+
+
+def compress(path, extension):
+    """
+    保存時と同じ圧縮レベルで、圧縮されたCSVファイルを作成します。
+    """
+    with open(path, 'rb') as f:
+        body = f.read()
+    module = COMPRESSION_MODULES[extension]
+    with module.open(path + extension, 'wb', **COMPRESSION_WRITE_OPTIONS[extension]) as f:
+        f.write(body)
+    return path + extension
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wave.csv')
+        generate_wave_csv(path, rows, cols)
+        raw_mb = os.path.getsize(path) / 1e6
+        print(f"rows={rows}, cols={cols}, csv={raw_mb:.1f}MB（MB/sは展開後のCSVのサイズで計算）")
+
+        expected = CSVColumnSummer(path, {'loader': 'fast'})
+        for extension in [''] + list(COMPRESSION_MODULES):
+            input_path = compress(path, extension) if extension else path
+            load_time, summer = timed(lambda: CSVColumnSummer(input_path, {'loader': 'fast'}))
+            stream_time, _ = timed(lambda: sum(len(chunk) for chunk in iter_csv_chunks(input_path)))
+            save_time, _ = timed(lambda: summer.save_data(save_path=os.path.join(tmp, 'added.csv' + extension)))
+            matched = np.array_equal(summer.combined_data, expected.combined_data)
+            print(f"{extension or '.csv':>5}: size={os.path.getsize(input_path) / 1e6:6.1f}MB, "
+                  f"load_data={raw_mb / load_time:6.1f}MB/s, iter_csv_chunks={raw_mb / stream_time:6.1f}MB/s, "
+                  f"save_data={save_time:6.3f}s, matches={matched}")
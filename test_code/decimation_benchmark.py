@@ -0,0 +1,52 @@
+import io
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.decimation_module import decimate
+from module.plot_module import Plotter
+
+
+def bench_render(x_data, y_data, decimation, repeat=3):
+    """
+    set_plotからPNGへの保存までの時間（最小値）を計測します。
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        plotter = Plotter()
+        start = time.perf_counter()
+        plotter.set_plot(x_data, y_data, decimation=decimation)
+        plotter.fig.savefig(io.BytesIO(), format='png')
+        best = min(best, time.perf_counter() - start)
+        plotter.close_plot()
+    return best
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    rng = np.random.default_rng(0)
+    y_data = np.arange(rows) * 0.001
+    x_data = rng.normal(0, 1, (rows, cols)).cumsum(axis=0)
+    # 1点だけのスパイクが間引き後も残ることを確認する
+    x_data[rows // 3, 0] += 1e3
+    print(f"rows={rows}, cols={cols}")
+
+    raw_time = bench_render(x_data, y_data, None)
+    print(f"decimation=  None: render={raw_time:6.3f}s")
+    for decimation in ['minmax', 'lttb']:
+        start = time.perf_counter()
+        _, values = decimate(y_data, x_data, 2000, decimation)
+        decimate_time = time.perf_counter() - start
+        render_time = bench_render(x_data, y_data, decimation)
+        peak_kept = np.array_equal(values.max(axis=0), x_data.max(axis=0))
+        print(f"decimation={decimation:>6}: render={render_time:6.3f}s (x{raw_time / render_time:.1f}), "
+              f"decimate={decimate_time * 1e3:7.1f}ms, points={values.shape[0]}, peak kept={peak_kept}")
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+from wave_generator import generate_wave_csv
+
+
+def bench_dtype(path, save_path, dtype, timestamp_dtype):
+    """
+    指定した型での読み込み・合計・保存の時間と、データ配列のメモリ使用量を計測します。
+    """
+    options = {'loader': 'fast', 'dtype': dtype, 'timestamp_dtype': timestamp_dtype}
+    start = time.perf_counter()
+    summer = CSVColumnSummer(path, options)
+    load_time = time.perf_counter() - start
+
+    # tracemallocは実行時間に影響するため、ピークメモリは別に計測する
+    tracemalloc.start()
+    CSVColumnSummer(path, options)
+    load_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(10):
+        summer.add_sum_column()
+    sum_time = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    summer.save_data(save_path=save_path, header='sum')
+    save_time = time.perf_counter() - start
+
+    data_bytes = summer.buffer.nbytes + summer.timestamps.nbytes
+    return data_bytes, load_peak, load_time, sum_time, save_time
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench_waves.csv')
+        generate_wave_csv(path, rows, cols)
+        print(f"rows={rows}, cols={cols}")
+
+        for dtype, timestamp_dtype in [('float64', 'float64'), ('float32', 'float64'), ('float32', 'timedelta64[us]')]:
+            data_bytes, load_peak, load_time, sum_time, save_time = bench_dtype(
+                path, os.path.join(tmp_dir, 'out.csv'), dtype, timestamp_dtype)
+            print(f"dtype={dtype:>7}, timestamp_dtype={timestamp_dtype:>15}: "
+                  f"data={data_bytes / 1e6:7.1f}MB, load peak={load_peak / 1e6:7.1f}MB, "
+                  f"load={load_time:6.3f}s, sum={sum_time * 1e3:7.2f}ms ({rows / sum_time / 1e6:6.1f}M rows/s), "
+                  f"save={save_time:6.3f}s")
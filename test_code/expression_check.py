@@ -0,0 +1,52 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.expression_module import DerivedColumns
+
+
+def moving_average(values, window):
+    """
+    ウィンドウごとに値を合計して、直前window行の移動平均を計算します（比較用）。
+    """
+    padded = np.concatenate([np.zeros(window - 1), values])
+    # infと-infを含むウィンドウの合計はNaNになる
+    with np.errstate(invalid='ignore'):
+        sums = np.lib.stride_tricks.sliding_window_view(padded, window).sum(axis=1)
+    return sums / np.minimum(np.arange(1, len(values) + 1), window)
+
+
+if __name__ == "__main__":
+    # option
+    rows = 1000
+    window = 5
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(0, 1, (rows, 2))
+    # fillna=Falseで読み込んだ欠損値や、データに含まれるinfを想定する
+    data[[10, 500], 0] = np.nan
+    data[200, 0] = np.inf
+    data[300, 0] = -np.inf
+    data[[700, 702], 0] = [np.inf, -np.inf]
+    derived = DerivedColumns({'smooth': f"ma(wave1, {window})", 'slope': 'diff(wave2)'}, ['wave1', 'wave2'])
+    expected = moving_average(data[:, 0], window)
+
+    # NaNやinfはそれを含むウィンドウの行のみに影響し、結果はブロックの大きさによらないこと
+    for block_rows in (1, 4, 7, 100, rows):
+        out = np.empty((rows, len(derived.names)))
+        derived.evaluate(data, out, block_rows=block_rows)
+        assert np.array_equal(np.isnan(out[:, 0]), np.isnan(expected)), block_rows
+        assert np.allclose(out[:, 0], expected, equal_nan=True), block_rows
+        assert np.array_equal(out[1:, 1], np.diff(data[:, 1])), block_rows
+    assert np.isnan(out[10:10 + window, 0]).all() and np.isfinite(out[10 + window:200, 0]).all()
+    assert (out[200:200 + window, 0] == np.inf).all() and (out[300:300 + window, 0] == -np.inf).all()
+
+    # 途中の行から計算する場合も、前の行を参照して同じ結果になること
+    out = np.empty((rows - 250, len(derived.names)))
+    derived.evaluate(data, out, start=250, block_rows=64)
+    assert np.allclose(out[:, 0], expected[250:], equal_nan=True)
+
+    print(f"expression check OK: rows={rows}, ma window={window}")
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.csv_module import load_csv_file
+from wave_generator import generate_wave_csv
+
+
+def bench_loader(path, loader, repeat=3):
+    """
+    指定したloaderでの読み込み時間（最小値）を計測します。
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_csv_file(path, delimiter=',', loader=loader)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench_waves.csv')
+        generate_wave_csv(path, rows, cols)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"rows={rows}, cols={cols}, size={size_mb:.1f}MB")
+
+        results = {loader: bench_loader(path, loader) for loader in ['np', 'pd', 'fast', 'parallel']}
+        for loader, elapsed in results.items():
+            print(f"{loader:>8}: {elapsed:8.3f}s  {size_mb / elapsed:8.1f}MB/s  "
+                  f"x{results['np'] / elapsed:.1f} (np比)")
@@ -0,0 +1,51 @@
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+from wave_generator import generate_wave_csv
+
+
+def sequential(path, save_path):
+    summer = CSVColumnSummer(path, {'loader': 'fast'})
+    summer.save_data(save_path=save_path)
+
+
+def pipelined(path, save_path, chunk_rows):
+    summer = CSVColumnSummer(options={'chunk_rows': chunk_rows})
+    summer.pipeline_data(path, save_path=save_path)
+
+
+def bench(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    chunk_rows = int(sys.argv[3]) if len(sys.argv) > 3 else 50000
+    print(f"rows={rows}, cols={cols}, chunk_rows={chunk_rows}, cpus={os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wave.csv')
+        generate_wave_csv(path, rows, cols)
+        sequential_path = os.path.join(tmp, 'sequential.csv')
+        pipelined_path = os.path.join(tmp, 'pipelined.csv')
+
+        sequential_time = bench(lambda: sequential(path, sequential_path))
+        pipelined_time = bench(lambda: pipelined(path, pipelined_path, chunk_rows))
+        # 並行に実行しても、保存されるファイルは同じであることを確認する
+        same = filecmp.cmp(sequential_path, pipelined_path, shallow=False)
+        print(f"sequential (load_data + save_data): {sequential_time:6.3f}s")
+        print(f"pipelined (pipeline_data):          {pipelined_time:6.3f}s "
+              f"(x{sequential_time / pipelined_time:.2f}), same output={same}")
@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from main import main
+
+STAGE_KEYS = ('name', 'rows', 'bytes', 'wall_seconds', 'cpu_seconds', 'rss_bytes', 'peak_rss_bytes',
+              'peak_memory_bytes', 'rows_per_second', 'bytes_per_second')
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cols = 8
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'profile_waves.csv')
+        rng = np.random.default_rng(0)
+        header = 'time,' + ','.join(f"wave{i+1}" for i in range(cols))
+        np.savetxt(path, np.column_stack([np.arange(rows) * 0.001, rng.normal(0, 1, (rows, cols))]),
+                   delimiter=',', header=header, comments='', fmt='%.6f')
+        save_path = os.path.join(tmp_dir, 'profile_result.csv')
+        options = dict(save_path=save_path, save_graph=True, headless=True, workers=1)
+
+        start = time.perf_counter()
+        main(path, **options)
+        plain_time = time.perf_counter() - start
+        start = time.perf_counter()
+        main(path, profile=True, **options)
+        profile_time = time.perf_counter() - start
+
+        # profile=Trueの場合は、結果CSVの名前に_profile.jsonを付けたパスにレポートを保存すること
+        with open(os.path.join(tmp_dir, 'profile_result_profile.json'), encoding='utf-8') as f:
+            report = json.load(f)
+        names = [stage['name'] for stage in report['stages']]
+        assert names == ['load', 'combine', 'save', 'render_pages'], names
+        for stage in report['stages']:
+            assert all(key in stage for key in STAGE_KEYS), stage
+        load = report['stages'][0]
+        assert load['rows'] == rows and load['bytes'] == os.path.getsize(path), load
+        # 読み込みのピークは、少なくとも読み込んだデータ分は増えること
+        if load['peak_memory_bytes'] is not None:
+            assert load['peak_memory_bytes'] >= rows * cols * 8, load
+
+        print(f"rows={rows}, cols={cols}")
+        print(f"without profile: {plain_time:6.3f}s")
+        print(f"with profile:    {profile_time:6.3f}s (overhead {profile_time / plain_time - 1:+.1%})")
+        for stage in report['stages']:
+            print(f"  {stage['name']:<14}{stage['wall_seconds']:8.3f}s")
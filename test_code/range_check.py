@@ -0,0 +1,75 @@
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+from module.index_module import CSVRowIndex
+
+
+def write_rows(path, times):
+    """
+    1列目がtimes、2列目が行番号のCSVファイルを作成します。
+    """
+    with open(path, 'w') as f:
+        f.write('time,wave1\n')
+        for row, t in enumerate(times):
+            f.write(f"{t},{row}\n")
+
+
+def load_range(path, t_start, t_end, index_rows, index_dir):
+    """
+    load_rangeで読み込んだ行の行番号（2列目）を返します。
+    """
+    summer = CSVColumnSummer(options={'index_rows': index_rows, 'index_dir': index_dir})
+    summer.load_range(path, t_start, t_end)
+    return summer.data[:, 0].astype(int).tolist()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir, redirect_stdout(io.StringIO()):
+        path = os.path.join(tmp_dir, 'range_waves.csv')
+        index_dir = os.path.join(tmp_dir, 'index')
+
+        # インデックスに記録した行の前後に同じタイムスタンプの行が続く場合も、全ての行を読み込むこと
+        times = [0, 1, 5, 5, 5, 5, 6, 7]
+        write_rows(path, times)
+        for index_rows in (1, 2, 3, 100):
+            for t_start, t_end in ((5, 5), (0, 5), (5, 7), (1, 6), (6, 6), (0, 7)):
+                expected = [row for row, t in enumerate(times) if t_start <= t <= t_end]
+                rows = load_range(path, t_start, t_end, index_rows, os.path.join(index_dir, str(index_rows)))
+                assert rows == expected, (index_rows, t_start, t_end, rows, expected)
+
+        # ランダムな重複のあるタイムスタンプで、全ての行を読み込むのと同じ結果になること
+        rng = np.random.default_rng(0)
+        times = np.sort(rng.integers(0, 50, 1000)).tolist()
+        write_rows(path, times)
+        for index_rows in (7, 64):
+            for t_start, t_end in rng.integers(0, 50, (20, 2)).tolist():
+                t_start, t_end = min(t_start, t_end), max(t_start, t_end)
+                expected = [row for row, t in enumerate(times) if t_start <= t <= t_end]
+                if not expected:
+                    continue
+                rows = load_range(path, t_start, t_end, index_rows, os.path.join(index_dir, f"random_{index_rows}"))
+                assert rows == expected, (index_rows, t_start, t_end)
+
+        # タイムスタンプを変換できない行があってもインデックスを作成し、変換できる次の行を記録すること
+        write_rows(path, range(20))
+        with open(path) as f:
+            lines = f.read().splitlines()
+        lines[3], lines[4], lines[5], lines[13] = ',2', 'abc,3', '# comment', 'nan,12'
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        for index_rows in (1, 2, 3, 4):
+            index = CSVRowIndex.build(path, index_rows=index_rows)
+            assert 2 not in index.timestamps and 3 not in index.timestamps, index.timestamps
+            assert np.all(np.diff(index.timestamps) > 0), index.timestamps
+            assert load_range(path, 6, 10, index_rows, os.path.join(index_dir, f"invalid_{index_rows}")) == \
+                list(range(6, 11))
+
+    print("range check OK")
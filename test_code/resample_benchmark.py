@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+from module.resample_module import RESAMPLE_METHODS, TimeResampler, resample
+
+
+def write_csv(path, rows, cols, rate):
+    """
+    rate[Hz]でサンプリングしたランダムウォークのCSVファイルを作成します。
+    """
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(rows) / rate
+    data = rng.normal(0, 1, (rows, cols)).cumsum(axis=0)
+    header = 'time,' + ','.join(f'wave{i}' for i in range(cols))
+    np.savetxt(path, np.column_stack([timestamps, data]), delimiter=',', header=header, comments='', fmt='%.6f')
+
+
+def bench_pipeline(path, save_path, interval):
+    """
+    ロード、合計、保存までの時間を計測します。
+    """
+    start = time.perf_counter()
+    summer = CSVColumnSummer(path, {'loader': 'fast', 'resample': interval})
+    summer.save_data(save_path=save_path)
+    return time.perf_counter() - start, summer.num_data
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    rate = 1000.0
+    interval = 0.01
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wave.csv')
+        write_csv(path, rows, cols, rate)
+        summer = CSVColumnSummer(path, {'loader': 'fast'})
+        timestamps, values = summer.timestamps, summer.data
+        print(f"rows={rows}, cols={cols}, rate={rate:g}Hz, interval={interval}s")
+
+        # チャンクに分けて集計しても、1回で集計した結果と一致することを確認する
+        for method in RESAMPLE_METHODS:
+            start = time.perf_counter()
+            _, expected = resample(timestamps, values, interval, method)
+            elapsed = time.perf_counter() - start
+            resampler = TimeResampler(interval, method)
+            parts = [resampler.push(timestamps[i:i + 7777], values[i:i + 7777])[1]
+                     for i in range(0, rows, 7777)]
+            parts.append(resampler.flush()[1])
+            matched = np.allclose(np.vstack(parts), expected)
+            print(f"method={method:>4}: resample={elapsed * 1e3:7.1f}ms, rows={len(expected)}, chunked matches={matched}")
+
+        for resample_interval in [None, interval]:
+            elapsed, num_data = bench_pipeline(path, os.path.join(tmp, 'out.csv'), resample_interval)
+            print(f"resample={resample_interval}: load+sum+save={elapsed:6.3f}s, saved rows={num_data}")
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(ROOT_DIR)
+
+from module.server_module import SummerService, make_server, send_request
+from wave_generator import generate_wave_csv
+
+
+def bench(function, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cols = 8
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'server_waves.csv')
+        generate_wave_csv(path, rows, cols)
+        save_path = os.path.join(tmp_dir, 'server_result.csv')
+        options = {}
+
+        server = make_server(SummerService(), port=0)
+        port = server.server_address[1]
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            def _cli():
+                subprocess.run([sys.executable, 'execute_cli.py', path, '-s', save_path, '-np'], cwd=ROOT_DIR,
+                               capture_output=True, check=True)
+
+            def _request(action, **params):
+                response = send_request(action, port=port, path=path, options=options, **params)
+                assert response['ok'], response
+                return response
+
+            cli_time = bench(_cli)
+            first = _request('load')
+            sum_time = bench(lambda: _request('sum', sum_target=[0, 2, 4]))
+            save_time = bench(lambda: _request('save', save_path=save_path))
+            # sumのsum_targetは他のリクエストに影響せず、saveは全ての列の合計を保存すること
+            saved = np.loadtxt(save_path, delimiter=',', skiprows=1, max_rows=100)
+            assert np.allclose(saved[:, cols], saved[:, :cols].sum(axis=1), atol=1e-4)
+            # ファイルが更新された場合は読み込み直すこと
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+            reloaded = _request('load')
+            assert not reloaded['cached'] and _request('load')['cached']
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"rows={rows}, cols={cols}")
+    print(f"execute_cli.py --no_plot (import + load + sum + save): {cli_time:6.3f}s")
+    print(f"server load (first):          {first['seconds']:6.3f}s")
+    print(f"server sum (cached):          {sum_time:6.3f}s")
+    print(f"server save (cached):         {save_time:6.3f}s (x{cli_time / save_time:.1f})")
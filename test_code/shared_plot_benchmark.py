@@ -0,0 +1,86 @@
+import io
+import os
+import pickle
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(ROOT_DIR)
+
+from main import main_batch
+from module.data_module import CSVColumnSummer
+from module.plot_module import PlotWorker
+from module.shared_module import SharedArrays, attach_shared_arrays
+from wave_generator import generate_wave_csv
+
+SHM_DIR = '/dev/shm'
+
+
+def shm_segments():
+    """
+    /dev/shmにある共有メモリのセグメント名の集合を返します（Linuxのみ）。
+    """
+    return set(os.listdir(SHM_DIR)) if os.path.isdir(SHM_DIR) else set()
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cols = 8
+    num_files = 4
+    before = shm_segments()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(num_files):
+            paths.append(os.path.join(tmp_dir, f"shared_waves_{i}.csv"))
+            generate_wave_csv(paths[-1], rows, cols, seed=i)
+
+        # 受け渡しのコスト: pickleで配列を送る場合と、共有メモリのセグメント名を送る場合
+        summer = CSVColumnSummer(paths[0], {'loader': 'fast'})
+        x_data, y_data = summer.get_data()
+        start = time.perf_counter()
+        pickled = pickle.dumps((x_data, y_data), protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(pickled)
+        pickle_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with summer.share_data() as shared:
+            share_time = time.perf_counter() - start
+            descriptor = pickle.dumps(shared.descriptor)
+            with attach_shared_arrays(pickle.loads(descriptor)) as arrays:
+                assert np.array_equal(arrays['combined_data'], x_data)
+                assert np.array_equal(arrays['timestamps'], y_data)
+        assert shared.closed
+        print(f"rows={rows}, cols={cols}, {x_data.nbytes / 1e6:.1f} MB")
+        print(f"  pickle (dumps + loads):     {pickle_time:6.3f}s, {len(pickled) / 1e6:.1f} MB")
+        print(f"  share_data + descriptor:    {share_time:6.3f}s, {len(descriptor)} bytes")
+
+        # ワーカーでの保存と、失敗時にもセグメントが削除されること
+        with PlotWorker() as worker:
+            ok = worker.submit(summer.share_data(), os.path.join(tmp_dir, 'shared_plot'), labels=None)
+            ng = worker.submit(summer.share_data(), os.path.join(tmp_dir, 'missing_dir', 'shared_plot'))
+        assert ok.result() == [os.path.join(tmp_dir, 'shared_plot.png')]
+        assert ng.exception() is not None
+        del summer, x_data, y_data
+
+        # バッチ処理: プロセスプールで並列に処理する場合と、順に処理してイメージの保存を別のプロセスで行う場合
+        timings = {}
+        for plot_process in (False, True):
+            save_dir = os.path.join(tmp_dir, f"result_{plot_process}")
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                results = main_batch(paths, save_dir=save_dir, plot_process=plot_process, save_graph=True)
+            timings[plot_process] = time.perf_counter() - start
+            assert all(result['ok'] for result in results)
+            assert all(os.path.exists(os.path.join(save_dir, f"shared_waves_{i}.png")) for i in range(num_files))
+
+    leaked = shm_segments() - before
+    assert not leaked, leaked
+    print(f"main_batch ({num_files}ファイル, cpu_count={os.cpu_count()})")
+    print(f"  プロセスプール:            {timings[False]:6.3f}s")
+    print(f"  plot_process:              {timings[True]:6.3f}s")
+    print("共有メモリのセグメントは全て削除されました。")
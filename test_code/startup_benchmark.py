@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from wave_generator import generate_wave_csv
+
+ROOT_DIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+
+# 以前はmainのimport時に読み込んでいたモジュール
+EAGER_IMPORTS = 'import main, pandas, matplotlib.pyplot, module.plot_module'
+
+
+def import_times(statement):
+    """
+    python -X importtimeでstatementを実行し、import時間を返します。
+
+    Returns:
+        tuple: (total, times)
+            total (float): トップレベルでimportしたモジュールの累積時間の合計（秒）
+            times (dict): {モジュール名: 累積のimport時間（秒）}
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT_DIR,
+                            capture_output=True, text=True, check=True)
+    total = 0.0
+    times = {}
+    for line in result.stderr.splitlines():
+        # 'import time: self [us] | cumulative | imported package'の形式で、入れ子のimportは名前が字下げされる
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+        if not name[1:].startswith(' '):
+            total += int(cumulative) / 1e6
+    return total, times
+
+
+def bench_command(args, repeat=5):
+    """
+    コマンドの実行時間（最小値）を計測します。
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT_DIR, capture_output=True, check=True,
+                       env=dict(os.environ, MPLBACKEND='Agg'))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def best_import_time(statement, repeat=5):
+    """
+    statementのimport時間の合計（最小値）と、その回のモジュールごとの時間を返します。
+    """
+    return min((import_times(statement) for _ in range(repeat)), key=lambda result: result[0])
+
+
+if __name__ == "__main__":
+    # option
+    rows = 1000
+    cols = 4
+
+    lazy_time, lazy_times = best_import_time('import main')
+    eager_time, eager_times = best_import_time(EAGER_IMPORTS)
+    print("python -X importtime")
+    print(f"  import main (lazy):              {lazy_time:6.3f}s")
+    print(f"  import main + pandas/matplotlib: {eager_time:6.3f}s (x{eager_time / lazy_time:.1f})")
+    for name in ('numpy', 'pandas', 'matplotlib', 'matplotlib.pyplot'):
+        loaded = 'loaded' if name in lazy_times else 'not loaded'
+        print(f"    {name:<20}{eager_times.get(name, 0.0):6.3f}s  (import main: {loaded})")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'startup_waves.csv')
+        generate_wave_csv(path, rows, cols)
+        save_path = os.path.join(tmp_dir, 'startup_result.csv')
+        cli = ['execute_cli.py', path, '-s', save_path]
+
+        no_plot_time = bench_command(cli + ['-np'])
+        headless_time = bench_command(cli + ['-hl', '-g', '-w', '1'])
+
+    print(f"execute_cli.py ({rows}行 x {cols}列)")
+    print(f"  --no_plot:               {no_plot_time:6.3f}s")
+    print(f"  --headless --save_graph: {headless_time:6.3f}s")
@@ -0,0 +1,112 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.csv_module import save_csv_file
+from module.data_module import CSVColumnSummer
+
+# loader='pd'はヘッダーを読み飛ばした後の1行目を列名として扱い、1行少なく読み込むため対象にしない
+LOADERS = ('np', 'fast', 'parallel')
+
+
+def write_rows(f, start, rows, cols):
+    """
+    start行目からrows行の波形データを書き込み、書き込んだ値を返します。
+    """
+    values = np.column_stack([np.arange(start, start + rows) * 0.001,
+                              np.sin(np.arange(start, start + rows)[:, None] * 0.01 + np.arange(cols))])
+    text = io.StringIO()
+    save_csv_file(text, values, fmt='%.6f')
+    f.write(text.getvalue())
+    f.flush()
+    return values
+
+
+def read_all(summer):
+    """
+    追記がなくなるまでupdate_dataを実行し、タイムスタンプとデータを1つの配列にして返します。
+    """
+    while summer.update_data():
+        pass
+    x_data, y_data = summer.get_data(combined=False)
+    return np.column_stack([y_data, x_data])
+
+
+def check_partial_line(path, loader, cols):
+    """
+    末尾が書き込み途中の行で終わるファイルを読み込めること、残りが追記されたらupdate_dataで読み込むことを確認します。
+    """
+    with open(path, 'w') as f:
+        f.write('time,' + ','.join(f"wave{i+1}" for i in range(cols)) + '\n')
+        expected = write_rows(f, 0, 100, cols)
+        f.write('0.100000,0.5')
+    summer = CSVColumnSummer(path, {'loader': loader})
+    assert summer.num_data == 100, (loader, summer.num_data)
+    with open(path, 'a') as f:
+        f.write('00000,' + ','.join(['1.000000'] * (cols - 1)) + '\n')
+    assert summer.update_data() == 1, loader
+    row = np.array([[0.1, 0.5] + [1.0] * (cols - 1)])
+    assert np.allclose(read_all(summer), np.vstack([expected, row]), atol=1e-6), loader
+
+
+def check_append_during_load(path, load, cols, rows=50_000, appended_rows=20_000, block_rows=200, interval=0.005):
+    """
+    読み込み中に行が追記されても、全ての行を重複も欠落もなく1回ずつ読み込むことを確認します。
+    loadはCSVColumnSummerを受け取り、pathを読み込む関数です。
+    追記は読み込みと重なるよう、block_rows行ずつinterval秒ごとに行います。
+    """
+    with open(path, 'w') as f:
+        f.write('time,' + ','.join(f"wave{i+1}" for i in range(cols)) + '\n')
+        blocks = [write_rows(f, 0, rows, cols)]
+
+    def _append():
+        with open(path, 'a') as f:
+            for start in range(rows, rows + appended_rows, block_rows):
+                blocks.append(write_rows(f, start, block_rows, cols))
+                time.sleep(interval)
+
+    summer = CSVColumnSummer(options={'loader': 'np'})
+    thread = threading.Thread(target=_append)
+    thread.start()
+    load(summer)
+    thread.join()
+    data = read_all(summer)
+    expected = np.vstack(blocks)
+    assert data.shape == expected.shape, (data.shape, expected.shape)
+    assert np.allclose(data, expected, atol=1e-6)
+    return data
+
+
+if __name__ == "__main__":
+    # option
+    cols = 4
+
+    with tempfile.TemporaryDirectory() as tmp_dir, redirect_stdout(io.StringIO()):
+        path = os.path.join(tmp_dir, 'tail_waves.csv')
+        save_path = os.path.join(tmp_dir, 'tail_result.csv')
+        for loader in LOADERS:
+            check_partial_line(path, loader, cols)
+
+        for loader in LOADERS:
+            def _load(summer):
+                summer.set_options(loader=loader)
+                summer.load_data(path)
+            check_append_during_load(path, _load, cols)
+
+        # pipeline_dataは読み込み中に追記された行を保存せず、update_dataで1回だけ保存すること
+        def _pipeline(summer):
+            summer.set_options(chunk_rows=1000)
+            summer.pipeline_data(path, save_path=save_path)
+        data = check_append_during_load(path, _pipeline, cols)
+        saved = np.loadtxt(save_path, delimiter=',', skiprows=1)
+        assert saved.shape[0] == data.shape[0], (saved.shape, data.shape)
+
+    print(f"tail check OK: loaders={', '.join(LOADERS)}, pipeline")
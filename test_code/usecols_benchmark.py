@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+from wave_generator import generate_wave_csv
+
+
+def bench_usecols(path, usecols):
+    """
+    usecolsを指定した読み込みの時間とピークメモリ、保持するデータのサイズを計測します。
+    """
+    options = {'loader': 'fast', 'usecols': usecols}
+    start = time.perf_counter()
+    summer = CSVColumnSummer(path, options)
+    load_time = time.perf_counter() - start
+
+    # tracemallocは実行時間に影響するため、ピークメモリは別に計測する
+    tracemalloc.start()
+    CSVColumnSummer(path, options)
+    load_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return summer.buffer.nbytes + summer.timestamps.nbytes, load_peak, load_time
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench_wide_waves.csv')
+        generate_wave_csv(path, rows, cols)
+        print(f"rows={rows}, cols={cols}, file={os.path.getsize(path) / 1e6:.1f}MB")
+
+        for usecols in [None, list(range(0, cols, 10)), [0, 1, 2], ['wave1']]:
+            data_bytes, load_peak, load_time = bench_usecols(path, usecols)
+            name = 'all' if usecols is None else f"{len(usecols)} cols"
+            print(f"usecols={name:>8}: data={data_bytes / 1e6:7.1f}MB, load peak={load_peak / 1e6:7.1f}MB, "
+                  f"load={load_time:6.3f}s")
@@ -0,0 +1,51 @@
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+
+# loader='pd'はヘッダーを読み飛ばした後の1行目を列名として扱い、1行少なく読み込むため対象にしない
+LOADERS = ('np', 'fast', 'parallel')
+
+
+def load(path, loader, usecols):
+    with redirect_stdout(io.StringIO()):
+        return CSVColumnSummer(path, {'loader': loader, 'usecols': usecols})
+
+
+if __name__ == "__main__":
+    # option
+    rows = 100
+    cols = 4
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'usecols_waves.csv')
+        header = 'time,' + ','.join(f"wave{i+1}" for i in range(cols))
+        values = np.column_stack([np.arange(rows) * 0.001, np.arange(rows * cols).reshape(rows, cols)])
+        np.savetxt(path, values, delimiter=',', header=header, comments='', fmt='%g')
+
+        for loader in LOADERS:
+            # 負のインデックスはタイムデータを除いたデータ列の末尾から数えること
+            for usecols, expected in (([-1], [cols - 1]), ([0, -2], [0, cols - 2]), ([-cols], [0])):
+                summer = load(path, loader, usecols)
+                assert summer.get_header(as_list=True) == ['time'] + [f"wave{i+1}" for i in expected], \
+                    (loader, usecols, summer.get_header())
+                assert np.array_equal(summer.data, values[:, 1:][:, expected]), (loader, usecols)
+                assert np.allclose(summer.timestamps, values[:, 0]), (loader, usecols)
+
+            # タイムデータの列や同じ列を重複して指定した場合はエラーにすること
+            for usecols in (['time'], [-cols - 1], [0, 'wave1'], [1, -cols + 1]):
+                try:
+                    load(path, loader, usecols)
+                except Exception as e:
+                    assert '重複' in str(e), (loader, usecols, e)
+                else:
+                    raise AssertionError(f"エラーになりませんでした。: loader={loader}, usecols={usecols}")
+
+    print(f"usecols check OK: loaders={', '.join(LOADERS)}")
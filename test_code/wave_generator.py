@@ -0,0 +1,87 @@
+import argparse
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.csv_module import save_csv_file, open_csv
+
+# 1回に生成・書き込む行数。乱数はこの行数のブロックごとに(seed, ブロック番号)から作成するため、
+# 同じ引数であれば常に同じファイルになります
+GENERATOR_BLOCK_ROWS = 1 << 16
+
+# タイムスタンプの間隔（秒）
+SAMPLE_INTERVAL = 0.001
+
+
+def wave_csv_name(rows, cols, nan_density=0.0, delimiter=',', extension='.csv'):
+    """
+    生成する条件を表すファイル名を返します。 例: waves_100000x8_nan0.01_semicolon.csv
+    """
+    delimiter_names = {',': 'comma', ';': 'semicolon', '\t': 'tab', ' ': 'space', '|': 'pipe'}
+    delimiter_name = delimiter_names.get(delimiter, f"0x{ord(delimiter):02x}")
+    return f"waves_{rows}x{cols}_nan{nan_density:g}_{delimiter_name}{extension}"
+
+
+def generate_wave_csv(path, rows, cols, nan_density=0.0, delimiter=',', seed=0):
+    """
+    波形キャプチャを模したCSVファイルを生成します。
+    1列目はSAMPLE_INTERVAL秒間隔のタイムスタンプ、2列目以降は列ごとに周波数の異なる正弦波にノイズを加えた値です。
+    nan_densityの割合のデータを空のフィールド（欠損値）にします。
+    GENERATOR_BLOCK_ROWS行ずつ生成して書き込むため、メモリより大きいファイルも生成できます。
+
+    Args:
+        path (str): 保存先のパス（.csv.gzなどの場合は圧縮して保存）
+        rows (int): データの行数（ヘッダーを除く）
+        cols (int): データの列数（タイムスタンプを除く）
+        nan_density (float): 欠損値にするデータの割合（0以上1未満、デフォルト: 0.0）
+        delimiter (str): 区切り文字（デフォルト: ','）
+        seed (int): 乱数のシード（デフォルト: 0）
+
+    Returns:
+        int: 生成したファイルのバイト数
+    """
+    if rows < 1 or cols < 1:
+        raise ValueError(f"rowsとcolsは1以上を指定してください。: rows={rows}, cols={cols}")
+    if not 0.0 <= nan_density < 1.0:
+        raise ValueError(f"nan_densityは0以上1未満を指定してください。: {nan_density}")
+
+    header = delimiter.join(['time'] + [f"wave{i+1}" for i in range(cols)])
+    frequencies = 1.0 + np.arange(cols) * 0.5
+    phases = np.linspace(0, np.pi, cols)
+    fmt = ['%.3f'] + ['%.6g'] * cols
+    nan_text = f"{delimiter}nan"
+
+    with open_csv(path, 'w') as f:
+        f.write(header + '\n')
+        for block, start in enumerate(range(0, rows, GENERATOR_BLOCK_ROWS)):
+            rng = np.random.default_rng([seed, block])
+            t = np.arange(start, min(start + GENERATOR_BLOCK_ROWS, rows)) * SAMPLE_INTERVAL
+            values = np.empty((len(t), cols + 1))
+            values[:, 0] = t
+            values[:, 1:] = np.sin(2 * np.pi * t[:, None] * frequencies + phases)
+            values[:, 1:] += rng.normal(0, 0.05, (len(t), cols))
+            if nan_density > 0:
+                values[:, 1:][rng.random((len(t), cols)) < nan_density] = np.nan
+            text = io.StringIO()
+            save_csv_file(text, values, fmt=fmt, delimiter=delimiter)
+            # 欠損値は'nan'ではなく空のフィールドとして書き込む
+            f.write(text.getvalue().replace(nan_text, delimiter) if nan_density > 0 else text.getvalue())
+    return os.path.getsize(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ベンチマーク用の波形CSVファイルを生成する")
+    parser.add_argument("save_path", help="保存先のパス（.csv.gz、.csv.bz2、.csv.xzの場合は圧縮して保存）")
+    parser.add_argument("rows", type=int, help="データの行数")
+    parser.add_argument("cols", type=int, help="データの列数（タイムスタンプを除く）")
+    parser.add_argument("--nan", dest="nan_density", type=float, default=0.0, help="欠損値の割合（デフォルト: 0.0）")
+    parser.add_argument("--delimiter", default=",", help="区切り文字（デフォルト: ,）")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード（デフォルト: 0）")
+    args = parser.parse_args()
+
+    size = generate_wave_csv(args.save_path, args.rows, args.cols, args.nan_density, args.delimiter, args.seed)
+    print(f"{args.save_path}を生成しました。: {args.rows}行 x {args.cols}列, {size / 1e6:.1f} MB")
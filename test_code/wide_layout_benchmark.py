@@ -0,0 +1,44 @@
+import io
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.plot_module import Plotter
+
+
+def bench_layout(x_data, y_data, layout):
+    """
+    set_plotからPNGへの保存までの時間を、Figureの作成と保存に分けて計測します。
+    """
+    plotter = Plotter()
+    start = time.perf_counter()
+    plotter.set_plot(x_data, y_data, layout=layout)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    plotter.fig.savefig(io.BytesIO(), format='png')
+    save_time = time.perf_counter() - start
+    plotter.close_plot()
+    return build_time, save_time
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    # subplotsは列数に比例して遅くなるため、この列数までのみ計測する
+    max_subplot_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    rng = np.random.default_rng(0)
+    y_data = np.arange(rows) * 0.001
+    for cols in [10, 30, 100, 300]:
+        x_data = rng.normal(0, 1, (rows, cols)).cumsum(axis=0)
+        for layout in ['subplots', 'stacked']:
+            if layout == 'subplots' and cols > max_subplot_cols:
+                continue
+            build_time, save_time = bench_layout(x_data, y_data, layout)
+            print(f"cols={cols:>4}, layout={layout:>8}: build={build_time:6.3f}s, save={save_time:6.3f}s")
@@ -0,0 +1,48 @@
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.csv_module import save_csv_file
+
+
+def bench_writer(write, path, data, repeat=3):
+    """
+    書き込み関数の実行時間（最小値）を計測します。
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        write(path, data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    # option
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(0, 1e3, (rows, cols))
+    data[rng.random((rows, cols)) < 0.001] = np.nan
+    header = ','.join(f"wave{i+1}" for i in range(cols))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt in ['%8g', '%.8g', '%.6f', '%.18e']:
+            np_path = os.path.join(tmp_dir, 'np.csv')
+            block_path = os.path.join(tmp_dir, 'block.csv')
+            np_time = bench_writer(
+                lambda path, x: np.savetxt(path, x, delimiter=',', header=header, fmt=fmt), np_path, data)
+            block_time = bench_writer(
+                lambda path, x: save_csv_file(path, x, header=header, fmt=fmt), block_path, data)
+
+            identical = filecmp.cmp(np_path, block_path, shallow=False)
+            print(f"fmt={fmt:>6}: np.savetxt {rows / np_time:12,.0f} rows/s, "
+                  f"save_csv_file {rows / block_time:12,.0f} rows/s, "
+                  f"x{np_time / block_time:.1f}, identical={identical}")
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.data_module import CSVColumnSummer
+
+
+if __name__ == "__main__":
+    # option
+    rows = 200_000
+    cols = 8
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'zero_copy_waves.csv')
+        rng = np.random.default_rng(0)
+        header = 'time,' + ','.join(f"wave{i+1}" for i in range(cols))
+        np.savetxt(path, np.column_stack([np.arange(rows) * 0.001, rng.normal(0, 1, (rows, cols))]),
+                   delimiter=',', header=header, comments='', fmt='%.6f')
+        file_size = os.path.getsize(path)
+
+        tracemalloc.start()
+        summer = CSVColumnSummer(path, {'loader': 'fast'})
+        load_peak = tracemalloc.get_traced_memory()[1]
+        buffer = summer.buffer
+
+        # get_dataのデータはbufferのビューで、timestampsは別の配列であること
+        x_data, y_data = summer.get_data()
+        assert np.shares_memory(x_data, buffer)
+        assert y_data is summer.timestamps and not np.shares_memory(y_data, buffer)
+        assert np.shares_memory(summer.get_data(combined=False)[0], buffer)
+        assert np.shares_memory(summer.added_column, x_data[:, -1])
+
+        # 読み込み+合計のピークは、ファイル本体とデータ1つ分程度であること
+        assert load_peak < file_size + (buffer.nbytes + y_data.nbytes) * 1.2, (load_peak, file_size, buffer.nbytes)
+
+        # 合計のやり直しで新しい配列を確保しないこと
+        for sum_target in [None, [0, 2, 5], slice(1, 4)]:
+            expected = summer.data[:, sum_target].sum(axis=1) if sum_target is not None else summer.data.sum(axis=1)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            combined = summer.add_sum_column(sum_target)
+            extra = tracemalloc.get_traced_memory()[1] - before
+            assert extra < buffer.nbytes * 0.01, (sum_target, extra)
+            assert np.shares_memory(combined, buffer)
+            assert np.allclose(summer.added_column, expected)
+        tracemalloc.stop()
+
+        print(f"OK: load peak={load_peak / 1e6:.1f}MB (file={file_size / 1e6:.1f}MB, buffer={buffer.nbytes / 1e6:.1f}MB)")
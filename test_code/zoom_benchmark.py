@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from module.plot_module import Plotter
+
+
+def bench_zoom(x_data, y_data, ranges, repeat=3):
+    """
+    x軸の表示範囲を変えてから再描画するまでの時間（最小値）を、表示範囲ごとに計測します。
+    """
+    plotter = Plotter(x_data, y_data)
+    plotter.fig.canvas.draw()
+    times = []
+    for x_min, x_max in ranges:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            plotter.axes[0].set_xlim(x_min, x_max)
+            plotter.fig.canvas.draw()
+            best = min(best, time.perf_counter() - start)
+        times.append(best)
+    plotter.close_plot()
+    return times
+
+
+if __name__ == "__main__":
+    # option
+    cols = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    rng = np.random.default_rng(0)
+    for rows in [100_000, 1_000_000, 10_000_000]:
+        y_data = np.arange(rows) * 0.001
+        x_data = rng.normal(0, 1, (rows, cols)).cumsum(axis=0)
+        duration = y_data[-1]
+        # 全体、半分、1%、0.01%の範囲を表示
+        ranges = [(0, duration), (duration / 4, duration * 3 / 4), (duration / 2, duration * 0.51),
+                  (duration / 2, duration * 0.5001)]
+        times = bench_zoom(x_data, y_data, ranges)
+        print(f"rows={rows:>10,}: " + ", ".join(f"{name}={t * 1e3:6.1f}ms"
+                                              for name, t in zip(['full', '50%', '1%', '0.01%'], times)))